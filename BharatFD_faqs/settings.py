@@ -32,6 +32,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so that request latency covers the other middleware as well
+    "faqs.metrics.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -116,16 +118,112 @@ MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 
 
 # Redis configuration
+REDIS_URL = os.environ.get("REDIS_URL", "redis://127.0.0.1:6379/1")
+
 CACHES = {
     "default": {
         "BACKEND": "django_redis.cache.RedisCache",
-        "LOCATION": "redis://127.0.0.1:6379/1",
+        "LOCATION": REDIS_URL,
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "SOCKET_TIMEOUT": 1.0,
+            "SOCKET_CONNECT_TIMEOUT": 1.0,
         },
     }
 }
 
+# Shared connection pool used by faqs.redis_handler for all FAQ caching
+# (timeouts in seconds). The cache fails open: after BREAKER_FAILURE_THRESHOLD
+# consecutive errors Redis is skipped for BREAKER_RESET_TIMEOUT seconds.
+FAQ_REDIS = {
+    "URL": REDIS_URL,
+    "MAX_CONNECTIONS": int(os.environ.get("REDIS_MAX_CONNECTIONS", 50)),
+    "SOCKET_TIMEOUT": 0.25,
+    "SOCKET_CONNECT_TIMEOUT": 0.25,
+    "HEALTH_CHECK_INTERVAL": 30,
+    "BREAKER_FAILURE_THRESHOLD": 5,
+    "BREAKER_RESET_TIMEOUT": 30,
+}
+
+
+# Pagination of the FAQ list API and home page (?page_size= is capped at the max)
+FAQ_PAGE_SIZE = 5
+FAQ_MAX_PAGE_SIZE = 50
+
+
+# Seconds clients and shared caches may reuse an FAQ response before they
+# must revalidate it (cheap: unchanged content is answered with 304)
+FAQ_HTTP_MAX_AGE = 0
+
+# Seconds rendered list pages are kept in Redis; bodies of GZIP_MIN_BYTES or
+# more also get a gzipped copy for clients that accept it (None disables it)
+FAQ_LIST_CACHE = {"TIMEOUT": 3600, "GZIP_MIN_BYTES": 1024}
+
+# Seconds rendered home pages are kept in Redis
+FAQ_HOME_CACHE = {"TIMEOUT": 3600}
+
+# Cache warming (manage.py warm_faq_cache): pages per language, worker threads
+# and whether details are warmed. REFILL_PAGES pages per language are rebuilt
+# in the background after every write (0 disables the refill).
+FAQ_CACHE_WARMING = {
+    "PAGES": 5,
+    "WORKERS": 4,
+    "DETAILS": True,
+    "REFILL_PAGES": 1,
+}
+
+# Encoding of cached detail entries: "json" (orjson when installed) or
+# "msgpack", compressed with "zlib" or "lz4" (or None) from COMPRESS_MIN_BYTES
+# up. Entries written with other settings stay readable.
+FAQ_CACHE_CODEC = {
+    "SERIALIZER": "json",
+    "COMPRESSION": "zlib",
+    "COMPRESS_MIN_BYTES": 1024,
+    "COMPRESSION_LEVEL": None,
+}
+
+
+# Rows inserted per bulk_create batch by the admin CSV import
+FAQ_IMPORT_BATCH_SIZE = 500
+
+# FAQs read (and streamed) per chunk by the CSV/NDJSON export
+FAQ_EXPORT_CHUNK_SIZE = 500
+
+# /api/faqs/changes/: changes per page and how long deletion tombstones are
+# kept (run purge_faq_tombstones daily); older cursors must sync from scratch
+FAQ_CHANGE_FEED = {
+    "PAGE_SIZE": 100,
+    "MAX_PAGE_SIZE": 1000,
+    "TOMBSTONE_RETENTION_DAYS": 30,
+}
+
+# Largest number of creates + updates + deletes accepted by /api/faqs/bulk/
+FAQ_BULK_MAX_ITEMS = 1000
+
+# Bearer token Prometheus sends to scrape /metrics; without it only staff
+# users can read the metrics
+FAQ_METRICS_TOKEN = os.environ.get("FAQ_METRICS_TOKEN")
+
+
+# Background tasks (translation, ...). Swap BACKEND for another broker to move
+# the work out of the web process.
+FAQ_TASK_BROKER = {
+    "BACKEND": "faqs.tasks.ThreadPoolBroker",
+    "OPTIONS": {"max_workers": 4},
+}
+
+
+# Translation engine. Point BACKEND at faqs.translator.StubBackend for offline
+# deployments; CONCURRENCY bounds parallel translator calls and TIMEOUT
+# (seconds) applies to each call.
+FAQ_TRANSLATION = {
+    "BACKEND": os.environ.get(
+        "FAQ_TRANSLATION_BACKEND", "faqs.translator.GoogleTranslateBackend"
+    ),
+    "CONCURRENCY": 8,
+    "TIMEOUT": 10,
+}
+
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
@@ -3,10 +3,14 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from faqs.views import home_page_view
+from faqs import async_views
+from faqs.metrics import metrics_view
 
 urlpatterns = [
     path("", home_page_view, name="home"),
+    path("async/", async_views.home_page_view, name="home-async"),
     path("admin/", admin.site.urls),
+    path("metrics", metrics_view, name="metrics"),
     path("api/", include("faqs.urls")),  # API endpoints
 ]
 
@@ -1,16 +1,28 @@
 from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
-from django.utils.html import format_html
-from django.urls import path
-from django.http import HttpResponseRedirect
-from django.shortcuts import render
+from django.utils.html import format_html_join
+from django.utils.safestring import mark_safe
+from django.urls import path, reverse
+from django.http import HttpResponseRedirect, JsonResponse
+from django.shortcuts import get_object_or_404, render
 from django.contrib import messages
-from django.core.files.storage import FileSystemStorage
-from .models import FAQ
+from django.db import transaction
+from .cache import invalidate_faq_caches_on_commit
+from .changes import next_change_seq, record_changes, record_deletions
+from .models import (
+    FAQ,
+    FAQTranslation,
+    ImportJob,
+    TRANSLATION_STATUS_CHOICES,
+    translated_languages,
+)
+from .exporter import ExportError, export_response
+from .importer import ImportFormatError, import_faqs_csv
+from .pagination import EstimatedCountPaginator
+from .search import get_search_backend, index_faqs, remove_faqs
+from .tasks import enqueue_on_commit
 from ckeditor.widgets import CKEditorWidget
 from django import forms
-import csv
-import os
 
 
 class FAQAdminForm(forms.ModelForm):
@@ -29,23 +41,92 @@ class CSVUploadForm(forms.Form):
     )
 
 
+class FAQTranslationInline(admin.TabularInline):
+    model = FAQTranslation
+    fields = ("lang", "question", "answer", "status", "updated_at")
+    readonly_fields = ("updated_at",)
+    extra = 0
+
+
+LANGUAGE_NAMES = {"en": "English", "hi": "Hindi", "bn": "Bengali"}
+
+
+class TranslationStatusFilter(admin.SimpleListFilter):
+    title = _("translation status")
+    parameter_name = "translation_status"
+
+    def lookups(self, request, model_admin):
+        return TRANSLATION_STATUS_CHOICES
+
+    def queryset(self, request, queryset):
+        if self.value():
+            # translation_status is annotated by FAQAdmin.get_queryset
+            return queryset.filter(translation_status=self.value())
+        return queryset
+
+
 class FAQAdmin(admin.ModelAdmin):
     form = FAQAdminForm
+    inlines = [FAQTranslationInline]
     change_list_template = "admin/faq/faq_changelist.html"
 
-    list_display = ("question", "get_translations", "id", "created_at", "updated_at")
-    search_fields = ("question",)
-    list_filter = ("created_at", "updated_at")
-
-    fieldsets = (
-        ("Edit FAQ", {"fields": ("question", "answer")}),
-        ("Translations", {"fields": ("question_translated", "answer_translated")}),
+    list_display = (
+        "question",
+        "get_translations",
+        "get_translation_status",
+        "id",
+        "created_at",
+        "updated_at",
     )
+    search_fields = ("question",)  # Enables the search box; see get_search_results
+    search_limit = 1000
+    list_filter = (TranslationStatusFilter, "created_at", "updated_at")
+    actions = ["retranslate_selected"]
+
+    # Large tables: estimate the unfiltered total and skip the second
+    # COUNT(*) the changelist runs for "N total" when filtering.
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    fieldsets = (("Edit FAQ", {"fields": ("question", "answer")}),)
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if not self.is_changelist(request):
+            return queryset
+        # Load only the listed columns: the translated questions and the
+        # translation status come from subqueries, never from whole rows.
+        return (
+            queryset.only("id", "question", "created_at", "updated_at")
+            .with_translated_questions(translated_languages())
+            .with_translation_status()
+        )
+
+    def is_changelist(self, request):
+        match = getattr(request, "resolver_match", None)
+        opts = self.model._meta
+        return bool(match) and match.url_name == (
+            f"{opts.app_label}_{opts.model_name}_changelist"
+        )
 
     def get_urls(self):
         urls = super().get_urls()
         custom_urls = [
-            path("upload-csv/", self.upload_csv, name="upload_csv"),
+            path(
+                "upload-csv/",
+                self.admin_site.admin_view(self.upload_csv),
+                name="upload_csv",
+            ),
+            path(
+                "import-jobs/<int:job_id>/",
+                self.admin_site.admin_view(self.import_job_status),
+                name="import_job_status",
+            ),
+            path(
+                "export.<str:extension>",
+                self.admin_site.admin_view(self.export_faqs),
+                name="export_faqs",
+            ),
         ]
         return custom_urls + urls
 
@@ -59,71 +140,162 @@ class FAQAdmin(admin.ModelAdmin):
                     messages.error(request, "Please upload a CSV file.")
                     return HttpResponseRedirect("../")
 
-                # Save the uploaded file temporarily
-                fs = FileSystemStorage()
-                filename = fs.save(csv_file.name, csv_file)
-                uploaded_file_url = fs.path(filename)
-
+                # Rows are streamed from the upload and bulk inserted;
+                # translation continues in the background.
+                job = ImportJob.objects.create(filename=csv_file.name)
                 try:
-                    with open(
-                        uploaded_file_url, newline="", encoding="utf-8"
-                    ) as csvfile:
-                        reader = csv.DictReader(csvfile)
-
-                        # Validate CSV structure
-                        required_fields = ["question", "answer"]
-                        if not all(
-                            field in reader.fieldnames for field in required_fields
-                        ):
-                            messages.error(
-                                request,
-                                'CSV file must contain "question" and "answer" columns.',
-                            )
-                            return HttpResponseRedirect("../")
-
-                        success_count = 0
-                        error_count = 0
-
-                        for row in reader:
-                            try:
-                                FAQ.objects.create(
-                                    question=row["question"], answer=row["answer"]
-                                )
-                                success_count += 1
-                            except Exception as e:  # noqa: F841
-                                error_count += 1
-                                continue
-
-                        # Clean up the temporary file
-                        os.remove(uploaded_file_url)
-
-                        if success_count > 0:
-                            messages.success(
-                                request, f"Successfully imported {success_count} FAQs."
-                            )
-                        if error_count > 0:
-                            messages.warning(
-                                request, f"Failed to import {error_count} FAQs."
-                            )
-
-                except Exception as e:
-                    messages.error(request, f"Error processing CSV file: {str(e)}")
-
-                return HttpResponseRedirect("../")
+                    import_faqs_csv(job, csv_file.file)
+                except ImportFormatError as e:
+                    messages.error(request, str(e))
+                    return HttpResponseRedirect("../")
+
+                messages.success(
+                    request,
+                    f"Imported {job.imported_rows} FAQs; translation is running "
+                    f"in the background.",
+                )
+                if job.error_count > 0:
+                    messages.warning(
+                        request, f"Failed to import {job.error_count} rows."
+                    )
+                return HttpResponseRedirect(
+                    reverse("admin:import_job_status", args=[job.pk])
+                )
 
         form = CSVUploadForm()
         payload = {"form": form, "opts": self.model._meta, "title": "Upload FAQ CSV"}
         return render(request, "admin/faq/csv_form.html", payload)
 
+    def import_job_status(self, request, job_id):
+        """
+        Progress page of a CSV import; ?format=json returns the job for polling.
+        """
+        job = get_object_or_404(ImportJob, pk=job_id)
+        if request.GET.get("format") == "json":
+            return JsonResponse(
+                {
+                    "id": job.pk,
+                    "filename": job.filename,
+                    "status": job.status,
+                    "total_rows": job.total_rows,
+                    "imported_rows": job.imported_rows,
+                    "translated_rows": job.translated_rows,
+                    "error_count": job.error_count,
+                    "errors": job.errors,
+                    "finished": job.is_finished,
+                }
+            )
+        payload = {"job": job, "opts": self.model._meta, "title": "FAQ CSV import"}
+        return render(request, "admin/faq/import_job.html", payload)
+
+    def export_faqs(self, request, extension):
+        """
+        Stream every FAQ in every language (see faqs.exporter); accepts the
+        same ?lang= and ?updated_since= filters as the API export.
+        """
+        try:
+            return export_response(extension, request.GET)
+        except ExportError as e:
+            self.message_user(request, str(e), level=messages.ERROR)
+            return HttpResponseRedirect(reverse("admin:faqs_faq_changelist"))
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Search through the full-text index (every language) instead of icontains.
+        The best search_limit matches are listed, which keeps the id list
+        bounded; a warning says so when there are more.
+        """
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        ids = get_search_backend().search(search_term, limit=self.search_limit + 1)
+        if len(ids) > self.search_limit:
+            ids = ids[: self.search_limit]
+            messages.warning(
+                request,
+                f"Only the best {self.search_limit} matches are listed; "
+                f"refine the search to see the others.",
+            )
+        return queryset.filter(pk__in=ids), False
+
     def get_translations(self, obj):
-        translations = []
-        translations.append(f"English: {obj.get_translated_question('en')}")
-        translations.append(f"Hindi: {obj.get_translated_question('hi')}")
-        translations.append(f"Bengali: {obj.get_translated_question('bn')}")
-        return format_html("<br> <br>".join(translations))
+        translations = [(LANGUAGE_NAMES["en"], obj.question)]
+        for lang in translated_languages():
+            if hasattr(obj, f"question_{lang}"):
+                # Annotated on the changelist; English until the row lands
+                question = getattr(obj, f"question_{lang}") or obj.question
+            else:
+                question = obj.get_translated_question(lang)
+            translations.append((LANGUAGE_NAMES.get(lang, lang), question))
+        return format_html_join(mark_safe("<br> <br>"), "{}: {}", translations)
 
     get_translations.short_description = _("Translations")
 
+    @admin.display(description=_("Translation status"), ordering="translation_status")
+    def get_translation_status(self, obj):
+        status = getattr(obj, "translation_status", None)
+        return dict(TRANSLATION_STATUS_CHOICES).get(status, status)
+
+    @admin.action(description=_("Re-translate selected FAQs"))
+    def retranslate_selected(self, request, queryset):
+        faq_ids = list(queryset.values_list("pk", flat=True))
+        # One batched task; it invalidates the caches once when done
+        enqueue_on_commit("faqs.tasks.translate_faqs", faq_ids, force=True)
+        messages.success(request, f"Queued {len(faq_ids)} FAQs for translation.")
+
+    def save_related(self, request, form, formsets, change):
+        """
+        Translations edited inline are saved after FAQ.save() has indexed the
+        FAQ and marked its translations pending: re-apply both, and move the
+        FAQ forward in the change feed.
+        """
+        if not any(formset.has_changed() for formset in formsets):
+            return super().save_related(request, form, formsets, change)
+        faq = form.instance
+        with transaction.atomic():
+            seq = next_change_seq()
+            super().save_related(request, form, formsets, change)
+            if change and {"question", "answer"} & set(form.changed_data):
+                # Inline rows were loaded (and saved) with their old status
+                FAQTranslation.objects.filter(faq=faq).mark_pending()
+            record_changes([faq.pk], seq)
+            # FAQ.save() prefetched the translations as they were before
+            getattr(faq, "_prefetched_objects_cache", {}).pop("translations", None)
+            index_faqs([faq])
+            invalidate_faq_caches_on_commit(faq.pk)
+
+    def delete_queryset(self, request, queryset):
+        """
+        Delete the selected FAQs with one DELETE, one search index update, one
+        batch of change feed tombstones and one cache invalidation (instead of
+        per-object deletes).
+        """
+        with transaction.atomic():
+            seq = next_change_seq()
+            faq_ids = list(queryset.values_list("pk", flat=True))
+            FAQ.objects.filter(pk__in=faq_ids).delete()
+            remove_faqs(faq_ids)
+            record_deletions(faq_ids, seq)
+            invalidate_faq_caches_on_commit(*faq_ids)
+
+
+class ImportJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "filename",
+        "status",
+        "imported_rows",
+        "translated_rows",
+        "error_count",
+        "created_at",
+        "finished_at",
+    )
+    list_filter = ("status",)
+    readonly_fields = [field.name for field in ImportJob._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
+
 
 # Register FAQAdmin in the admin panel
 admin.site.register(FAQ, FAQAdmin)
+admin.site.register(ImportJob, ImportJobAdmin)
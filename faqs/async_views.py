@@ -0,0 +1,181 @@
+"""
+Async (ASGI) versions of the read-only FAQ endpoints and the home page.
+
+They return the same payloads as the sync views in faqs.views but talk to
+Redis through redis.asyncio and to the database through Django's async ORM,
+so under an ASGI server a cache hit never occupies a thread. List pages are
+always served as JSON (there is no browsable API here). Searches still
+run the sync search backend in a worker thread. Writes stay on the sync API.
+"""
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse, JsonResponse
+from django.template.loader import render_to_string
+
+from .cache import (
+    acached_home_page,
+    acached_list_page,
+    aread_through,
+    astore_home_page,
+    astore_list_page,
+    detail_cache_key,
+    encode_list_page,
+    home_cache_key,
+    list_cache_key,
+)
+from .conditional import aconditional_get, add_validators, conditional_response
+from .languages import resolve_language
+from .metrics import SERIALIZATION_DURATION
+from .models import FAQ
+from .pagination import (
+    InvalidCursor,
+    aget_page,
+    akeyset_page,
+    get_page_number,
+    get_page_size,
+    uses_cursor,
+    wants_count,
+)
+from .serializers import serialize_faq, wants_translations
+from .views import (
+    accepts_gzip,
+    faq_list_queryset,
+    home_page_context,
+    home_page_token,
+    list_page_response,
+    list_page_token,
+    page_payload,
+    render_json,
+    search_payload,
+)
+
+
+def _json(data, status=200):
+    return JsonResponse(data, status=status, json_dumps_params={"ensure_ascii": False})
+
+
+async def faq_list_view(request):
+    """
+    Async cached_list_response: same parameters, payload and list cache.
+    """
+    lang = resolve_language(request.GET.get("lang", "en"))
+    include_translations = wants_translations(request)
+    page_size = get_page_size(request)
+    query = request.GET.get("q", "").strip()
+    page = list_page_token(request, query)
+    cache_key = list_cache_key(lang, page, page_size, include_translations)
+    gzip = accepts_gzip(request)
+
+    generation, last_modified, entry = await acached_list_page(cache_key, gzip)
+    etag, response = conditional_response(
+        request, generation, last_modified, variant="gzip" if gzip else ""
+    )
+    if response is not None:
+        return response
+
+    if entry is None:
+        try:
+            data = await _list_payload(
+                request, lang, page_size, query, include_translations
+            )
+        except InvalidCursor as e:
+            response = _json({"error": str(e), "status": "fail"}, status=400)
+            return add_validators(response, etag, last_modified)
+        entries = encode_list_page(render_json(data))
+        if generation is not None:
+            await astore_list_page(cache_key, generation, entries)
+        entry = entries[gzip]
+    return add_validators(list_page_response(entry), etag, last_modified)
+
+
+async def _list_payload(request, lang, page_size, query, include_translations):
+    if query:
+        return await sync_to_async(search_payload)(
+            request, query, lang, include_translations
+        )
+    faqs = faq_list_queryset(lang, include_translations)
+    if uses_cursor(request):
+        rows, next_cursor = await akeyset_page(faqs, request.GET["cursor"], page_size)
+        data = {"next_cursor": next_cursor, "next": next_cursor is not None}
+        if wants_count(request):
+            data["count"] = await faqs.acount()
+    else:
+        page_obj = await aget_page(faqs, get_page_number(request), page_size)
+        rows = page_obj.object_list
+        data = page_payload(page_obj)
+    with SERIALIZATION_DURATION.time("faq-list-async"):
+        data["results"] = [
+            serialize_faq(faq, lang, include_translations) for faq in rows
+        ]
+    return data
+
+
+@aconditional_get
+async def faq_detail_view(request, pk):
+    """
+    Async FAQDetailAPIView.get, sharing the detail cache entries.
+    """
+    lang = resolve_language(request.GET.get("lang", "en"))
+    include_translations = wants_translations(request)
+
+    async def load():
+        faqs = FAQ.objects.with_translation(lang)
+        if include_translations:
+            faqs = faqs.prefetch_related("translations")
+        try:
+            faq = await faqs.aget(pk=pk)
+        except FAQ.DoesNotExist:
+            return None
+        with SERIALIZATION_DURATION.time("faq-detail-async"):
+            return serialize_faq(faq, lang, include_translations)
+
+    data = await aread_through(detail_cache_key(pk, lang, include_translations), load)
+    if data is None:
+        return _json(
+            {
+                "error": "FAQ not found.",
+                "message": f"No FAQ with id {pk} exists.",
+                "status": "fail",
+            },
+            status=404,
+        )
+    return _json(data)
+
+
+async def home_page_view(request):
+    """
+    Async home_page_view, sharing the rendered page cache.
+    """
+    lang = resolve_language(request.GET.get("lang", "en"))
+    page_size = get_page_size(request)
+    cache_key = home_cache_key(lang, home_page_token(request), page_size)
+
+    generation, last_modified, html = await acached_home_page(cache_key)
+    etag, response = conditional_response(request, generation, last_modified)
+    if response is not None:
+        return response
+
+    if html is None:
+        html = await _render_home_page(request, lang, page_size)
+        if generation is not None:
+            await astore_home_page(cache_key, generation, html)
+    return add_validators(HttpResponse(html), etag, last_modified)
+
+
+async def _render_home_page(request, lang, page_size):
+    faqs = faq_list_queryset(lang)
+    page_obj = next_cursor = None
+    if uses_cursor(request):
+        try:
+            rows, next_cursor = await akeyset_page(
+                faqs, request.GET["cursor"], page_size
+            )
+        except InvalidCursor:
+            rows, next_cursor = await akeyset_page(faqs, "", page_size)
+    else:
+        page_obj = await aget_page(faqs, get_page_number(request), page_size)
+        rows = page_obj.object_list
+
+    return render_to_string(
+        "faqs/home.html", home_page_context(lang, rows, page_obj, next_cursor)
+    )
@@ -0,0 +1,299 @@
+"""
+Benchmark scenarios for the FAQ service (see the benchmark_faqs command).
+
+Each scenario drives the real views through Django's test client (in process,
+no network) and records the latency of every operation. Results are plain
+dicts (throughput plus p50/p95/p99 latency) that can be written as JSON and
+compared against a stored baseline to catch regressions.
+
+The functions here expect a database and cache that may be freely written to;
+the command sets up a throwaway database, a stub translator and, optionally,
+an in-memory Redis.
+"""
+
+import io
+import math
+import random
+from time import perf_counter
+
+from django.db import transaction
+from django.db.models import prefetch_related_objects
+from django.test import Client
+from django.urls import reverse
+
+from .cache import detail_cache_keys, invalidate_faq_caches, redis_handler
+from .importer import import_faqs_csv
+from .languages import SUPPORTED_LANGUAGES
+from .models import FAQ, FAQTranslation, ImportJob, TRANSLATION_DONE
+from .pagination import encode_cursor
+from .search import index_faqs
+
+WORDS = (
+    "account api billing cache cursor delete export faq guide http index json "
+    "language limit login order page password payment profile query redis "
+    "refund request search server session stream token translate update user"
+).split()
+
+
+def percentile(samples, percent):
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not samples:
+        return 0.0
+    rank = max(math.ceil(percent / 100 * len(samples)), 1)
+    return samples[rank - 1]
+
+
+def summarize(name, samples, total_seconds, operations=None):
+    """
+    Summarize per-operation latencies (seconds) as a result dict in ms.
+    operations counts the units of work (e.g. imported rows) when one sample
+    covers several of them.
+    """
+    samples = sorted(samples)
+    operations = operations or len(samples)
+    return {
+        "scenario": name,
+        "iterations": len(samples),
+        "operations": operations,
+        "throughput": operations / total_seconds if total_seconds else 0.0,
+        "mean_ms": 1000 * sum(samples) / len(samples) if samples else 0.0,
+        "p50_ms": 1000 * percentile(samples, 50),
+        "p95_ms": 1000 * percentile(samples, 95),
+        "p99_ms": 1000 * percentile(samples, 99),
+        "max_ms": 1000 * samples[-1] if samples else 0.0,
+    }
+
+
+def measure(name, operation, iterations, setup=None, warmup=5):
+    """
+    Time operation() iterations times, after warmup untimed calls; setup(),
+    if given, runs untimed before each call.
+    """
+    samples = []
+    for i in range(warmup + iterations):
+        if setup:
+            setup()
+        started = perf_counter()
+        operation()
+        if i >= warmup:
+            samples.append(perf_counter() - started)
+    return summarize(name, samples, sum(samples))
+
+
+def _sentence(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def benchmark_languages(count):
+    """
+    The first count translated languages: supported ones first, then
+    synthetic codes that only grow the translation table.
+    """
+    languages = [lang for lang in SUPPORTED_LANGUAGES if lang != "en"]
+    languages += [f"x{i:02d}" for i in range(max(count - len(languages), 0))]
+    return languages[:count]
+
+
+def seed_corpus(faq_count, languages, batch_size=1000, seed=0):
+    """
+    Insert faq_count FAQs with a done translation in each language and index
+    them. Returns the number of FAQs created.
+    """
+    rng = random.Random(seed)
+    created = 0
+    while created < faq_count:
+        size = min(batch_size, faq_count - created)
+        with transaction.atomic():
+            faqs = FAQ.objects.bulk_create(
+                FAQ(
+                    question=f"{_sentence(rng, 6).capitalize()} {created + i}?",
+                    answer=f"<p>{_sentence(rng, 30)}.</p>",
+                )
+                for i in range(size)
+            )
+            translations = []
+            for faq in faqs:
+                hashes = faq.source_hashes()
+                translations += [
+                    FAQTranslation(
+                        faq=faq,
+                        lang=lang,
+                        question=f"[{lang}] {faq.question}",
+                        answer=f"[{lang}] {faq.answer}",
+                        question_hash=hashes["question"],
+                        answer_hash=hashes["answer"],
+                        status=TRANSLATION_DONE,
+                    )
+                    for lang in languages
+                ]
+            FAQTranslation.objects.bulk_create(translations)
+            prefetch_related_objects(faqs, "translations")
+            index_faqs(faqs)
+        created += size
+    invalidate_faq_caches()
+    return created
+
+
+def _csv_upload(rows, rng):
+    lines = ["question,answer"]
+    for i in range(rows):
+        lines.append(f'"{_sentence(rng, 6)} {i}?","{_sentence(rng, 20)}."')
+    return io.BytesIO("\n".join(lines).encode())
+
+
+def _get(client, url, params=None):
+    response = client.get(url, params or {})
+    if response.status_code != 200:
+        raise RuntimeError(f"GET {url} returned {response.status_code}")
+    return response
+
+
+SCENARIOS = (
+    "list_cache_miss",
+    "list_cache_hit",
+    "list_deep_page_offset",
+    "list_deep_page_cursor",
+    "detail_cache_hit",
+    "detail_cache_miss",
+    "create",
+    "invalidation_storm",
+    "bulk_import",
+)
+
+
+def run_scenarios(names=(), iterations=200, page_size=20, import_rows=1000, seed=0):
+    """
+    Run the named scenarios (all of SCENARIOS when empty) against the current
+    corpus and return their result dicts.
+    """
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        raise ValueError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+    rng = random.Random(seed)
+    client = Client()
+    list_url = reverse("faq-list-api")
+    faq_ids = list(
+        FAQ.objects.order_by("-created_at", "-id").values_list("pk", flat=True)
+    )
+    if not faq_ids:
+        raise ValueError("The benchmark corpus is empty.")
+    hot_ids = faq_ids[:page_size]
+    last_page = math.ceil(len(faq_ids) / page_size)
+    deep_cursor = encode_cursor(
+        FAQ.objects.get(pk=faq_ids[max(len(faq_ids) - page_size - 1, 0)])
+    )
+
+    def list_page(**params):
+        return lambda: _get(
+            client, list_url, {"lang": "hi", "page_size": page_size, **params}
+        )
+
+    def detail(pks, **params):
+        return lambda: _get(
+            client,
+            reverse("faq-detail-api", kwargs={"pk": rng.choice(pks)}),
+            params,
+        )
+
+    def drop_hot_details():
+        redis_handler.delete_many(
+            key for pk in hot_ids for key in detail_cache_keys(pk)
+        )
+
+    def create():
+        response = client.post(
+            list_url,
+            {"question": _sentence(rng, 6) + "?", "answer": _sentence(rng, 20)},
+            content_type="application/json",
+        )
+        if response.status_code != 201:
+            raise RuntimeError(f"POST {list_url} returned {response.status_code}")
+
+    def storm():
+        # A write followed by a read of the first page in every language;
+        # every read misses because the write bumped the list generation.
+        client.patch(
+            reverse("faq-detail-api", kwargs={"pk": rng.choice(faq_ids)}),
+            {"answer": _sentence(rng, 20)},
+            content_type="application/json",
+        )
+        for lang in SUPPORTED_LANGUAGES:
+            list_page(lang=lang)()
+
+    def warmed(name, operation, warmups):
+        for warmup in warmups:
+            warmup()
+        return measure(name, operation, iterations)
+
+    scenarios = {
+        "list_cache_miss": lambda: measure(
+            "list_cache_miss", list_page(), iterations, setup=invalidate_faq_caches
+        ),
+        "list_cache_hit": lambda: warmed("list_cache_hit", list_page(), [list_page()]),
+        "list_deep_page_offset": lambda: measure(
+            "list_deep_page_offset",
+            list_page(page=last_page),
+            iterations,
+            setup=invalidate_faq_caches,
+        ),
+        "list_deep_page_cursor": lambda: measure(
+            "list_deep_page_cursor",
+            list_page(cursor=deep_cursor),
+            iterations,
+            setup=invalidate_faq_caches,
+        ),
+        "detail_cache_hit": lambda: warmed(
+            "detail_cache_hit", detail(hot_ids), [detail([pk]) for pk in hot_ids]
+        ),
+        "detail_cache_miss": lambda: measure(
+            "detail_cache_miss",
+            detail(hot_ids, lang="bn"),
+            iterations,
+            setup=drop_hot_details,
+        ),
+        "create": lambda: measure("create", create, iterations),
+        "invalidation_storm": lambda: measure(
+            "invalidation_storm", storm, max(iterations // 4, 1)
+        ),
+        "bulk_import": lambda: _bulk_import(rng, import_rows),
+    }
+    return [scenarios[name]() for name in names or SCENARIOS]
+
+
+def _bulk_import(rng, rows, runs=3):
+    samples = []
+    for _ in range(runs):
+        upload = _csv_upload(rows, rng)
+        job = ImportJob.objects.create(filename="benchmark.csv")
+        started = perf_counter()
+        import_faqs_csv(job, upload)
+        samples.append(perf_counter() - started)
+    return summarize("bulk_import", samples, sum(samples), operations=rows * runs)
+
+
+def compare(results, baseline, tolerance=0.2):
+    """
+    Compare results with baseline results (both lists of result dicts).
+    Returns human-readable regressions: p95 latency more than tolerance
+    above, or throughput more than tolerance below, the baseline.
+    """
+    previous = {result["scenario"]: result for result in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get(result["scenario"])
+        if not before:
+            continue
+        if result["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{result['scenario']}: p95 {result['p95_ms']:.2f} ms "
+                f"(baseline {before['p95_ms']:.2f} ms)"
+            )
+        if result["throughput"] < before["throughput"] * (1 - tolerance):
+            regressions.append(
+                f"{result['scenario']}: {result['throughput']:.1f} ops/s "
+                f"(baseline {before['throughput']:.1f} ops/s)"
+            )
+    return regressions
@@ -0,0 +1,171 @@
+"""
+Batched FAQ writes for the bulk API.
+
+A request carries arrays of creates, updates and deletes. Every item is
+validated first; if any item is invalid nothing is written. Otherwise the
+whole batch is applied in one transaction with bulk_create / bulk_update /
+a single DELETE, as one change in the change feed; the search index is
+updated in the same transaction, translation of the new and edited FAQs is
+queued as one task and the caches are invalidated once after commit.
+"""
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import prefetch_related_objects
+from django.utils import timezone
+
+from .cache import invalidate_faq_caches_on_commit
+from .changes import next_change_seq, record_deletions
+from .models import FAQ, FAQTranslation
+from .search import index_faqs, remove_faqs
+from .serializers import FAQSerializer
+from .tasks import enqueue_on_commit
+
+OPERATIONS = ("create", "update", "delete")
+
+
+class BulkWriteError(ValueError):
+    """
+    Raised when a batch is rejected; errors maps each operation to a list of
+    {"index": ..., "errors": ...} entries for the offending items.
+    """
+
+    def __init__(self, message, errors=None):
+        super().__init__(message)
+        self.errors = errors or {}
+
+
+def _parse_id(value):
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def validate_bulk_write(data):
+    """
+    Validate a bulk payload. Returns (creates, updates, deletes): creates holds
+    validated field dicts, updates (index, pk, fields) and deletes (index, pk)
+    tuples, index being the item's position in its request array.
+    Raises BulkWriteError listing every invalid item.
+    """
+    if not isinstance(data, dict) or not any(op in data for op in OPERATIONS):
+        raise BulkWriteError('Expected an object with "create", "update" or "delete".')
+    items = {op: data.get(op) or [] for op in OPERATIONS}
+    if not all(isinstance(value, list) for value in items.values()):
+        raise BulkWriteError('"create", "update" and "delete" must be arrays.')
+
+    max_items = getattr(settings, "FAQ_BULK_MAX_ITEMS", 1000)
+    if sum(len(value) for value in items.values()) > max_items:
+        raise BulkWriteError(f"A batch may contain at most {max_items} items.")
+
+    errors = {op: [] for op in OPERATIONS}
+
+    def invalid_id(op, index, message="A valid integer is required."):
+        errors[op].append({"index": index, "errors": {"id": [message]}})
+
+    creates = []
+    for index, item in enumerate(items["create"]):
+        serializer = FAQSerializer(data=item)
+        if serializer.is_valid():
+            creates.append(serializer.validated_data)
+        else:
+            errors["create"].append({"index": index, "errors": serializer.errors})
+
+    updates = []
+    for index, item in enumerate(items["update"]):
+        pk = _parse_id(item.get("id")) if isinstance(item, dict) else None
+        serializer = FAQSerializer(data=item, partial=True)
+        if pk is None:
+            invalid_id("update", index)
+        elif not serializer.is_valid():
+            errors["update"].append({"index": index, "errors": serializer.errors})
+        else:
+            updates.append((index, pk, serializer.validated_data))
+
+    deletes = []
+    for index, value in enumerate(items["delete"]):
+        pk = _parse_id(value)
+        if pk is None:
+            invalid_id("delete", index)
+        else:
+            deletes.append((index, pk))
+
+    # An FAQ may appear at most once across updates and deletes
+    seen = set()
+    for op, targets in (("update", updates), ("delete", deletes)):
+        for index, pk, *_ in targets:
+            if pk in seen:
+                invalid_id(op, index, f"FAQ {pk} appears more than once.")
+            seen.add(pk)
+
+    if any(errors.values()):
+        raise BulkWriteError("Some items are invalid.", errors)
+    return creates, updates, deletes
+
+
+def apply_bulk_write(data):
+    """
+    Validate and apply a bulk payload in one transaction. Returns per-item
+    results ({"index": ..., "id": ...}) for each operation, in request order.
+    """
+    creates, updates, deletes = validate_bulk_write(data)
+    delete_ids = [pk for _, pk in deletes]
+
+    with transaction.atomic():
+        # The whole batch is one change in the feed
+        seq = next_change_seq()
+        existing = FAQ.objects.select_for_update().in_bulk(
+            [pk for _, pk, _ in updates] + delete_ids
+        )
+        missing = {
+            op: [
+                {"index": index, "errors": {"id": [f"No FAQ with id {pk} exists."]}}
+                for index, pk, *_ in targets
+                if pk not in existing
+            ]
+            for op, targets in (("update", updates), ("delete", deletes))
+        }
+        if any(missing.values()):
+            raise BulkWriteError("Some FAQs do not exist.", missing)
+
+        created = FAQ.objects.bulk_create(
+            FAQ(**fields, change_seq=seq) for fields in creates
+        )
+
+        now = timezone.now()
+        updated = []
+        for _, pk, fields in updates:
+            faq = existing[pk]
+            for field, value in fields.items():
+                setattr(faq, field, value)
+            faq.updated_at = now  # bulk_update skips auto_now
+            faq.change_seq = seq
+            updated.append(faq)
+        # Edited FAQs are re-translated field by field (see FAQ.translate_many)
+        edited_ids = [faq.pk for faq in updated if faq.source_changed()]
+        FAQ.objects.bulk_update(
+            updated, ["question", "answer", "updated_at", "change_seq"]
+        )
+        FAQTranslation.objects.filter(faq__in=edited_ids).mark_pending()
+
+        FAQ.objects.filter(pk__in=delete_ids).delete()
+        record_deletions(delete_ids, seq)
+
+        prefetch_related_objects(created + updated, "translations")
+        index_faqs(created + updated)
+        remove_faqs(delete_ids)
+
+        created_ids = [faq.pk for faq in created]
+        if created_ids or edited_ids:
+            enqueue_on_commit("faqs.tasks.translate_faqs", created_ids + edited_ids)
+        # One invalidation for the whole batch
+        invalidate_faq_caches_on_commit(*[faq.pk for faq in updated], *delete_ids)
+
+    return {
+        "create": [{"index": i, "id": pk} for i, pk in enumerate(created_ids)],
+        "update": [{"index": index, "id": pk} for index, pk, _ in updates],
+        "delete": [{"index": index, "id": pk} for index, pk in deletes],
+    }
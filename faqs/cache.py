@@ -0,0 +1,543 @@
+"""
+Cache keys and invalidation for FAQ responses.
+
+Cached pages are versioned by a generation number. Any FAQ write bumps the
+generation with a single INCR, which makes every previously cached page (for
+every language, page and page size) stale at once; the stale entries simply
+expire with their TTL. No SCAN/KEYS is ever needed.
+
+List pages are stored as the final JSON response body (plus a gzipped copy
+for clients that accept it) and home pages as rendered HTML, each with the
+generation they were rendered at, and discarded on read once it moved on. A
+hit is a single MGET whose bytes are sent back as they are.
+
+The first list pages, their details and home pages can be rebuilt in the
+background right after an invalidation (FAQ_CACHE_WARMING["REFILL_PAGES"],
+see faqs.warming).
+
+The same generation, with the time of the last write, versions the HTTP
+validators (ETag / Last-Modified) of every FAQ response; see faqs.conditional.
+
+Async views use the a*-prefixed helpers, which read the same keys through
+redis.asyncio; invalidation always goes through the sync client.
+
+Detail entries are cached per (pk, lang, variant) through read_through(),
+which lets a single caller rebuild a missing entry while concurrent callers
+wait for it, and refreshes hot entries slightly before they expire. A rebuild
+stores its entry only if no invalidation happened while it loaded, so a load
+that raced a write cannot put the old data back after the write dropped it.
+
+The cache fails open (see RedisHandler). An invalidation that could not reach
+Redis is remembered and replayed before this process reads the generation
+again, so a Redis blip cannot leave stale pages cached forever.
+"""
+
+import asyncio
+import gzip
+import math
+import random
+import threading
+import uuid
+from time import monotonic, sleep, time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+
+from .languages import SUPPORTED_LANGUAGES
+from .metrics import record_cache_lookup
+from .redis_handler import (
+    RAW_REPLY,
+    AsyncRedisHandler,
+    CircuitBreaker,
+    RedisHandler,
+)
+
+redis_handler = RedisHandler()
+async_redis_handler = AsyncRedisHandler(breaker=redis_handler.breaker)
+
+LIST_GENERATION_KEY = "faqs:list:generation"
+LAST_MODIFIED_KEY = "faqs:last_modified"
+
+DEFAULT_LIST_CACHE = {"TIMEOUT": 3600, "GZIP_MIN_BYTES": 1024}
+DEFAULT_HOME_CACHE = {"TIMEOUT": 3600}
+# See faqs.warming; REFILL_PAGES > 0 refills the first pages after every write
+DEFAULT_CACHE_WARMING = {"PAGES": 5, "WORKERS": 4, "DETAILS": True, "REFILL_PAGES": 0}
+
+_missed_invalidation = None  # pks whose invalidation did not reach Redis
+_missed_lock = threading.Lock()
+
+
+def list_generation():
+    """
+    Return the current list generation, or None if Redis is unavailable.
+    """
+    if _missed_invalidation is not None:
+        invalidate_faq_caches()
+    value = redis_handler.execute(
+        lambda client: client.get(LIST_GENERATION_KEY), default=False
+    )
+    if value is False:
+        return None
+    return int(value or 0)
+
+
+def content_version():
+    """
+    Return (generation, last modified timestamp) of the FAQ content in one
+    round-trip, or (None, None) if Redis is unavailable.
+    """
+    if _missed_invalidation is not None:
+        invalidate_faq_caches()
+    values = redis_handler.execute(
+        lambda client: client.mget([LIST_GENERATION_KEY, LAST_MODIFIED_KEY])
+    )
+    if values is None:
+        return None, None
+    return _parse_content_version(values)
+
+
+async def acontent_version():
+    if _missed_invalidation is not None:
+        await sync_to_async(invalidate_faq_caches)()
+    values = await async_redis_handler.execute(
+        lambda client: client.mget([LIST_GENERATION_KEY, LAST_MODIFIED_KEY])
+    )
+    if values is None:
+        return None, None
+    return _parse_content_version(values)
+
+
+def _parse_content_version(values):
+    generation, last_modified = values
+    return int(generation or 0), int(last_modified) if last_modified else None
+
+
+def list_cache_key(lang, page, page_size, include_translations=False):
+    """
+    Key of a rendered list page. As for home pages, the generation is stored
+    in the value, so one MGET returns the content version and the page.
+    """
+    variant = "all" if include_translations else "one"
+    return f"faqs:list:{lang}:p{page}:s{page_size}:{variant}"
+
+
+def _list_entry_key(key, compressed):
+    return f"{key}:gz" if compressed else key
+
+
+def cached_list_page(key, compressed=False):
+    """
+    Return (generation, last modified timestamp, (body, content encoding)) in
+    one round-trip, reading the copy kept for gzip clients if compressed.
+    The entry is None unless the page was rendered at the current generation;
+    everything is None if Redis is unavailable.
+    """
+    if _missed_invalidation is not None:
+        invalidate_faq_caches()
+    keys = [LIST_GENERATION_KEY, LAST_MODIFIED_KEY, _list_entry_key(key, compressed)]
+    values = redis_handler.execute(
+        lambda client: client.execute_command("MGET", *keys, **RAW_REPLY)
+    )
+    return _parse_list_page(key, values)
+
+
+async def acached_list_page(key, compressed=False):
+    if _missed_invalidation is not None:
+        await sync_to_async(invalidate_faq_caches)()
+    keys = [LIST_GENERATION_KEY, LAST_MODIFIED_KEY, _list_entry_key(key, compressed)]
+    values = await async_redis_handler.execute(
+        lambda client: client.execute_command("MGET", *keys, **RAW_REPLY)
+    )
+    return _parse_list_page(key, values)
+
+
+def _parse_list_page(key, values):
+    if values is None:
+        record_cache_lookup(key, None, error=True)
+        return None, None, None
+    generation, last_modified = _parse_content_version(values[:2])
+    entry = None
+    if values[2]:
+        stored_generation, encoding, body = values[2].split(b"\n", 2)
+        if int(stored_generation) == generation:
+            entry = body, encoding.decode()
+    record_cache_lookup(key, entry)
+    return generation, last_modified, entry
+
+
+def encode_list_page(body):
+    """
+    Return the (body, content encoding) entries of a rendered list page for
+    plain and gzip clients. Bodies under GZIP_MIN_BYTES are not compressed.
+    """
+    min_bytes = get_list_cache_config()["GZIP_MIN_BYTES"]
+    if min_bytes is None or len(body) < min_bytes:
+        return (body, ""), (body, "")
+    return (body, ""), (gzip.compress(body, mtime=0), "gzip")
+
+
+def _list_page_values(key, generation, entries):
+    return {
+        _list_entry_key(key, compressed): b"%d\n%s\n%s"
+        % (generation, encoding.encode(), body)
+        for compressed, (body, encoding) in zip((False, True), entries)
+    }
+
+
+def _setex_many(pipe, values, timeout):
+    for key, value in values.items():
+        pipe.setex(key, timeout, value)
+    return pipe
+
+
+def store_list_page(key, generation, entries):
+    """
+    Store the entries returned by encode_list_page() in one round-trip.
+    """
+    timeout = get_list_cache_config()["TIMEOUT"]
+    values = _list_page_values(key, generation, entries)
+    redis_handler.execute(
+        lambda client: _setex_many(
+            client.pipeline(transaction=False), values, timeout
+        ).execute()
+    )
+
+
+async def astore_list_page(key, generation, entries):
+    timeout = get_list_cache_config()["TIMEOUT"]
+    values = _list_page_values(key, generation, entries)
+    await async_redis_handler.execute(
+        lambda client: _setex_many(
+            client.pipeline(transaction=False), values, timeout
+        ).execute()
+    )
+
+
+def get_list_cache_config():
+    return {**DEFAULT_LIST_CACHE, **getattr(settings, "FAQ_LIST_CACHE", {})}
+
+
+def get_home_cache_config():
+    return {**DEFAULT_HOME_CACHE, **getattr(settings, "FAQ_HOME_CACHE", {})}
+
+
+def get_warming_config():
+    return {**DEFAULT_CACHE_WARMING, **getattr(settings, "FAQ_CACHE_WARMING", {})}
+
+
+def home_cache_key(lang, page, page_size):
+    """
+    Key of a rendered home page. The generation is stored in the value rather
+    than the key, so one MGET returns the content version and the page.
+    """
+    return f"faqs:home:{lang}:{page}:s{page_size}"
+
+
+def cached_home_page(key):
+    """
+    Return (generation, last modified timestamp, html) in one round-trip.
+    html is None unless the page was rendered at the current generation;
+    everything is None if Redis is unavailable.
+    """
+    if _missed_invalidation is not None:
+        invalidate_faq_caches()
+    values = redis_handler.execute(
+        lambda client: client.mget([LIST_GENERATION_KEY, LAST_MODIFIED_KEY, key])
+    )
+    return _parse_home_page(key, values)
+
+
+async def acached_home_page(key):
+    if _missed_invalidation is not None:
+        await sync_to_async(invalidate_faq_caches)()
+    values = await async_redis_handler.execute(
+        lambda client: client.mget([LIST_GENERATION_KEY, LAST_MODIFIED_KEY, key])
+    )
+    return _parse_home_page(key, values)
+
+
+def _parse_home_page(key, values):
+    if values is None:
+        record_cache_lookup(key, None, error=True)
+        return None, None, None
+    generation, last_modified = _parse_content_version(values[:2])
+    stored_generation, _, html = (values[2] or "").partition("\n")
+    if stored_generation != str(generation):
+        html = None  # Rendered before the last write
+    record_cache_lookup(key, html)
+    return generation, last_modified, html
+
+
+def _home_page_entry(generation, html):
+    return f"{generation}\n{html}"
+
+
+def store_home_page(key, generation, html):
+    timeout = get_home_cache_config()["TIMEOUT"]
+    entry = _home_page_entry(generation, html)
+    redis_handler.execute(lambda client: client.setex(key, timeout, entry))
+
+
+async def astore_home_page(key, generation, html):
+    timeout = get_home_cache_config()["TIMEOUT"]
+    entry = _home_page_entry(generation, html)
+    await async_redis_handler.execute(lambda client: client.setex(key, timeout, entry))
+
+
+def detail_cache_key(pk, lang="en", include_translations=False):
+    variant = "all" if include_translations else "one"
+    return f"faq:{pk}:{lang}:{variant}"
+
+
+def detail_cache_keys(pk):
+    return [
+        detail_cache_key(pk, lang, include_translations)
+        for lang in SUPPORTED_LANGUAGES
+        for include_translations in (False, True)
+    ]
+
+
+class _SingleFlight:
+    """
+    Collapses concurrent loads of the same key inside this process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, func):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = {"done": threading.Event()}
+        if not leader:
+            call["done"].wait()
+            if "error" in call:
+                raise call["error"]
+            return call["value"]
+        try:
+            call["value"] = func()
+            return call["value"]
+        except Exception as e:
+            call["error"] = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call["done"].set()
+
+
+_single_flight = _SingleFlight()
+
+
+def read_through(key, loader, timeout=3600, lock_timeout=5.0, wait=1.0, beta=1.0):
+    """
+    Return the cached value of key, computing it with loader() on a miss.
+
+    Only one caller per key rebuilds a missing entry: callers in the same
+    process share one load, and across processes a short Redis lock elects
+    the rebuilder while the others poll for its result (for at most wait
+    seconds, then load without caching). Hits are refreshed early with
+    probability growing as expiry approaches ("XFetch"), weighted by how long
+    the value took to compute, so popular keys do not expire in sync.
+
+    loader() returning None (e.g. object not found) is not cached.
+    """
+    entry = redis_handler.get_cache(key)
+    if _is_entry(entry):
+        if _is_fresh(entry, beta):
+            return entry["value"]
+        token = acquire_lock(key, lock_timeout)
+        if token is None:
+            return entry["value"]
+        return _rebuild(key, loader, timeout, lock_token=token)
+
+    return _single_flight.do(
+        key, lambda: _load_on_miss(key, loader, timeout, lock_timeout, wait)
+    )
+
+
+async def aread_through(
+    key, loader, timeout=3600, lock_timeout=5.0, wait=1.0, beta=1.0
+):
+    """
+    Async read_through() for an async loader. Concurrent misses are collapsed
+    by the Redis lock alone: coroutines that lose it poll for the result.
+    """
+    entry = await async_redis_handler.get_cache(key)
+    if _is_entry(entry):
+        if _is_fresh(entry, beta):
+            return entry["value"]
+        token = await aacquire_lock(key, lock_timeout)
+        if token is None:
+            return entry["value"]
+        return await _arebuild(key, loader, timeout, token)
+
+    token = await aacquire_lock(key, lock_timeout)
+    if token is not None:
+        return await _arebuild(key, loader, timeout, token)
+
+    deadline = monotonic() + wait
+    while (
+        async_redis_handler.breaker.state != CircuitBreaker.OPEN
+        and monotonic() < deadline
+    ):
+        await asyncio.sleep(0.02)
+        entry = await async_redis_handler.get_cache(key)
+        if _is_entry(entry):
+            return entry["value"]
+        if not await async_redis_handler.execute(
+            lambda client: client.exists(_lock_key(key)), default=0
+        ):
+            break
+    return await loader()
+
+
+def _is_entry(entry):
+    return isinstance(entry, dict) and "value" in entry
+
+
+def _is_fresh(entry, beta):
+    early = entry["delta"] * beta * -math.log(1.0 - random.random())
+    return time() + early < entry["expires"]
+
+
+def _make_entry(value, delta, timeout):
+    return {"value": value, "delta": delta, "expires": time() + timeout}
+
+
+def _lock_key(key):
+    return f"lock:{key}"
+
+
+def acquire_lock(key, lock_timeout):
+    """
+    Try to take the short-lived lock:{key}. Returns the token to release it
+    with if this caller got it, otherwise None.
+    """
+    token = uuid.uuid4().hex
+    acquired = redis_handler.execute(
+        lambda client: client.set(
+            _lock_key(key), token, nx=True, px=int(lock_timeout * 1000)
+        ),
+        default=None,
+    )
+    return token if acquired else None
+
+
+def release_lock(key, token):
+    """
+    Release lock:{key} if it is still held with token. Once it has expired
+    another caller may hold it, and that caller's lock is left alone.
+    """
+    redis_handler.delete_if_equal(_lock_key(key), token)
+
+
+async def aacquire_lock(key, lock_timeout):
+    token = uuid.uuid4().hex
+    acquired = await async_redis_handler.execute(
+        lambda client: client.set(
+            _lock_key(key), token, nx=True, px=int(lock_timeout * 1000)
+        ),
+        default=None,
+    )
+    return token if acquired else None
+
+
+def _generation_value(generation):
+    # LIST_GENERATION_KEY as Redis holds it (unset until the first write)
+    return str(generation) if generation else None
+
+
+def _rebuild(key, loader, timeout, lock_token=None):
+    started = monotonic()
+    # Read before loading: an invalidation from here on bumps the generation,
+    # and the entry (maybe loaded from rows it replaced) is then not stored.
+    generation = list_generation()
+    try:
+        value = loader()
+        if value is not None and generation is not None:
+            entry = _make_entry(value, monotonic() - started, timeout)
+            redis_handler.set_cache_if_unchanged(
+                key,
+                entry,
+                timeout,
+                LIST_GENERATION_KEY,
+                _generation_value(generation),
+            )
+        return value
+    finally:
+        if lock_token is not None:
+            release_lock(key, lock_token)
+
+
+async def _arebuild(key, loader, timeout, lock_token):
+    started = monotonic()
+    generation, _ = await acontent_version()
+    try:
+        value = await loader()
+        if value is not None and generation is not None:
+            entry = _make_entry(value, monotonic() - started, timeout)
+            await async_redis_handler.set_cache_if_unchanged(
+                key,
+                entry,
+                timeout,
+                LIST_GENERATION_KEY,
+                _generation_value(generation),
+            )
+        return value
+    finally:
+        await async_redis_handler.delete_if_equal(_lock_key(key), lock_token)
+
+
+def _load_on_miss(key, loader, timeout, lock_timeout, wait):
+    token = acquire_lock(key, lock_timeout)
+    if token is not None:
+        return _rebuild(key, loader, timeout, lock_token=token)
+
+    # Someone else is rebuilding (or Redis is down): wait briefly for them.
+    deadline = monotonic() + wait
+    while redis_handler.breaker.state != CircuitBreaker.OPEN and monotonic() < deadline:
+        sleep(0.02)
+        entry = redis_handler.get_cache(key)
+        if _is_entry(entry):
+            return entry["value"]
+        if not redis_handler.execute(
+            lambda client: client.exists(_lock_key(key)), default=0
+        ):
+            break
+    return loader()
+
+
+def invalidate_faq_caches(*pks):
+    """
+    Invalidate every cached list page, plus the detail entries of the given FAQs.
+    """
+    global _missed_invalidation
+    with _missed_lock:
+        pks = {*pks, *(_missed_invalidation or ())}
+        _missed_invalidation = None
+
+    def operation(client):
+        pipe = client.pipeline(transaction=False)
+        pipe.incr(LIST_GENERATION_KEY)
+        pipe.set(LAST_MODIFIED_KEY, int(time()))
+        if pks:
+            pipe.delete(*[key for pk in pks for key in detail_cache_keys(pk)])
+        return pipe.execute()
+
+    if redis_handler.execute(operation) is None:
+        with _missed_lock:
+            _missed_invalidation = pks | (_missed_invalidation or set())
+    elif get_warming_config()["REFILL_PAGES"]:
+        from .tasks import enqueue
+
+        # Rebuild the busiest pages before visitors ask for them
+        enqueue("faqs.tasks.refill_faq_caches")
+
+
+def invalidate_faq_caches_on_commit(*pks):
+    transaction.on_commit(lambda: invalidate_faq_caches(*pks))
@@ -0,0 +1,234 @@
+"""
+Encoding of the values RedisHandler stores (e.g. detail entries).
+
+Every value starts with a five-byte header: the magic b"FQ", the format
+version, the serializer id and the compression id, followed by the payload.
+The serializer ("json", through orjson when it is installed, or "msgpack")
+and the compression ("zlib" or "lz4", only for payloads of at least
+COMPRESS_MIN_BYTES) are chosen by settings.FAQ_CACHE_CODEC. Because each
+value names its own format, the codec can be changed without flushing
+Redis: entries in another format are still decoded, and values written
+before the header existed (plain JSON text) are read as before. Entries
+that cannot be decoded here (a newer format version, a library that is not
+installed) are treated as cache misses and overwritten on the next store.
+
+Encoded sizes and decode times are recorded per codec in the metrics.
+"""
+
+import json
+import zlib
+from time import perf_counter
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from .metrics import CACHE_DECODE_DURATION, CACHE_PAYLOAD_BYTES
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import lz4.frame
+except ImportError:
+    lz4 = None
+
+MAGIC = b"FQ"
+FORMAT_VERSION = 1
+HEADER_SIZE = len(MAGIC) + 3
+
+DEFAULT_CACHE_CODEC = {
+    "SERIALIZER": "json",
+    "COMPRESSION": None,
+    "COMPRESS_MIN_BYTES": 1024,
+    "COMPRESSION_LEVEL": None,
+}
+
+_codec = None
+
+
+class UndecodableValue(ValueError):
+    """
+    A cached value in a format this process cannot read.
+    """
+
+
+def _json_dumps(value):
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _json_loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _msgpack_dumps(value):
+    return msgpack.packb(value, use_bin_type=True)
+
+
+def _msgpack_loads(data):
+    return msgpack.unpackb(data, raw=False)
+
+
+def _zlib_compress(data, level):
+    return zlib.compress(data, 6 if level is None else level)
+
+
+def _lz4_compress(data, level):
+    return lz4.frame.compress(data, compression_level=level or 0)
+
+
+# name -> (header id, dumps, loads, library available)
+SERIALIZERS = {
+    "json": (1, _json_dumps, _json_loads, True),
+    "msgpack": (2, _msgpack_dumps, _msgpack_loads, msgpack is not None),
+}
+# name -> (header id, compress, decompress, library available)
+COMPRESSIONS = {
+    None: (0, None, None, True),
+    "zlib": (1, _zlib_compress, zlib.decompress, True),
+    "lz4": (
+        2,
+        _lz4_compress,
+        lz4.frame.decompress if lz4 is not None else None,
+        lz4 is not None,
+    ),
+}
+_SERIALIZER_NAMES = {spec[0]: name for name, spec in SERIALIZERS.items()}
+_COMPRESSION_NAMES = {spec[0]: name for name, spec in COMPRESSIONS.items()}
+
+
+def codec_label(serializer, compression):
+    """
+    Metrics label of a codec: "json", "msgpack+zlib", ...
+    """
+    return f"{serializer}+{compression}" if compression else serializer
+
+
+class CacheCodec:
+    """
+    Encodes values as header + (optionally compressed) payload and decodes
+    any value written by a CacheCodec, whatever its settings, or before.
+    """
+
+    def __init__(
+        self,
+        serializer="json",
+        compression=None,
+        compress_min_bytes=1024,
+        compression_level=None,
+    ):
+        if serializer not in SERIALIZERS:
+            raise ImproperlyConfigured(f"Unknown cache serializer {serializer!r}.")
+        if compression not in COMPRESSIONS:
+            raise ImproperlyConfigured(f"Unknown cache compression {compression!r}.")
+        if not SERIALIZERS[serializer][3]:
+            raise ImproperlyConfigured(
+                f"The {serializer} cache serializer needs the {serializer} package."
+            )
+        if not COMPRESSIONS[compression][3]:
+            raise ImproperlyConfigured(
+                f"The {compression} cache compression needs the {compression} package."
+            )
+        self.serializer = serializer
+        self.compression = compression
+        self.compress_min_bytes = compress_min_bytes
+        self.compression_level = compression_level
+
+    def encode(self, value):
+        serializer_id, dumps = SERIALIZERS[self.serializer][:2]
+        payload = dumps(value)
+        compression = None
+        if self.compression and len(payload) >= self.compress_min_bytes:
+            compress = COMPRESSIONS[self.compression][1]
+            compressed = compress(payload, self.compression_level)
+            if len(compressed) < len(payload):
+                payload, compression = compressed, self.compression
+        header = MAGIC + bytes(
+            [FORMAT_VERSION, serializer_id, COMPRESSIONS[compression][0]]
+        )
+        data = header + payload
+        CACHE_PAYLOAD_BYTES.observe(
+            len(data), codec_label(self.serializer, compression)
+        )
+        return data
+
+    def decode(self, data):
+        """
+        Decode a stored value. Raises UndecodableValue if it cannot be read.
+        """
+        if isinstance(data, str):
+            data = data.encode()
+        if not data.startswith(MAGIC):
+            return _decode_legacy(data)
+        if len(data) < HEADER_SIZE or data[2] != FORMAT_VERSION:
+            raise UndecodableValue("Unknown cache format version.")
+        serializer = _SERIALIZER_NAMES.get(data[3])
+        compression = _COMPRESSION_NAMES.get(data[4], False)
+        if (
+            serializer is None
+            or compression is False
+            or not SERIALIZERS[serializer][3]
+            or not COMPRESSIONS[compression][3]
+        ):
+            raise UndecodableValue("Cached value uses an unavailable codec.")
+
+        started = perf_counter()
+        payload = data[HEADER_SIZE:]
+        try:
+            if compression:
+                payload = COMPRESSIONS[compression][2](payload)
+            value = SERIALIZERS[serializer][2](payload)
+        except Exception as e:
+            raise UndecodableValue(f"Corrupt cached value: {e}") from e
+        CACHE_DECODE_DURATION.observe(
+            perf_counter() - started, codec_label(serializer, compression)
+        )
+        return value
+
+
+def _decode_legacy(data):
+    # Plain JSON text, as stored before values carried a header
+    text = data.decode("utf-8", errors="replace")
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return text
+
+
+def get_codec_config():
+    return {**DEFAULT_CACHE_CODEC, **getattr(settings, "FAQ_CACHE_CODEC", {})}
+
+
+def get_codec():
+    """
+    Return the process-wide codec configured by settings.FAQ_CACHE_CODEC.
+    """
+    global _codec
+    if _codec is None:
+        config = get_codec_config()
+        _codec = CacheCodec(
+            serializer=config["SERIALIZER"],
+            compression=config["COMPRESSION"],
+            compress_min_bytes=config["COMPRESS_MIN_BYTES"],
+            compression_level=config["COMPRESSION_LEVEL"],
+        )
+    return _codec
+
+
+@receiver(setting_changed)
+def _reset_codec(setting, **kwargs):
+    global _codec
+    if setting == "FAQ_CACHE_CODEC":
+        _codec = None
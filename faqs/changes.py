@@ -0,0 +1,206 @@
+"""
+Change feed (delta sync) for FAQ clients.
+
+Every write gives the FAQs it touches a new change sequence number
+(FAQ.change_seq): creates, edits, bulk writes, imports and landed
+translations. Deletions leave a compact FAQTombstone with their own number.
+GET /api/faqs/changes/?since=<cursor> returns, in sequence order, the FAQs
+changed and the FAQs deleted after the cursor, so a client syncs in
+O(changes) rather than re-reading the corpus.
+
+Sequence numbers come from the single ChangeCounter row, incremented in the
+writing transaction. The row stays locked until that transaction ends, so
+numbers become visible in the order they were handed out and a reader never
+moves past a number whose transaction has yet to commit. One write gets one
+number (a bulk write shares it between its FAQs), so the cursor is the
+(sequence number, FAQ id) of the last change returned.
+
+Tombstones are kept for FAQ_CHANGE_FEED["TOMBSTONE_RETENTION_DAYS"] days
+(purge_faq_tombstones). A cursor older than the newest purged tombstone can
+no longer see every deletion and is rejected as expired: the client starts
+over without a cursor.
+"""
+
+import base64
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .pagination import InvalidCursor
+
+DEFAULT_CHANGE_FEED = {
+    "PAGE_SIZE": 100,
+    "MAX_PAGE_SIZE": 1000,
+    "TOMBSTONE_RETENTION_DAYS": 30,
+}
+
+CHANGE_UPSERT = "upsert"
+CHANGE_DELETE = "delete"
+# Cursor id sorting after every FAQ id: the position past a whole sequence number
+END_PK = 2**63 - 1
+
+
+class ExpiredCursor(InvalidCursor):
+    pass
+
+
+def get_change_feed_config():
+    return {**DEFAULT_CHANGE_FEED, **getattr(settings, "FAQ_CHANGE_FEED", {})}
+
+
+def next_change_seq():
+    """
+    Hand out the next change sequence number. The counter row stays locked
+    until the calling transaction ends, so call this first in a write
+    transaction (before locking FAQ rows) to keep the lock order the same
+    everywhere.
+    """
+    from .models import ChangeCounter
+
+    with transaction.atomic():
+        counters = ChangeCounter.objects.filter(pk=1)
+        if not counters.update(value=F("value") + 1):
+            ChangeCounter.objects.get_or_create(pk=1)
+            counters.update(value=F("value") + 1)
+        return counters.values_list("value", flat=True).get()
+
+
+def record_changes(pks, seq=None):
+    """
+    Move the given FAQs to the head of the change feed, at seq if the
+    transaction already holds a sequence number.
+    """
+    from .models import FAQ
+
+    pks = list(pks)
+    if pks:
+        with transaction.atomic():
+            seq = seq or next_change_seq()
+            FAQ.objects.filter(pk__in=pks).update(change_seq=seq)
+
+
+def record_deletions(pks, seq=None):
+    """
+    Leave a tombstone for each deleted FAQ.
+    """
+    from .models import FAQTombstone
+
+    pks = list(pks)
+    if pks:
+        with transaction.atomic():
+            seq = seq or next_change_seq()
+            FAQTombstone.objects.bulk_create(
+                FAQTombstone(faq_id=pk, change_seq=seq) for pk in pks
+            )
+
+
+def purge_tombstones(retention_days=None):
+    """
+    Delete the tombstones older than the retention period and remember the
+    newest purged sequence number. Returns the number of tombstones deleted.
+    """
+    from .models import ChangeCounter, FAQTombstone
+
+    if retention_days is None:
+        retention_days = get_change_feed_config()["TOMBSTONE_RETENTION_DAYS"]
+    expired = FAQTombstone.objects.filter(
+        deleted_at__lt=timezone.now() - timedelta(days=retention_days)
+    )
+    with transaction.atomic():
+        newest = expired.order_by("-change_seq").values_list("change_seq", flat=True)
+        newest = newest.first()
+        if newest is None:
+            return 0
+        ChangeCounter.objects.get_or_create(pk=1)
+        ChangeCounter.objects.filter(pk=1, purged_seq__lt=newest).update(
+            purged_seq=newest
+        )
+        deleted, _ = expired.filter(change_seq__lte=newest).delete()
+    return deleted
+
+
+def encode_change_cursor(seq, pk):
+    raw = f"{seq}|{pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_change_cursor(cursor):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        seq, pk = base64.urlsafe_b64decode(padded).decode().split("|")
+        return int(seq), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        raise InvalidCursor(f"Invalid cursor: {cursor!r}")
+
+
+def _counter():
+    """
+    (newest sequence number handed out, newest purged sequence number).
+    """
+    from .models import ChangeCounter
+
+    counter = ChangeCounter.objects.filter(pk=1).values_list("value", "purged_seq")
+    return counter.first() or (0, 0)
+
+
+def _after(queryset, position, pk_field):
+    if position is None:
+        return queryset
+    seq, pk = position
+    return queryset.filter(
+        Q(change_seq__gt=seq) | Q(change_seq=seq, **{f"{pk_field}__gt": pk})
+    )
+
+
+def _change_position(change):
+    kind, row = change
+    return row.change_seq, row.pk if kind == CHANGE_UPSERT else row.faq_id
+
+
+def changes_since(faqs, cursor, limit):
+    """
+    Return (changes, next_cursor, has_more) for the changes after cursor
+    ("" for a full sync). faqs is the FAQ queryset to read changed FAQs from
+    (e.g. joined to a language); changes are (CHANGE_UPSERT, faq) and
+    (CHANGE_DELETE, tombstone) pairs in feed order. Raises InvalidCursor, or
+    ExpiredCursor if tombstones after the cursor were already purged.
+    """
+    from .models import FAQTombstone
+
+    position = decode_change_cursor(cursor) if cursor else None
+    # Read before the changes: every number up to head is committed by now
+    head, purged_seq = _counter()
+    if position is not None and purged_seq and position < (purged_seq, END_PK):
+        raise ExpiredCursor("Cursor expired; sync again without a cursor.")
+
+    # Both reads stop at head: a change committed between them (or later) has a
+    # higher number and is left for the next page, so none can be skipped
+    upserts = _after(faqs.filter(change_seq__lte=head), position, "id")
+    upserts = upserts.order_by("change_seq", "id")[: limit + 1]
+    # A full sync only needs the deletions that happen while it pages
+    tombstones = FAQTombstone.objects.none()
+    if position is not None:
+        tombstones = _after(
+            FAQTombstone.objects.filter(change_seq__lte=head), position, "faq_id"
+        )
+        tombstones = tombstones.order_by("change_seq", "faq_id")[: limit + 1]
+    changes = sorted(
+        [(CHANGE_UPSERT, faq) for faq in upserts]
+        + [(CHANGE_DELETE, tombstone) for tombstone in tombstones],
+        key=_change_position,
+    )
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    if has_more:
+        position = _change_position(changes[-1])
+    else:
+        # Both reads came back short, so every change up to head was returned:
+        # resume after head, past the changes this view skips
+        position = max(
+            _change_position(changes[-1]) if changes else position or (0, 0),
+            (head, END_PK),
+        )
+    return changes, encode_change_cursor(*position), has_more
@@ -0,0 +1,121 @@
+"""
+Conditional GET (ETag / Last-Modified) for the public FAQ views.
+
+Validators are derived from the content generation kept in Redis (bumped by
+every FAQ write and translation, see faqs.cache) rather than from the
+response body, so a revalidation that matches is answered with 304 before
+the view runs: no database query and no serialization. The ETag covers the
+full query string (language, page, search, ...) and the Accept header, so
+each language and representation gets its own strong validator.
+
+When Redis is unavailable no validators are sent and every request is
+served in full.
+"""
+
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils.http import http_date, quote_etag, urlencode
+
+from .cache import acontent_version, content_version
+
+
+def response_etag(request, generation, variant=""):
+    query = urlencode(sorted(request.GET.lists()), doseq=True)
+    key = "|".join(
+        [
+            str(generation),
+            request.path,
+            query,
+            request.META.get("HTTP_ACCEPT", ""),
+            variant,
+        ]
+    )
+    return quote_etag(hashlib.sha1(key.encode()).hexdigest())
+
+
+def _set_validators(response, etag, last_modified):
+    response.headers["ETag"] = etag
+    if last_modified:
+        response.headers["Last-Modified"] = http_date(last_modified)
+
+
+def _set_caching_headers(response):
+    # Shared caches may store the response, but must revalidate it once
+    # FAQ_HTTP_MAX_AGE seconds have passed.
+    patch_cache_control(
+        response,
+        public=True,
+        max_age=getattr(settings, "FAQ_HTTP_MAX_AGE", 0),
+        must_revalidate=True,
+    )
+    patch_vary_headers(response, ("Accept",))
+
+
+def conditional_response(request, generation, last_modified, variant=""):
+    """
+    Return (etag, 304/412 response or None) for the given content version.
+    variant tells apart representations the view picks itself (e.g. "gzip").
+    """
+    if generation is None:
+        return None, None
+    etag = response_etag(request, generation, variant)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        if response.status_code == 304:
+            _set_validators(response, etag, last_modified)
+        _set_caching_headers(response)
+    return etag, response
+
+
+def add_validators(response, etag, last_modified):
+    """
+    Set the validators and caching headers on a response built by the view.
+    Errors (e.g. 404) are not given validators.
+    """
+    if etag and 200 <= response.status_code < 300:
+        _set_validators(response, etag, last_modified)
+    _set_caching_headers(response)
+    return response
+
+
+def conditional_get(view_func):
+    """
+    Decorate a view (or, through method_decorator, an APIView.get) to answer
+    If-None-Match / If-Modified-Since with 304 while the content is unchanged.
+    """
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        generation, last_modified = content_version()
+        etag, response = conditional_response(request, generation, last_modified)
+        if response is not None:
+            return response
+        response = view_func(request, *args, **kwargs)
+        return add_validators(response, etag, last_modified)
+
+    return wrapper
+
+
+def aconditional_get(view_func):
+    """
+    conditional_get() for async views; reads the content version through
+    redis.asyncio.
+    """
+
+    @wraps(view_func)
+    async def wrapper(request, *args, **kwargs):
+        generation, last_modified = await acontent_version()
+        etag, response = conditional_response(request, generation, last_modified)
+        if response is not None:
+            return response
+        response = await view_func(request, *args, **kwargs)
+        return add_validators(response, etag, last_modified)
+
+    return wrapper
@@ -0,0 +1,214 @@
+"""
+Streaming export of FAQs as CSV or NDJSON, optionally gzipped.
+
+FAQs are read in primary key order with a chunked QuerySet.iterator() (a
+server-side cursor on PostgreSQL), with one prefetch query for the requested
+translations of each chunk. Each chunk is formatted and handed to a
+StreamingHttpResponse before the next one is read, so memory stays flat
+whatever the corpus size and the header line is sent before the first query.
+
+Every (FAQ, language) pair is one row with the columns of EXPORT_COLUMNS; a
+translation that has not landed yet is exported as pending with empty text.
+An export limited to English can be fed back to the CSV import.
+"""
+
+import csv
+import datetime
+import io
+import json
+import zlib
+
+from django.conf import settings
+from django.db.models import Exists, OuterRef, Prefetch, Q
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .languages import SUPPORTED_LANGUAGES
+from .models import FAQ, FAQTranslation, TRANSLATION_DONE, TRANSLATION_PENDING
+
+EXPORT_COLUMNS = (
+    "id",
+    "lang",
+    "question",
+    "answer",
+    "status",
+    "created_at",
+    "updated_at",
+)
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson; charset=utf-8",
+}
+
+
+class ExportError(ValueError):
+    pass
+
+
+def parse_export_options(extension, params):
+    """
+    Validate the export file extension ("csv", "ndjson.gz", ...) and the
+    ?lang= (repeatable or comma-separated) and ?updated_since= parameters.
+    Returns (format, gzipped, languages, updated_since).
+    """
+    export_format, _, compression = extension.partition(".")
+    if export_format not in EXPORT_FORMATS or compression not in ("", "gz"):
+        raise ExportError(
+            "Unknown export format; use csv, ndjson, csv.gz or ndjson.gz."
+        )
+
+    languages = [
+        lang for value in params.getlist("lang") for lang in value.split(",") if lang
+    ]
+    unknown = sorted(set(languages) - set(SUPPORTED_LANGUAGES))
+    if unknown:
+        raise ExportError(f"Unsupported languages: {', '.join(unknown)}.")
+    languages = [lang for lang in SUPPORTED_LANGUAGES if lang in languages] or list(
+        SUPPORTED_LANGUAGES
+    )
+
+    updated_since = None
+    if params.get("updated_since"):
+        updated_since = _parse_timestamp(params["updated_since"])
+    return export_format, compression == "gz", languages, updated_since
+
+
+def _parse_timestamp(value):
+    try:
+        parsed = parse_datetime(value)
+        if parsed is None and (date := parse_date(value)) is not None:
+            parsed = datetime.datetime.combine(date, datetime.time())
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ExportError("updated_since must be an ISO 8601 date or datetime.")
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def export_queryset(languages, updated_since=None):
+    """
+    FAQs to export in primary key order, with the translations of the
+    requested languages prefetched. updated_since keeps the FAQs whose English
+    text or one of those translations changed at or after that time.
+    """
+    translated = [lang for lang in languages if lang != "en"]
+    translations = FAQTranslation.objects.filter(lang__in=translated).only(
+        "faq_id", "lang", "question", "answer", "status", "updated_at"
+    )
+    faqs = (
+        FAQ.objects.only("id", "question", "answer", "created_at", "updated_at")
+        .prefetch_related(Prefetch("translations", queryset=translations))
+        .order_by("pk")
+    )
+    if updated_since is not None:
+        faqs = faqs.filter(
+            Q(updated_at__gte=updated_since)
+            | Exists(
+                translations.filter(faq=OuterRef("pk"), updated_at__gte=updated_since)
+            )
+        )
+    return faqs
+
+
+def export_chunks(faqs, languages, chunk_size=None):
+    """
+    Yield the export rows as lists, one list per chunk of FAQs read.
+    """
+    chunk_size = chunk_size or getattr(settings, "FAQ_EXPORT_CHUNK_SIZE", 500)
+    chunk = []
+    for faq in faqs.iterator(chunk_size=chunk_size):
+        chunk.extend(_faq_rows(faq, languages))
+        if len(chunk) >= chunk_size * len(languages):
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _faq_rows(faq, languages):
+    translations = {
+        translation.lang: translation for translation in faq.translations.all()
+    }
+    for lang in languages:
+        if lang == "en":
+            text, status, updated_at = faq, TRANSLATION_DONE, faq.updated_at
+        elif lang in translations:
+            text = translations[lang]
+            status, updated_at = text.status, text.updated_at
+        else:
+            text, status, updated_at = None, TRANSLATION_PENDING, None
+        yield {
+            "id": faq.pk,
+            "lang": lang,
+            "question": text.question if text else "",
+            "answer": text.answer if text else "",
+            "status": status,
+            "created_at": faq.created_at.isoformat(),
+            "updated_at": updated_at.isoformat() if updated_at else None,
+        }
+
+
+def csv_lines(chunks):
+    """
+    CSV text, the header first and then one string per chunk.
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+    writer.writeheader()
+    yield _drain(buffer)
+    for chunk in chunks:
+        writer.writerows(chunk)
+        yield _drain(buffer)
+
+
+def _drain(buffer):
+    text = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return text
+
+
+def ndjson_lines(chunks):
+    """
+    One JSON object per line, one string per chunk.
+    """
+    for chunk in chunks:
+        yield "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in chunk)
+
+
+def gzip_stream(parts, level=6):
+    """
+    Gzip a stream of strings. Each part is flushed, so the client receives
+    it without waiting for the compressor to fill its window.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31: gzip framing
+    for part in parts:
+        yield compressor.compress(part.encode()) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
+def export_response(extension, params):
+    """
+    StreamingHttpResponse exporting the FAQs selected by params.
+    Raises ExportError for invalid options.
+    """
+    export_format, gzipped, languages, updated_since = parse_export_options(
+        extension, params
+    )
+    chunks = export_chunks(export_queryset(languages, updated_since), languages)
+    lines = csv_lines(chunks) if export_format == "csv" else ndjson_lines(chunks)
+    if gzipped:
+        response = StreamingHttpResponse(
+            gzip_stream(lines), content_type="application/gzip"
+        )
+    else:
+        response = StreamingHttpResponse(
+            lines, content_type=EXPORT_FORMATS[export_format]
+        )
+    response["Content-Disposition"] = f'attachment; filename="faqs.{extension}"'
+    # Let a buffering proxy (nginx) pass each chunk on as it is produced
+    response["X-Accel-Buffering"] = "no"
+    return response
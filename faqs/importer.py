@@ -0,0 +1,103 @@
+"""
+Streaming CSV import of FAQs.
+
+The upload is read row by row straight from the uploaded file, validated, and
+inserted with bulk_create in batches of settings.FAQ_IMPORT_BATCH_SIZE. Progress
+and per-row errors are recorded on an ImportJob; translation of the imported
+rows is queued as one batched background task that finishes the job.
+"""
+
+import csv
+import io
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .cache import invalidate_faq_caches_on_commit
+from .changes import next_change_seq
+from .models import FAQ, ImportJob
+from .search import index_faqs
+from .tasks import enqueue_on_commit
+
+REQUIRED_COLUMNS = ("question", "answer")
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+def import_faqs_csv(job, uploaded_file, batch_size=None):
+    """
+    Import FAQs from a file-like upload into the given ImportJob.
+    Raises ImportFormatError when the CSV is missing required columns.
+    """
+    batch_size = batch_size or getattr(settings, "FAQ_IMPORT_BATCH_SIZE", 500)
+    stream = io.TextIOWrapper(uploaded_file, encoding="utf-8-sig", newline="")
+    reader = csv.DictReader(stream)
+
+    if not reader.fieldnames or not all(
+        column in reader.fieldnames for column in REQUIRED_COLUMNS
+    ):
+        job.status = ImportJob.STATUS_FAILED
+        job.finished_at = timezone.now()
+        job.save()
+        raise ImportFormatError(
+            'CSV file must contain "question" and "answer" columns.'
+        )
+
+    created_ids = []
+    batch = []
+    try:
+        # Line 1 is the header
+        for line_number, row in enumerate(reader, start=2):
+            job.total_rows += 1
+            question = (row.get("question") or "").strip()
+            answer = (row.get("answer") or "").strip()
+            if not question or not answer:
+                job.add_error(line_number, "Both question and answer are required.")
+                continue
+
+            batch.append(FAQ(question=question, answer=answer))
+            if len(batch) >= batch_size:
+                created_ids += _insert_batch(job, batch)
+                batch = []
+
+        if batch:
+            created_ids += _insert_batch(job, batch)
+    except (UnicodeDecodeError, csv.Error) as e:
+        job.add_error(job.total_rows + 1, f"Could not parse CSV: {e}")
+    except Exception:
+        # Leave no job "importing" forever; the inserted batches are kept
+        job.status = ImportJob.STATUS_FAILED
+        job.finished_at = timezone.now()
+        job.save()
+        raise
+    finally:
+        stream.detach()
+
+    with transaction.atomic():
+        if created_ids:
+            job.status = ImportJob.STATUS_TRANSLATING
+            enqueue_on_commit(
+                "faqs.tasks.translate_faqs", created_ids, import_job_id=job.pk
+            )
+        else:
+            job.status = ImportJob.STATUS_DONE
+            job.finished_at = timezone.now()
+        job.save()
+    return job
+
+
+def _insert_batch(job, batch):
+    with transaction.atomic():
+        seq = next_change_seq()
+        for faq in batch:
+            faq.change_seq = seq
+        created = FAQ.objects.bulk_create(batch)
+        index_faqs(created)
+        job.imported_rows += len(created)
+        job.save()
+        # One invalidation per batch rather than one per row
+        invalidate_faq_caches_on_commit()
+    return [faq.pk for faq in created]
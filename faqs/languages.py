@@ -5,3 +5,12 @@ SUPPORTED_LANGUAGES = [
     "bn",  # English, Hindi, Bengali, Spanish, French, etc.
     # add more languages as needed...
 ]
+
+DEFAULT_LANGUAGE = "en"
+
+
+def resolve_language(lang):
+    """
+    Return lang if it is supported, otherwise the default (source) language.
+    """
+    return lang if lang in SUPPORTED_LANGUAGES else DEFAULT_LANGUAGE
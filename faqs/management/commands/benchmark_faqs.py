@@ -0,0 +1,165 @@
+import json
+import platform
+
+import redis
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.utils import timezone
+
+from faqs import cache
+from faqs.benchmark import (
+    SCENARIOS,
+    benchmark_languages,
+    compare,
+    run_scenarios,
+    seed_corpus,
+)
+
+BENCHMARK_SETTINGS = {
+    "FAQ_TRANSLATION": {"BACKEND": "faqs.translator.StubBackend"},
+    "FAQ_TASK_BROKER": {"BACKEND": "faqs.tasks.ImmediateBroker"},
+    # An inline refill would add to write latency and turn misses into hits
+    "FAQ_CACHE_WARMING": {"REFILL_PAGES": 0},
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the FAQ views against a throwaway database seeded with a "
+        "synthetic corpus, using a stub translator and an in-memory Redis "
+        "(fakeredis) unless --redis-url is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--faqs", type=int, default=1000, help="Number of FAQs to seed."
+        )
+        parser.add_argument(
+            "--languages",
+            type=int,
+            default=2,
+            help="Translated languages seeded per FAQ; beyond the supported "
+            "ones, synthetic languages only grow the translation table.",
+        )
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            choices=SCENARIOS,
+            help="Scenario to run (repeatable). Defaults to all of them.",
+        )
+        parser.add_argument("--iterations", type=int, default=200)
+        parser.add_argument("--page-size", type=int, default=20)
+        parser.add_argument(
+            "--import-rows",
+            type=int,
+            default=1000,
+            help="Rows per CSV upload in the bulk_import scenario.",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--redis-url",
+            help="Benchmark against this Redis server (use a dedicated database, "
+            "it is written to) instead of fakeredis.",
+        )
+        parser.add_argument("--output", help="Write the results as JSON to this file.")
+        parser.add_argument(
+            "--baseline",
+            help="JSON results of a previous run; fail on regressions against it.",
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.2,
+            help="Allowed relative p95/throughput change before a regression "
+            "is reported (default: 0.2).",
+        )
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options["baseline"]:
+            with open(options["baseline"]) as f:
+                baseline = json.load(f)["results"]
+
+        redis_client = self.redis_client(options["redis_url"])
+        original_client = cache.redis_handler.client
+        cache.redis_handler.client = redis_client
+        redis_client.flushdb()
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        try:
+            with override_settings(**BENCHMARK_SETTINGS):
+                languages = benchmark_languages(options["languages"])
+                self.stdout.write(
+                    f"Seeding {options['faqs']} FAQs x {len(languages)} languages..."
+                )
+                seed_corpus(options["faqs"], languages, seed=options["seed"])
+                results = run_scenarios(
+                    options["scenario"] or (),
+                    iterations=options["iterations"],
+                    page_size=options["page_size"],
+                    import_rows=options["import_rows"],
+                    seed=options["seed"],
+                )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+            cache.redis_handler.client = original_client
+
+        report = {
+            "meta": {
+                "faqs": options["faqs"],
+                "languages": len(languages),
+                "iterations": options["iterations"],
+                "page_size": options["page_size"],
+                "import_rows": options["import_rows"],
+                "seed": options["seed"],
+                "database": connection.vendor,
+                "redis": "server" if options["redis_url"] else "fakeredis",
+                "python": platform.python_version(),
+                "finished_at": timezone.now().isoformat(),
+            },
+            "results": results,
+        }
+        self.print_results(results)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+
+        if baseline is not None:
+            regressions = compare(results, baseline, options["tolerance"])
+            if regressions:
+                raise CommandError(
+                    "Regressions against the baseline:\n" + "\n".join(regressions)
+                )
+            self.stdout.write(self.style.SUCCESS("No regressions against baseline."))
+
+    def redis_client(self, url):
+        if url:
+            return redis.Redis.from_url(url, decode_responses=True)
+        try:
+            import fakeredis
+        except ImportError:
+            raise CommandError(
+                "fakeredis is not installed; install it or pass --redis-url."
+            )
+        return fakeredis.FakeRedis(decode_responses=True)
+
+    def print_results(self, results):
+        self.stdout.write(
+            f"{'scenario':<24}{'ops/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+        )
+        for result in results:
+            self.stdout.write(
+                f"{result['scenario']:<24}{result['throughput']:>10.1f}"
+                f"{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}"
+                f"{result['p99_ms']:>10.2f}"
+            )
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from faqs.changes import get_change_feed_config, purge_tombstones
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete the change feed tombstones of FAQs deleted longer ago than the "
+        "retention period. Clients whose cursor predates them must sync again "
+        "from scratch."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=get_change_feed_config()["TOMBSTONE_RETENTION_DAYS"],
+            help="Tombstones to keep, in days "
+            "(default: FAQ_CHANGE_FEED['TOMBSTONE_RETENTION_DAYS']).",
+        )
+
+    def handle(self, *args, **options):
+        if options["days"] < 0:
+            raise CommandError("--days must not be negative.")
+        purged = purge_tombstones(options["days"])
+        self.stdout.write(self.style.SUCCESS(f"Purged {purged} tombstones."))
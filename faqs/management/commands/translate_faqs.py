@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from faqs.models import FAQ
+from faqs.tasks import translate_faqs
+from faqs.translator import get_engine
+
+
+class Command(BaseCommand):
+    help = "Backfill FAQ translations through the batched translation engine."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Re-translate every field of every FAQ, not only missing or "
+            "out-of-date translations.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Number of FAQs sent to the engine per batch.",
+        )
+
+    def handle(self, *args, **options):
+        # Every FAQ is checked; without --all only fields whose source hash
+        # changed (or that never translated) reach the translator.
+        faq_ids = list(FAQ.objects.values_list("pk", flat=True))
+
+        self.stdout.write(f"Checking translations of {len(faq_ids)} FAQs...")
+        translate_faqs(faq_ids, batch_size=options["batch_size"], force=options["all"])
+        self.stdout.write(self.style.SUCCESS(f"Checked {len(faq_ids)} FAQs."))
+        if get_engine().memory is not None:
+            self.stdout.write(f"Translation memory: {get_engine().memory.stats()}")
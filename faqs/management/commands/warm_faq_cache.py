@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from faqs.cache import get_warming_config
+from faqs.languages import SUPPORTED_LANGUAGES
+from faqs.warming import warm_faq_cache
+
+
+class Command(BaseCommand):
+    help = (
+        "Pre-populate the FAQ list pages, detail entries and rendered home pages "
+        "of every supported language, e.g. after a deploy or a Redis flush."
+    )
+
+    def add_arguments(self, parser):
+        config = get_warming_config()
+        parser.add_argument(
+            "--pages",
+            type=int,
+            default=config["PAGES"],
+            help="Pages warmed per language (default: FAQ_CACHE_WARMING['PAGES']).",
+        )
+        parser.add_argument("--page-size", type=int, help="Defaults to FAQ_PAGE_SIZE.")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=config["WORKERS"],
+            help="Pages warmed in parallel (default: FAQ_CACHE_WARMING['WORKERS']).",
+        )
+        parser.add_argument(
+            "--language",
+            action="append",
+            choices=SUPPORTED_LANGUAGES,
+            help="Language to warm (repeatable). Defaults to all of them.",
+        )
+        parser.add_argument(
+            "--no-details",
+            action="store_true",
+            help="Skip the detail entries of the FAQs on the warmed pages.",
+        )
+
+    def handle(self, *args, **options):
+        if options["pages"] < 1 or options["workers"] < 1:
+            raise CommandError("--pages and --workers must be at least 1.")
+        warmed = warm_faq_cache(
+            languages=options["language"],
+            pages=options["pages"],
+            page_size=options["page_size"],
+            workers=options["workers"],
+            details=not options["no_details"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Warmed {warmed['list_pages']} list pages, {warmed['details']} "
+                f"detail entries and {warmed['home_pages']} home pages."
+            )
+        )
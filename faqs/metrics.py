@@ -0,0 +1,373 @@
+"""
+In-process performance metrics exposed in the Prometheus text format.
+
+A tiny registry of counters and histograms (no client library needed) fed by
+MetricsMiddleware (request latency, DB queries per request), RedisHandler
+(cache hits, misses and errors per key family, circuit breaker state and
+trips), the cache codec (encoded
+value sizes and decode times) and the translation engine
+(per-language call latency and failures). GET /metrics renders it.
+
+Metrics are kept per process: scrape every worker, or run one worker per
+container. Recording is a dict lookup and an addition under a lock.
+/metrics is served to staff users and to scrapers presenting
+settings.FAQ_METRICS_TOKEN as a bearer token.
+"""
+
+import hmac
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connection
+from django.http import HttpResponse
+
+# Seconds; tuned for a cache-backed API (sub-millisecond hits to slow misses)
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+PAYLOAD_SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+_registry = []
+_local = threading.local()
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [*zip(names, values), *extra]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels):
+        return self._values.get(labels, 0)
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        for labels, value in sorted(values.items()):
+            yield f"{self.name}_total{_format_labels(self.labelnames, labels)} {value}"
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._values = {}  # labels -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def observe(self, value, *labels):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(labels)
+            if row is None:
+                row = self._values[labels] = [0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                row[index] += 1
+            row[-2] += value
+            row[-1] += 1
+
+    @contextmanager
+    def time(self, *labels):
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(perf_counter() - started, *labels)
+
+    def count(self, *labels):
+        row = self._values.get(labels)
+        return row[-1] if row else 0
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+    def samples(self):
+        with self._lock:
+            values = {labels: list(row) for labels, row in self._values.items()}
+        for labels, row in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, row):
+                cumulative += count
+                label_text = _format_labels(
+                    self.labelnames, labels, [("le", repr(float(bound)))]
+                )
+                yield f"{self.name}_bucket{label_text} {cumulative}"
+            label_text = _format_labels(self.labelnames, labels, [("le", "+Inf")])
+            yield f"{self.name}_bucket{label_text} {row[-1]}"
+            label_text = _format_labels(self.labelnames, labels)
+            yield f"{self.name}_sum{label_text} {row[-2]}"
+            yield f"{self.name}_count{label_text} {row[-1]}"
+
+
+class Gauge:
+    kind = "gauge"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._function = None
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def set(self, value, *labels):
+        with self._lock:
+            self._values[labels] = value
+
+    def set_function(self, function):
+        """
+        Read the values from function(), a {labels: value} dict, at render time.
+        """
+        self._function = function
+
+    def values(self):
+        if self._function is not None:
+            return dict(self._function())
+        with self._lock:
+            return dict(self._values)
+
+    def value(self, *labels):
+        return self.values().get(labels, 0)
+
+    def samples(self):
+        for labels, value in sorted(self.values().items()):
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {value}"
+
+
+REQUEST_DURATION = Histogram(
+    "faq_http_request_duration_seconds",
+    "Time spent serving a request, by view.",
+    ["view", "method", "status"],
+)
+DB_QUERIES = Histogram(
+    "faq_http_request_db_queries",
+    "Database queries run per request, by view.",
+    ["view"],
+    buckets=QUERY_COUNT_BUCKETS,
+)
+DB_DURATION = Histogram(
+    "faq_http_request_db_duration_seconds",
+    "Time spent in database queries per request, by view.",
+    ["view"],
+)
+REDIS_DURATION = Histogram(
+    "faq_redis_command_duration_seconds",
+    "Latency of Redis round-trips (single commands and pipelines).",
+)
+REDIS_BREAKER_STATE = Gauge(
+    "faq_redis_breaker_state",
+    "State of the Redis circuit breaker: 1 for the current state, else 0.",
+    ["state"],
+)
+REDIS_BREAKER_TRIPS = Counter(
+    "faq_redis_breaker_trips",
+    "Times the Redis circuit breaker opened.",
+)
+SERIALIZATION_DURATION = Histogram(
+    "faq_serialization_duration_seconds",
+    "Time spent serializing FAQs for a response, by view.",
+    ["view"],
+)
+CACHE_REQUESTS = Counter(
+    "faq_cache_requests",
+    "Cache lookups by key family and result (hit, miss or error).",
+    ["family", "result"],
+)
+CACHE_PAYLOAD_BYTES = Histogram(
+    "faq_cache_payload_bytes",
+    "Size of encoded cache values as stored in Redis, by codec.",
+    ["codec"],
+    buckets=PAYLOAD_SIZE_BUCKETS,
+)
+CACHE_DECODE_DURATION = Histogram(
+    "faq_cache_decode_duration_seconds",
+    "Time spent decoding cache hits, by codec.",
+    ["codec"],
+)
+TRANSLATION_DURATION = Histogram(
+    "faq_translation_duration_seconds",
+    "Latency of translator backend calls, by target language.",
+    ["lang"],
+)
+TRANSLATION_FAILURES = Counter(
+    "faq_translation_failures",
+    "Failed translator calls by target language and reason (error or timeout).",
+    ["lang", "reason"],
+)
+
+
+def key_family(key):
+    """
+    Group cache keys for labelling: "faqs:list", "faqs:home", "faq", "lock", ...
+    """
+    if key.startswith("faqs:"):
+        return ":".join(key.split(":", 2)[:2])
+    return key.split(":", 1)[0]
+
+
+@contextmanager
+def untracked_cache_lookups():
+    """
+    Leave cache lookups made by this thread in the block out of the metrics
+    (e.g. cache warming, which would otherwise skew the hit ratio).
+    """
+    previous = getattr(_local, "untracked", False)
+    _local.untracked = True
+    try:
+        yield
+    finally:
+        _local.untracked = previous
+
+
+def record_cache_lookup(key, value, error=False):
+    if getattr(_local, "untracked", False):
+        return
+    if error:
+        result = "error"
+    else:
+        result = "hit" if value else "miss"
+    CACHE_REQUESTS.inc(key_family(key), result)
+
+
+def render():
+    lines = []
+    for metric in _registry:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.samples())
+    return "\n".join(lines) + "\n"
+
+
+def _can_scrape(request):
+    """
+    Staff users, or scrapers sending settings.FAQ_METRICS_TOKEN as a bearer token.
+    """
+    user = getattr(request, "user", None)
+    if user is not None and user.is_active and user.is_staff:
+        return True
+    token = getattr(settings, "FAQ_METRICS_TOKEN", None)
+    scheme, _, credentials = request.headers.get("Authorization", "").partition(" ")
+    return (
+        bool(token)
+        and scheme.lower() == "bearer"
+        and (hmac.compare_digest(credentials.encode(), token.encode()))
+    )
+
+
+def metrics_view(request):
+    if not _can_scrape(request):
+        response = HttpResponse(
+            "Authentication required.\n", status=401, content_type="text/plain"
+        )
+        response["WWW-Authenticate"] = 'Bearer realm="metrics"'
+        return response
+    return HttpResponse(render(), content_type="text/plain; version=0.0.4")
+
+
+class _QueryTimer:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += perf_counter() - started
+            self.count += 1
+
+
+def _view_name(request):
+    match = getattr(request, "resolver_match", None)
+    return match.view_name if match else "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    Records request latency per view and, for sync requests, the number and
+    duration of database queries they ran. Async requests (whose queries run
+    in worker threads) only record latency.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = perf_counter()
+        timer = _QueryTimer()
+        with connection.execute_wrapper(timer):
+            response = self.get_response(request)
+        view = _view_name(request)
+        REQUEST_DURATION.observe(
+            perf_counter() - started, view, request.method, response.status_code
+        )
+        DB_QUERIES.observe(timer.count, view)
+        DB_DURATION.observe(timer.duration, view)
+        return response
+
+    async def __acall__(self, request):
+        started = perf_counter()
+        response = await self.get_response(request)
+        REQUEST_DURATION.observe(
+            perf_counter() - started,
+            _view_name(request),
+            request.method,
+            response.status_code,
+        )
+        return response
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.17 on 2026-10-18 08:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("faqs", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="faq",
+            name="translation_status",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
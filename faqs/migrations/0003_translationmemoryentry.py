@@ -0,0 +1,39 @@
+# Generated by Django 4.2.17 on 2026-10-18 08:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("faqs", "0002_faq_translation_status"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TranslationMemoryEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("source_hash", models.CharField(max_length=64)),
+                ("target_lang", models.CharField(max_length=10)),
+                ("backend_version", models.CharField(max_length=64)),
+                ("translation", models.TextField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="translationmemoryentry",
+            constraint=models.UniqueConstraint(
+                fields=("source_hash", "target_lang", "backend_version"),
+                name="unique_translation_memory_entry",
+            ),
+        ),
+    ]
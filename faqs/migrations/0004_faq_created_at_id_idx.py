@@ -0,0 +1,19 @@
+# Generated by Django 4.2.17 on 2026-10-18 08:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("faqs", "0003_translationmemoryentry"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="faq",
+            index=models.Index(
+                fields=["created_at", "id"], name="faq_created_at_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,98 @@
+from django.db import migrations
+from django.utils.html import strip_tags
+
+# Frozen copies of faqs.search as of this migration, so that later changes to
+# the search module cannot change what it does
+LANGUAGES = ("en", "hi", "bn")
+FTS_TABLE = "faqs_faq_fts"
+TSVECTOR_TABLE = "faqs_faq_search"
+
+
+def documents(faq):
+    # Historical models have no helper methods, so resolve each language from
+    # the JSON translation fields here
+    for lang in LANGUAGES:
+        yield (
+            lang,
+            faq.question_translated.get(lang) or faq.question,
+            strip_tags(faq.answer_translated.get(lang) or faq.answer),
+        )
+
+
+def create_sqlite_index(schema_editor):
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+        "faq_id UNINDEXED, lang UNINDEXED, question, answer, "
+        "tokenize='unicode61 remove_diacritics 2')"
+    )
+
+
+def index_sqlite(cursor, faqs):
+    cursor.executemany(
+        f"INSERT INTO {FTS_TABLE} (faq_id, lang, question, answer) "
+        "VALUES (%s, %s, %s, %s)",
+        [(faq.pk, *document) for faq in faqs for document in documents(faq)],
+    )
+
+
+def create_postgres_index(schema_editor):
+    schema_editor.execute(
+        f"CREATE TABLE IF NOT EXISTS {TSVECTOR_TABLE} ("
+        "faq_id bigint NOT NULL, lang varchar(10) NOT NULL, "
+        "document tsvector NOT NULL, PRIMARY KEY (faq_id, lang))"
+    )
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS {TSVECTOR_TABLE}_document_idx "
+        f"ON {TSVECTOR_TABLE} USING GIN (document)"
+    )
+
+
+def index_postgres(cursor, faqs):
+    cursor.executemany(
+        f"INSERT INTO {TSVECTOR_TABLE} (faq_id, lang, document) VALUES (%s, %s, "
+        "setweight(to_tsvector('simple', %s), 'A') || "
+        "setweight(to_tsvector('simple', %s), 'B'))",
+        [(faq.pk, *document) for faq in faqs for document in documents(faq)],
+    )
+
+
+INDEXES = {
+    "sqlite": (create_sqlite_index, index_sqlite, FTS_TABLE),
+    "postgresql": (create_postgres_index, index_postgres, TSVECTOR_TABLE),
+}
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor not in INDEXES:
+        return  # Searched with an unindexed scan
+    create_index, index, _ = INDEXES[schema_editor.connection.vendor]
+    create_index(schema_editor)
+
+    # Index the existing FAQs
+    FAQ = apps.get_model("faqs", "FAQ")
+    batch = []
+    with schema_editor.connection.cursor() as cursor:
+        for faq in FAQ.objects.iterator(chunk_size=500):
+            batch.append(faq)
+            if len(batch) == 500:
+                index(cursor, batch)
+                batch = []
+        if batch:
+            index(cursor, batch)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor in INDEXES:
+        table = INDEXES[schema_editor.connection.vendor][2]
+        schema_editor.execute(f"DROP TABLE IF EXISTS {table}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("faqs", "0005_importjob"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,135 @@
+# Generated by Django 4.2.17 on 2026-10-18 08:25
+
+import hashlib
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def source_hash(text):
+    # Frozen copy of faqs.translation_memory.source_hash as of this migration
+    return hashlib.sha256(" ".join(text.split()).encode("utf-8")).hexdigest()
+
+
+def copy_json_translations(apps, schema_editor):
+    """
+    Move the per-FAQ JSON blobs into one FAQTranslation row per language.
+    """
+    FAQ = apps.get_model("faqs", "FAQ")
+    FAQTranslation = apps.get_model("faqs", "FAQTranslation")
+
+    rows = []
+    for faq in FAQ.objects.iterator(chunk_size=500):
+        languages = set(faq.question_translated) | set(faq.translation_status)
+        for lang in sorted(languages - {"en"}):
+            question = faq.question_translated.get(lang) or ""
+            answer = faq.answer_translated.get(lang) or ""
+            status = faq.translation_status.get(lang) or (
+                "done" if question and answer else "pending"
+            )
+            rows.append(
+                FAQTranslation(
+                    faq_id=faq.pk,
+                    lang=lang,
+                    question=question,
+                    answer=answer,
+                    source_hash=source_hash(f"{faq.question}\0{faq.answer}"),
+                    status=status,
+                )
+            )
+        if len(rows) >= 500:
+            FAQTranslation.objects.bulk_create(rows)
+            rows = []
+    FAQTranslation.objects.bulk_create(rows)
+
+
+def restore_json_translations(apps, schema_editor):
+    FAQ = apps.get_model("faqs", "FAQ")
+    FAQTranslation = apps.get_model("faqs", "FAQTranslation")
+
+    faqs = {}
+    for translation in FAQTranslation.objects.iterator(chunk_size=500):
+        faq = faqs.get(translation.faq_id)
+        if faq is None:
+            faq = faqs[translation.faq_id] = FAQ(
+                pk=translation.faq_id,
+                question_translated={},
+                answer_translated={},
+                translation_status={},
+            )
+        faq.question_translated[translation.lang] = translation.question
+        faq.answer_translated[translation.lang] = translation.answer
+        faq.translation_status[translation.lang] = translation.status
+    FAQ.objects.bulk_update(
+        faqs.values(),
+        ["question_translated", "answer_translated", "translation_status"],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("faqs", "0006_faq_search_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FAQTranslation",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("lang", models.CharField(max_length=10)),
+                ("question", models.TextField(blank=True)),
+                ("answer", models.TextField(blank=True)),
+                ("source_hash", models.CharField(blank=True, max_length=64)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("done", "Done"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=10,
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "faq",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="translations",
+                        to="faqs.faq",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="faqtranslation",
+            constraint=models.UniqueConstraint(
+                fields=("faq", "lang"), name="unique_faq_translation"
+            ),
+        ),
+        migrations.RunPython(copy_json_translations, restore_json_translations),
+        migrations.RemoveField(
+            model_name="faq",
+            name="answer_translated",
+        ),
+        migrations.RemoveField(
+            model_name="faq",
+            name="question_translated",
+        ),
+        migrations.RemoveField(
+            model_name="faq",
+            name="translation_status",
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.17 on 2026-10-18 08:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("faqs", "0007_faqtranslation"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="faq",
+            index=models.Index(fields=["updated_at"], name="faq_updated_at_idx"),
+        ),
+    ]
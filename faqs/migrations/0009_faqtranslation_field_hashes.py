@@ -0,0 +1,76 @@
+# Generated by Django 4.2.17 on 2026-10-18 09:02
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def source_hash(text):
+    # Frozen copy of faqs.translation_memory.source_hash as of this migration
+    return hashlib.sha256(" ".join(text.split()).encode("utf-8")).hexdigest()
+
+
+def split_source_hashes(apps, schema_editor):
+    """
+    Translations made from the current text get that text's per-field hashes;
+    out-of-date ones keep blank hashes and are re-translated on the next run.
+    """
+    FAQTranslation = apps.get_model("faqs", "FAQTranslation")
+
+    rows = []
+    for translation in FAQTranslation.objects.select_related("faq").iterator(
+        chunk_size=500
+    ):
+        faq = translation.faq
+        if translation.source_hash == source_hash(f"{faq.question}\0{faq.answer}"):
+            translation.question_hash = source_hash(faq.question)
+            translation.answer_hash = source_hash(faq.answer)
+            rows.append(translation)
+        if len(rows) >= 500:
+            FAQTranslation.objects.bulk_update(rows, ["question_hash", "answer_hash"])
+            rows = []
+    FAQTranslation.objects.bulk_update(rows, ["question_hash", "answer_hash"])
+
+
+def join_source_hashes(apps, schema_editor):
+    FAQTranslation = apps.get_model("faqs", "FAQTranslation")
+
+    rows = []
+    for translation in FAQTranslation.objects.select_related("faq").iterator(
+        chunk_size=500
+    ):
+        faq = translation.faq
+        if translation.question_hash == source_hash(
+            faq.question
+        ) and translation.answer_hash == source_hash(faq.answer):
+            translation.source_hash = source_hash(f"{faq.question}\0{faq.answer}")
+            rows.append(translation)
+        if len(rows) >= 500:
+            FAQTranslation.objects.bulk_update(rows, ["source_hash"])
+            rows = []
+    FAQTranslation.objects.bulk_update(rows, ["source_hash"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("faqs", "0008_faq_updated_at_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="faqtranslation",
+            name="answer_hash",
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name="faqtranslation",
+            name="question_hash",
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.RunPython(split_source_hashes, join_source_hashes),
+        migrations.RemoveField(
+            model_name="faqtranslation",
+            name="source_hash",
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 4.2.17 on 2026-10-18 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("faqs", "0009_faqtranslation_field_hashes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChangeCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("value", models.BigIntegerField(default=0)),
+                ("purged_seq", models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="FAQTombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("faq_id", models.BigIntegerField()),
+                ("change_seq", models.BigIntegerField()),
+                ("deleted_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["change_seq", "faq_id"],
+                        name="faqtombstone_change_seq_idx",
+                    ),
+                    models.Index(
+                        fields=["deleted_at"], name="faqtombstone_deleted_at_idx"
+                    ),
+                ],
+            },
+        ),
+        migrations.AddField(
+            model_name="faq",
+            name="change_seq",
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="faq",
+            index=models.Index(
+                fields=["change_seq", "id"], name="faq_change_seq_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,41 @@
+from django.db import migrations
+
+# Frozen copies of faqs.search as of this migration: FTS5 rows of an FAQ use
+# the rowids faq_id * ROWIDS_PER_FAQ + the index of their language
+LANGUAGES = ("en", "hi", "bn")
+ROWIDS_PER_FAQ = 64
+FTS_TABLE = "faqs_faq_fts"
+
+
+def rekey_search_index(apps, schema_editor):
+    """
+    Move FTS5 rows indexed under arbitrary rowids to the ones derived from
+    their FAQ and language.
+    """
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    languages = ", ".join(f"'{lang}'" for lang in LANGUAGES)
+    offsets = " ".join(f"WHEN '{lang}' THEN {i}" for i, lang in enumerate(LANGUAGES))
+    schema_editor.execute(
+        f"CREATE TEMP TABLE {FTS_TABLE}_rows AS "
+        f"SELECT faq_id, lang, question, answer FROM {FTS_TABLE} "
+        f"WHERE lang IN ({languages})"
+    )
+    schema_editor.execute(f"DELETE FROM {FTS_TABLE}")
+    schema_editor.execute(
+        f"INSERT INTO {FTS_TABLE} (rowid, faq_id, lang, question, answer) "
+        f"SELECT faq_id * {ROWIDS_PER_FAQ} + CASE lang {offsets} END, "
+        f"faq_id, lang, question, answer FROM {FTS_TABLE}_rows"
+    )
+    schema_editor.execute(f"DROP TABLE {FTS_TABLE}_rows")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("faqs", "0010_change_feed"),
+    ]
+
+    operations = [
+        migrations.RunPython(rekey_search_index, migrations.RunPython.noop),
+    ]
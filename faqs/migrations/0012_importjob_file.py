@@ -0,0 +1,18 @@
+# Generated by Django 4.2.17 on 2026-10-18 09:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("faqs", "0011_faq_fts_rowids"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="importjob",
+            name="file",
+            field=models.FileField(blank=True, upload_to="faq-imports/"),
+        ),
+    ]
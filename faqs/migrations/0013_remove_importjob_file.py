@@ -0,0 +1,17 @@
+# Generated by Django 4.2.17 on 2026-10-18 09:38
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("faqs", "0012_importjob_file"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="importjob",
+            name="file",
+        ),
+    ]
@@ -1,65 +1,461 @@
 from django.db import models, transaction
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    FilteredRelation,
+    OuterRef,
+    Q,
+    Subquery,
+    Value,
+    When,
+    prefetch_related_objects,
+)
+from django.db.models.functions import Coalesce
 from ckeditor.fields import RichTextField
 from .languages import SUPPORTED_LANGUAGES  # Import from the parent directory
-from .utils import translate_text
-from .redis_handler import RedisHandler
+from .translator import get_engine
+from .cache import invalidate_faq_caches_on_commit
+from .tasks import enqueue_on_commit
+from .search import index_faqs, remove_faqs
+from .changes import next_change_seq, record_changes, record_deletions
+from .translation_memory import source_hash
 
-redis_handler = RedisHandler()
+TRANSLATION_PENDING = "pending"
+TRANSLATION_DONE = "done"
+TRANSLATION_FAILED = "failed"
+TRANSLATION_STATUS_CHOICES = [
+    (TRANSLATION_PENDING, "Pending"),
+    (TRANSLATION_DONE, "Done"),
+    (TRANSLATION_FAILED, "Failed"),
+]
+
+
+# FAQ fields translated into every other language
+TRANSLATED_FIELDS = ("question", "answer")
+
+
+def translated_languages():
+    return [lang for lang in SUPPORTED_LANGUAGES if lang != "en"]
+
+
+class FAQQuerySet(models.QuerySet):
+    def with_translation(self, lang):
+        """
+        Join only the translation row of lang, exposed as translated_* attributes.
+        """
+        if lang == "en":
+            return self
+        return self.annotate(
+            lang_translation=FilteredRelation(
+                "translations", condition=Q(translations__lang=lang)
+            ),
+            translated_lang=Value(lang),
+            translated_question=F("lang_translation__question"),
+            translated_answer=F("lang_translation__answer"),
+            translated_status=F("lang_translation__status"),
+        )
+
+    def with_translated_questions(self, langs):
+        """
+        Annotate question_<lang> with only the translated question of each
+        language (None until it lands), without loading translation rows.
+        """
+        return self.annotate(
+            **{
+                f"question_{lang}": Subquery(
+                    FAQTranslation.objects.filter(faq=OuterRef("pk"), lang=lang)
+                    .order_by()
+                    .values("question")[:1]
+                )
+                for lang in langs
+            }
+        )
+
+    def with_translation_status(self):
+        """
+        Annotate translation_status, computed in SQL: failed if any language
+        failed, done once every language is done, pending otherwise.
+        """
+        rows = FAQTranslation.objects.filter(faq=OuterRef("pk")).order_by()
+
+        def count(status):
+            counted = rows.filter(status=status).values("faq").annotate(n=Count("pk"))
+            return Coalesce(Subquery(counted.values("n")), 0)
+
+        return self.annotate(
+            translations_done=count(TRANSLATION_DONE),
+            translations_failed=count(TRANSLATION_FAILED),
+            translation_status=Case(
+                When(translations_failed__gt=0, then=Value(TRANSLATION_FAILED)),
+                When(
+                    translations_done__gte=len(translated_languages()),
+                    then=Value(TRANSLATION_DONE),
+                ),
+                default=Value(TRANSLATION_PENDING),
+            ),
+        )
 
 
 class FAQ(models.Model):
     question = models.TextField()
     answer = RichTextField()  # WYSIWYG editor for answer
-    question_translated = models.JSONField(default=dict, blank=True)
-    answer_translated = models.JSONField(default=dict, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Position in the change feed, bumped by every write and translation
+    change_seq = models.BigIntegerField(default=0, editable=False)
+
+    objects = FAQQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Backs keyset pagination over (created_at, id)
+            models.Index(fields=["created_at", "id"], name="faq_created_at_id_idx"),
+            # Backs the admin's updated_at filter (created_at uses the index above)
+            models.Index(fields=["updated_at"], name="faq_updated_at_idx"),
+            # Backs the change feed over (change_seq, id)
+            models.Index(fields=["change_seq", "id"], name="faq_change_seq_id_idx"),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        faq = super().from_db(db, field_names, values)
+        faq._loaded_source = faq.source_texts()
+        return faq
+
+    def source_texts(self):
+        # Deferred fields (e.g. the admin changelist) count as unknown
+        deferred = self.get_deferred_fields()
+        return tuple(
+            None if field in deferred else getattr(self, field)
+            for field in TRANSLATED_FIELDS
+        )
+
+    def source_changed(self):
+        """
+        True if the question or answer differs from what was loaded (always
+        for FAQs that were not loaded from the database).
+        """
+        return getattr(self, "_loaded_source", None) != self.source_texts()
 
-    def save(self, *args, **kwargs):
+    def save(self, *args, translate=True, **kwargs):
+        """
+        Save the FAQ and queue its translation if it is new or its text changed;
+        the task only re-translates the fields whose source hash changed.
+        Pass translate=False when the caller queues a batched translation itself.
+        """
         with transaction.atomic():  # Ensuring the transaction is atomic
-            if not self.pk:
-                self.translate_content()  # Translate content if it's a new FAQ
+            # Translation runs in the background; readers fall back to English
+            # (or the previous translation) until each language lands.
+            needs_translation = translate and self.source_changed()
+            # New FAQs have no translations yet
+            edited = self.pk is not None and self.source_changed()
 
+            self.change_seq = next_change_seq()
             super().save(*args, **kwargs)
+            if edited:
+                # The stored translations describe the previous text
+                FAQTranslation.objects.filter(faq=self).mark_pending()
+            index_faqs([self])  # Same transaction as the row itself
+            self._loaded_source = self.source_texts()
 
-            # Cache the FAQ in Redis
-            cache_key = f"faq:{self.pk}"
-            faq_data = {
-                "id": self.pk,
-                "question": str(self.question),  # Convert to string
-                "answer": str(
-                    self.answer
-                ),  # Convert to string (ensure it's not a complex object)
-                "created_at": self.created_at.isoformat(),
-                "updated_at": self.updated_at.isoformat(),
-            }
-            redis_handler.set_cache_with_transaction(cache_key, faq_data)
+            if needs_translation:
+                enqueue_on_commit("faqs.tasks.translate_faq", self.pk)
+
+            # Cached detail entries are rebuilt from the serializer on next read
+            invalidate_faq_caches_on_commit(self.pk)
+
+    def delete(self, *args, **kwargs):
+        pk = self.pk
+        with transaction.atomic():
+            seq = next_change_seq()
+            result = super().delete(*args, **kwargs)
+            remove_faqs([pk])
+            record_deletions([pk], seq)
+            invalidate_faq_caches_on_commit(pk)
+        return result
+
+    def translate_content(self, force=False):
+        FAQTranslation.objects.upsert(FAQ.translate_many([self], force=force))
+        getattr(self, "_prefetched_objects_cache", {}).pop("translations", None)
+
+    @staticmethod
+    def translate_many(faqs, force=False):
+        """
+        Bring the translations of every given FAQ up to date with a single
+        batched engine call. Each field is re-translated only in the languages
+        whose stored source hash no longer matches (every field with force).
+        A field whose call fails keeps its previous text under a blank hash,
+        so it is retried next time. Returns unsaved FAQTranslation rows (done
+        or failed) for the languages that changed; storing them is left to
+        the caller.
+        """
+        languages = translated_languages()
+        previous = {
+            (row.faq_id, row.lang): row
+            for row in FAQTranslation.objects.filter(faq__in=[faq.pk for faq in faqs])
+        }
+
+        stale = {}  # (faq, lang) -> fields to translate
+        hashes = {faq.pk: faq.source_hashes() for faq in faqs}
+        for faq in faqs:
+            for lang in languages:
+                row = previous.get((faq.pk, lang))
+                fields = [
+                    field
+                    for field in TRANSLATED_FIELDS
+                    if force
+                    or row is None
+                    or getattr(row, f"{field}_hash") != hashes[faq.pk][field]
+                ]
+                # A row left pending by an edit that was undone only needs its status
+                if fields or row.status != TRANSLATION_DONE:
+                    stale[(faq, lang)] = fields
+        translations = get_engine().translate_documents(
+            (getattr(faq, field), lang)
+            for (faq, lang), fields in stale.items()
+            for field in fields
+        )
+
+        rows = []
+        for (faq, lang), fields in stale.items():
+            previous_row = previous.get((faq.pk, lang))
+            row = FAQTranslation(faq=faq, lang=lang, status=TRANSLATION_DONE)
+            for field in TRANSLATED_FIELDS:
+                if field not in fields:
+                    # Source unchanged: reuse
+                    value = getattr(previous_row, field)
+                    field_hash = getattr(previous_row, f"{field}_hash")
+                else:
+                    value = translations.get((getattr(faq, field), lang))
+                    field_hash = hashes[faq.pk][field]
+                    if value is None:
+                        row.status = TRANSLATION_FAILED
+                        value = getattr(previous_row, field, "")
+                        field_hash = ""
+                setattr(row, field, value)
+                setattr(row, f"{field}_hash", field_hash)
+            rows.append(row)
+        return rows
+
+    def source_hashes(self):
+        return {field: source_hash(getattr(self, field)) for field in TRANSLATED_FIELDS}
 
-    def translate_content(self):
-        try:
-            for lang in SUPPORTED_LANGUAGES:
-                if lang != "en":
-                    self.question_translated[lang] = translate_text(lang, self.question)
-                    self.answer_translated[lang] = translate_text(lang, self.answer)
-        except Exception as e:
-            print(f"Translation failed: {e}")
+    def get_translation(self, lang):
+        """
+        Return the FAQTranslation of lang, or None if there is none yet.
+
+        Uses the row joined by FAQ.objects.with_translation(lang) or prefetched
+        translations when available, otherwise loads all translations once.
+        """
+        if getattr(self, "translated_lang", None) == lang:
+            if self.translated_status is None:
+                return None
+            return FAQTranslation(
+                faq_id=self.pk,
+                lang=lang,
+                question=self.translated_question,
+                answer=self.translated_answer,
+                status=self.translated_status,
+            )
+        if self.pk is None:
+            return None
+        if "translations" not in getattr(self, "_prefetched_objects_cache", {}):
+            prefetch_related_objects([self], "translations")
+        for translation in self.translations.all():
+            if translation.lang == lang:
+                return translation
+        return None
 
     def get_translated_question(self, lang="en"):
         # For English, or if no proper translation is available, return the original question.
         if lang == "en":
             return self.question
-        value = self.question_translated.get(lang)
-        if not value:  # If value is None or an empty string
+        translation = self.get_translation(lang)
+        if not translation or not translation.question:
             return self.question
-        return value
+        return translation.question
 
     def get_translated_answer(self, lang="en"):
         if lang == "en":
             return self.answer
-        value = self.answer_translated.get(lang)
-        if not value:
+        translation = self.get_translation(lang)
+        if not translation or not translation.answer:
             return self.answer
-        return value
+        return translation.answer
+
+    def get_translation_status(self, lang="en"):
+        if lang == "en":
+            return TRANSLATION_DONE
+        translation = self.get_translation(lang)
+        return translation.status if translation else TRANSLATION_PENDING
 
     def __str__(self):
         return self.question
+
+
+class FAQTranslationQuerySet(models.QuerySet):
+    def mark_pending(self):
+        """
+        Flag translations whose source text was edited; they keep serving the
+        previous text until the translation task replaces them.
+        """
+        return self.exclude(status=TRANSLATION_PENDING).update(
+            status=TRANSLATION_PENDING
+        )
+
+    def upsert(self, translations, seq=None):
+        """
+        Insert or replace translation rows on their (faq, lang) key, moving
+        their FAQs forward in the change feed (at seq if the transaction
+        already holds a sequence number).
+        """
+        with transaction.atomic():
+            if translations and seq is None:
+                seq = next_change_seq()
+            rows = self.bulk_create(
+                translations,
+                update_conflicts=True,
+                unique_fields=["faq", "lang"],
+                update_fields=[
+                    "question",
+                    "answer",
+                    "question_hash",
+                    "answer_hash",
+                    "status",
+                    "updated_at",
+                ],
+            )
+            record_changes({translation.faq_id for translation in translations}, seq)
+        return rows
+
+
+class FAQTranslation(models.Model):
+    """
+    One language of an FAQ. English lives on FAQ itself; a missing row means
+    the translation is still pending.
+    """
+
+    faq = models.ForeignKey(FAQ, on_delete=models.CASCADE, related_name="translations")
+    lang = models.CharField(max_length=10)
+    question = models.TextField(blank=True)
+    answer = models.TextField(blank=True)
+    # Hashes of the English text each field was translated from
+    question_hash = models.CharField(max_length=64, blank=True)
+    answer_hash = models.CharField(max_length=64, blank=True)
+    status = models.CharField(
+        max_length=10, choices=TRANSLATION_STATUS_CHOICES, default=TRANSLATION_PENDING
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = FAQTranslationQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["faq", "lang"], name="unique_faq_translation"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.faq_id} ({self.lang})"
+
+
+class TranslationMemoryEntry(models.Model):
+    """
+    Shared tier of the translation memory (see faqs.translation_memory).
+    """
+
+    source_hash = models.CharField(max_length=64)
+    target_lang = models.CharField(max_length=10)
+    backend_version = models.CharField(max_length=64)
+    translation = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["source_hash", "target_lang", "backend_version"],
+                name="unique_translation_memory_entry",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.source_hash[:12]} -> {self.target_lang}"
+
+
+class ImportJob(models.Model):
+    """
+    Progress and per-row errors of an admin CSV import, polled by the admin.
+    """
+
+    STATUS_IMPORTING = "importing"
+    STATUS_TRANSLATING = "translating"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_IMPORTING, "Importing"),
+        (STATUS_TRANSLATING, "Translating"),
+        (STATUS_DONE, "Done"),
+        (STATUS_FAILED, "Failed"),
+    ]
+    MAX_ERRORS = 100  # Only the first errors are kept, the rest are counted
+
+    filename = models.CharField(max_length=255)
+    status = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default=STATUS_IMPORTING
+    )
+    total_rows = models.PositiveIntegerField(default=0)
+    imported_rows = models.PositiveIntegerField(default=0)
+    translated_rows = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def add_error(self, row, message):
+        self.error_count += 1
+        if len(self.errors) < self.MAX_ERRORS:
+            self.errors.append({"row": row, "error": message})
+
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS_DONE, self.STATUS_FAILED)
+
+    def __str__(self):
+        return f"{self.filename} ({self.status})"
+
+
+class FAQTombstone(models.Model):
+    """
+    Deletion of an FAQ, kept for the change feed until it is purged (see
+    faqs.changes.purge_tombstones).
+    """
+
+    faq_id = models.BigIntegerField()
+    change_seq = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["change_seq", "faq_id"], name="faqtombstone_change_seq_idx"
+            ),
+            models.Index(fields=["deleted_at"], name="faqtombstone_deleted_at_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.faq_id} (deleted at #{self.change_seq})"
+
+
+class ChangeCounter(models.Model):
+    """
+    Single-row counter handing out change feed sequence numbers, and the
+    newest sequence number whose tombstones were purged.
+    """
+
+    value = models.BigIntegerField(default=0)
+    purged_seq = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"#{self.value}"
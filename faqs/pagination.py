@@ -0,0 +1,174 @@
+"""
+Pagination helpers: request parameters plus keyset (cursor) pagination.
+
+Keyset pagination walks FAQs newest first by (created_at, id) and encodes the
+position of the last row in an opaque cursor, so deep pages cost the same as
+the first one (no COUNT(*), no OFFSET scan).
+
+EstimatedCountPaginator replaces COUNT(*) over a whole large table with the
+database's own row estimate (used by the admin changelist).
+"""
+
+import base64
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def default_page_size():
+    return getattr(settings, "FAQ_PAGE_SIZE", 5)
+
+
+def get_page_size(request):
+    """
+    Return the requested ?page_size=, clamped to FAQ_MAX_PAGE_SIZE.
+    """
+    default = default_page_size()
+    maximum = getattr(settings, "FAQ_MAX_PAGE_SIZE", 50)
+    try:
+        page_size = int(request.GET.get("page_size", default))
+    except (TypeError, ValueError):
+        return default
+    return min(max(page_size, 1), maximum)
+
+
+def get_page_number(request):
+    """
+    Return the requested ?page= as a positive integer (1 when invalid).
+    """
+    try:
+        return max(int(request.GET.get("page", 1)), 1)
+    except (TypeError, ValueError):
+        return 1
+
+
+def uses_cursor(request):
+    """
+    Keyset pagination is selected by passing ?cursor= (empty for the first page).
+    """
+    return "cursor" in request.GET
+
+
+def wants_count(request):
+    """
+    Keyset pages skip the total count unless ?count=true is passed.
+    """
+    return request.GET.get("count", "").lower() in ("1", "true", "yes")
+
+
+def encode_cursor(faq):
+    raw = f"{faq.created_at.isoformat()}|{faq.pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, pk = base64.urlsafe_b64decode(padded).decode().split("|")
+        created_at = parse_datetime(created_at)
+        if created_at is None:
+            raise ValueError
+        return created_at, int(pk)
+    except (ValueError, UnicodeDecodeError):
+        raise InvalidCursor(f"Invalid cursor: {cursor!r}")
+
+
+def _after_cursor(queryset, cursor):
+    queryset = queryset.order_by("-created_at", "-id")
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+        )
+    return queryset
+
+
+def _keyset_result(rows, page_size):
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        return rows, encode_cursor(rows[-1])
+    return rows, None
+
+
+def keyset_page(queryset, cursor, page_size):
+    """
+    Return (rows, next_cursor) for the page that follows cursor.
+    next_cursor is None on the last page.
+    """
+    # Fetch one extra row to learn whether there is a next page
+    limit = page_size + 1
+    rows = list(_after_cursor(queryset, cursor)[:limit])
+    return _keyset_result(rows, page_size)
+
+
+async def akeyset_page(queryset, cursor, page_size):
+    """
+    keyset_page() for async views, fetching the rows with the async ORM.
+    """
+    limit = page_size + 1
+    rows = [row async for row in _after_cursor(queryset, cursor)[:limit]]
+    return _keyset_result(rows, page_size)
+
+
+async def aget_page(queryset, number, page_size):
+    """
+    Paginator.get_page() for async views: the count and the rows of the page
+    are fetched with the async ORM.
+    """
+    paginator = Paginator(queryset, page_size)
+    paginator.count = await queryset.acount()  # Fills the cached property
+    page_obj = paginator.get_page(number)
+    page_obj.object_list = [row async for row in page_obj.object_list]
+    return page_obj
+
+
+def estimated_row_count(model, using="default"):
+    """
+    The planner's estimate of the rows in model's table (PostgreSQL, MySQL),
+    or None when the database keeps no such statistic.
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    if connection.vendor == "postgresql":
+        sql = "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass"
+    elif connection.vendor == "mysql":
+        sql = (
+            "SELECT table_rows FROM information_schema.tables "
+            "WHERE table_schema = DATABASE() AND table_name = %s"
+        )
+    else:
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [table])
+        row = cursor.fetchone()
+    # reltuples is -1 until the table was first analyzed
+    if row is None or row[0] is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Reports the row estimate instead of running COUNT(*) when an unfiltered
+    queryset covers at least estimate_threshold rows. Filtered querysets and
+    small tables are counted exactly.
+    """
+
+    estimate_threshold = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if isinstance(queryset, QuerySet) and not queryset.query.where:
+            estimate = estimated_row_count(queryset.model, queryset.db)
+            if estimate is not None and estimate >= self.estimate_threshold:
+                return estimate
+        return super().count
@@ -1,35 +1,387 @@
+import asyncio
+import logging
+import threading
+import weakref
 import redis
-import json
+import redis.asyncio
+from time import monotonic
+from django.conf import settings
 from django.db import transaction
+from redis.client import NEVER_DECODE
 
+from .cache_codec import UndecodableValue, get_codec
+from .metrics import (
+    REDIS_BREAKER_STATE,
+    REDIS_BREAKER_TRIPS,
+    REDIS_DURATION,
+    record_cache_lookup,
+)
 
-class RedisHandler:
-    def __init__(self):
-        self.client = redis.StrictRedis(
-            host="localhost", port=6379, db=1, decode_responses=True
+logger = logging.getLogger(__name__)
+
+_UNAVAILABLE = object()
+# The pools decode replies to str; encoded cache values are read as bytes
+RAW_REPLY = {NEVER_DECODE: True}
+
+DEFAULT_REDIS = {
+    "URL": "redis://127.0.0.1:6379/1",
+    "MAX_CONNECTIONS": 50,
+    "SOCKET_TIMEOUT": 0.25,
+    "SOCKET_CONNECT_TIMEOUT": 0.25,
+    "HEALTH_CHECK_INTERVAL": 30,
+    "BREAKER_FAILURE_THRESHOLD": 5,
+    "BREAKER_RESET_TIMEOUT": 30,
+}
+
+_connection_pool = None
+_circuit_breaker = None
+# redis.asyncio connections belong to the event loop that opened them
+_async_connection_pools = weakref.WeakKeyDictionary()
+
+
+def get_redis_config():
+    return {**DEFAULT_REDIS, **getattr(settings, "FAQ_REDIS", {})}
+
+
+def get_connection_pool():
+    """
+    Return the process-wide connection pool, built from settings.FAQ_REDIS.
+    """
+    global _connection_pool
+    if _connection_pool is None:
+        config = get_redis_config()
+        _connection_pool = redis.ConnectionPool.from_url(
+            config["URL"],
+            max_connections=config["MAX_CONNECTIONS"],
+            socket_timeout=config["SOCKET_TIMEOUT"],
+            socket_connect_timeout=config["SOCKET_CONNECT_TIMEOUT"],
+            health_check_interval=config["HEALTH_CHECK_INTERVAL"],
+            decode_responses=True,
         )
+    return _connection_pool
+
+
+def get_redis_client():
+    """
+    Return a client backed by the shared connection pool.
+    """
+    return redis.Redis(connection_pool=get_connection_pool())
+
+
+def get_async_connection_pool():
+    """
+    Return the redis.asyncio pool shared by every coroutine of the running
+    event loop, built from settings.FAQ_REDIS like the sync pool.
+    """
+    loop = asyncio.get_running_loop()
+    pool = _async_connection_pools.get(loop)
+    if pool is None:
+        config = get_redis_config()
+        pool = _async_connection_pools[loop] = redis.asyncio.ConnectionPool.from_url(
+            config["URL"],
+            max_connections=config["MAX_CONNECTIONS"],
+            socket_timeout=config["SOCKET_TIMEOUT"],
+            socket_connect_timeout=config["SOCKET_CONNECT_TIMEOUT"],
+            health_check_interval=config["HEALTH_CHECK_INTERVAL"],
+            decode_responses=True,
+        )
+    return pool
+
+
+def get_async_redis_client():
+    return redis.asyncio.Redis(connection_pool=get_async_connection_pool())
+
+
+class CircuitBreaker:
+    """
+    Stops calling Redis for reset_timeout seconds after failure_threshold
+    consecutive errors. Once the cool-down is over a single trial call is let
+    through (half-open); its outcome closes or re-opens the breaker.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.counters = {"failures": 0, "trips": 0, "short_circuited": 0}
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if (
+                self.state == self.OPEN
+                and monotonic() - self.opened_at >= self.reset_timeout
+            ):
+                self.state = self.HALF_OPEN
+                return True
+            self.counters["short_circuited"] += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self.counters["failures"] += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.counters["trips"] += 1
+                    REDIS_BREAKER_TRIPS.inc()
+                self.state = self.OPEN
+                self.opened_at = monotonic()
+
+    def stats(self):
+        with self._lock:
+            return {"state": self.state, **self.counters}
+
+
+def get_circuit_breaker():
+    """
+    Return the process-wide breaker guarding the shared connection pool.
+    """
+    global _circuit_breaker
+    if _circuit_breaker is None:
+        config = get_redis_config()
+        _circuit_breaker = CircuitBreaker(
+            failure_threshold=config["BREAKER_FAILURE_THRESHOLD"],
+            reset_timeout=config["BREAKER_RESET_TIMEOUT"],
+        )
+    return _circuit_breaker
+
+
+def _breaker_state_values():
+    state = get_circuit_breaker().stats()["state"]
+    return {
+        (name,): int(name == state)
+        for name in (
+            CircuitBreaker.CLOSED,
+            CircuitBreaker.OPEN,
+            CircuitBreaker.HALF_OPEN,
+        )
+    }
+
+
+REDIS_BREAKER_STATE.set_function(_breaker_state_values)
+
+
+class RedisHandler:
+    """
+    Fail-open Redis cache: errors and an open circuit breaker turn every
+    operation into a cache miss / no-op so callers fall back to the database.
+    """
+
+    def __init__(self, client=None, breaker=None):
+        self.client = client or get_redis_client()
+        self.breaker = breaker or get_circuit_breaker()
+
+    def execute(self, operation, default=None):
+        """
+        Run operation(client) through the circuit breaker, returning default
+        if Redis is unavailable.
+        """
+        if not self.breaker.allow():
+            return default
+        try:
+            with REDIS_DURATION.time():
+                result = operation(self.client)
+        except redis.RedisError as e:
+            self.breaker.record_failure()
+            logger.warning("Redis unavailable, serving without cache: %s", e)
+            return default
+        self.breaker.record_success()
+        return result
+
+    @staticmethod
+    def _loads(value):
+        try:
+            return get_codec().decode(value)
+        except UndecodableValue as e:
+            logger.warning("Ignoring unreadable cache value: %s", e)
+            return None
+
+    @staticmethod
+    def _dumps(value):
+        return get_codec().encode(value)
 
     def get_cache(self, key):
-        value = self.client.get(key)
-        if value:
-            try:
-                return json.loads(value)  # Deserialize the cached data
-            except json.JSONDecodeError:
-                return value  # Return raw value if deserialization fails
+        value = self.execute(
+            lambda client: client.execute_command("GET", key, **RAW_REPLY),
+            default=_UNAVAILABLE,
+        )
+        record_cache_lookup(key, value, error=value is _UNAVAILABLE)
+        if value and value is not _UNAVAILABLE:
+            return self._loads(value)
         return None
 
+    def get_many(self, keys):
+        """
+        Fetch several keys with a single MGET. Returns a dict of the keys found.
+        """
+        keys = list(keys)
+        if not keys:
+            return {}
+        values = self.execute(
+            lambda client: client.execute_command("MGET", *keys, **RAW_REPLY),
+            default=None,
+        )
+        for key, value in zip(keys, values or [None] * len(keys)):
+            record_cache_lookup(key, value, error=values is None)
+        found = {
+            key: self._loads(value) for key, value in zip(keys, values or []) if value
+        }
+        return {key: value for key, value in found.items() if value is not None}
+
     def set_cache(self, key, value, timeout=3600):
-        # Ensure that the value passed to Redis is serializable
-        if isinstance(
-            value, (dict, list)
-        ):  # If value is a dictionary or list, serialize it
-            value = json.dumps(value)
-        elif not isinstance(value, str):  # If it's not a string, convert it to a string
-            value = str(value)
+        value = self._dumps(value)
+        self.execute(lambda client: client.setex(key, timeout, value))
+
+    def set_many(self, mapping, timeout=3600):
+        """
+        Store several keys in one round-trip using a (non-transactional) pipeline.
+        """
+        pipe = self.client.pipeline(transaction=False)
+        for key, value in mapping.items():
+            pipe.setex(key, timeout, self._dumps(value))
+        self.execute(lambda client: pipe.execute())
+
+    def delete_many(self, keys):
+        keys = list(keys)
+        if keys:
+            self.execute(lambda client: client.delete(*keys))
+
+    def set_cache_if_unchanged(self, key, value, timeout, watch_key, expected):
+        """
+        Store key only if watch_key still holds expected (None: unset), checked
+        atomically with WATCH/MULTI. True if the value was stored.
+        """
+        value = self._dumps(value)
+
+        def operation(client):
+            with client.pipeline() as pipe:
+                try:
+                    pipe.watch(watch_key)
+                    if pipe.get(watch_key) != expected:
+                        return False
+                    pipe.multi()
+                    pipe.setex(key, timeout, value)
+                    pipe.execute()
+                except redis.WatchError:
+                    return False
+            return True
+
+        return bool(self.execute(operation))
+
+    def delete_if_equal(self, key, expected):
+        """
+        Delete key only if it still holds expected (e.g. a lock token).
+        """
 
-        # Now that it's serializable, store it in Redis
-        self.client.setex(key, timeout, value)
+        def operation(client):
+            with client.pipeline() as pipe:
+                try:
+                    pipe.watch(key)
+                    if pipe.get(key) != expected:
+                        return False
+                    pipe.multi()
+                    pipe.delete(key)
+                    pipe.execute()
+                except redis.WatchError:
+                    return False
+            return True
+
+        return bool(self.execute(operation))
 
     @transaction.atomic
     def set_cache_with_transaction(self, key, value, timeout=3600):
         self.set_cache(key, value, timeout)
+
+
+class AsyncRedisHandler:
+    """
+    redis.asyncio counterpart of RedisHandler for async views. It fails open
+    the same way and shares the process-wide circuit breaker.
+    """
+
+    def __init__(self, breaker=None):
+        self.breaker = breaker or get_circuit_breaker()
+
+    async def execute(self, operation, default=None):
+        """
+        Await operation(client) through the circuit breaker, returning default
+        if Redis is unavailable.
+        """
+        if not self.breaker.allow():
+            return default
+        try:
+            with REDIS_DURATION.time():
+                result = await operation(get_async_redis_client())
+        except redis.RedisError as e:
+            self.breaker.record_failure()
+            logger.warning("Redis unavailable, serving without cache: %s", e)
+            return default
+        self.breaker.record_success()
+        return result
+
+    async def get_cache(self, key):
+        value = await self.execute(
+            lambda client: client.execute_command("GET", key, **RAW_REPLY),
+            default=_UNAVAILABLE,
+        )
+        record_cache_lookup(key, value, error=value is _UNAVAILABLE)
+        if value and value is not _UNAVAILABLE:
+            return RedisHandler._loads(value)
+        return None
+
+    async def set_cache(self, key, value, timeout=3600):
+        value = RedisHandler._dumps(value)
+        await self.execute(lambda client: client.setex(key, timeout, value))
+
+    async def delete_many(self, keys):
+        keys = list(keys)
+        if keys:
+            await self.execute(lambda client: client.delete(*keys))
+
+    async def set_cache_if_unchanged(self, key, value, timeout, watch_key, expected):
+        value = RedisHandler._dumps(value)
+
+        async def operation(client):
+            async with client.pipeline() as pipe:
+                try:
+                    await pipe.watch(watch_key)
+                    if await pipe.get(watch_key) != expected:
+                        return False
+                    pipe.multi()
+                    pipe.setex(key, timeout, value)
+                    await pipe.execute()
+                except redis.WatchError:
+                    return False
+            return True
+
+        return bool(await self.execute(operation))
+
+    async def delete_if_equal(self, key, expected):
+        async def operation(client):
+            async with client.pipeline() as pipe:
+                try:
+                    await pipe.watch(key)
+                    if await pipe.get(key) != expected:
+                        return False
+                    pipe.multi()
+                    pipe.delete(key)
+                    await pipe.execute()
+                except redis.WatchError:
+                    return False
+            return True
+
+        return bool(await self.execute(operation))
@@ -0,0 +1,254 @@
+"""
+Full-text search over FAQ questions and answers in every language.
+
+Each FAQ is indexed once per supported language in an inverted index that is
+maintained in the same transaction as the FAQ write. The index lives in the
+main database: an FTS5 virtual table on SQLite and a GIN-indexed tsvector
+table on PostgreSQL. Other databases fall back to an (unindexed) icontains
+scan. The backend is chosen by database vendor or settings.FAQ_SEARCH_BACKEND.
+The index tables are created by migration 0006_faq_search_index.
+"""
+
+from django.conf import settings
+from django.db import connection
+from django.utils.html import strip_tags
+from django.utils.module_loading import import_string
+
+from .languages import SUPPORTED_LANGUAGES
+
+FTS_TABLE = "faqs_faq_fts"
+TSVECTOR_TABLE = "faqs_faq_search"
+# FTS5 rows of an FAQ use the rowids faq_id * FTS_ROWIDS_PER_FAQ + the index
+# of their language, so they are found through the rowid b-tree. Changing the
+# layout (or the order of SUPPORTED_LANGUAGES) needs a migration that rekeys
+# the existing rows, as 0011_faq_fts_rowids did.
+FTS_ROWIDS_PER_FAQ = 64
+
+
+def faq_documents(faq):
+    """
+    Yield (lang, question, answer) rows to index for an FAQ.
+    """
+    for lang in SUPPORTED_LANGUAGES:
+        yield (
+            lang,
+            faq.get_translated_question(lang),
+            strip_tags(faq.get_translated_answer(lang)),
+        )
+
+
+class SQLiteFTS5Backend:
+    @staticmethod
+    def _match_expression(query):
+        # Quote every term so user input cannot inject FTS5 syntax; the last
+        # term is matched as a prefix for search-as-you-type.
+        terms = ['"%s"' % term.replace('"', '""') for term in query.split()]
+        if terms:
+            terms[-1] += "*"
+        return " ".join(terms)
+
+    @staticmethod
+    def rowid(faq_id, lang):
+        return faq_id * FTS_ROWIDS_PER_FAQ + SUPPORTED_LANGUAGES.index(lang)
+
+    def remove(self, faq_ids):
+        # faq_id is not indexed; a rowid range per FAQ avoids a full scan
+        ranges = [
+            (faq_id * FTS_ROWIDS_PER_FAQ, (faq_id + 1) * FTS_ROWIDS_PER_FAQ)
+            for faq_id in faq_ids
+        ]
+        if ranges:
+            with connection.cursor() as cursor:
+                cursor.executemany(
+                    f"DELETE FROM {FTS_TABLE} WHERE rowid >= %s AND rowid < %s",
+                    ranges,
+                )
+
+    def index(self, faqs):
+        faqs = list(faqs)
+        self.remove(faq.pk for faq in faqs)
+        rows = [
+            (self.rowid(faq.pk, document[0]), faq.pk, *document)
+            for faq in faqs
+            for document in faq_documents(faq)
+        ]
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE} (rowid, faq_id, lang, question, answer) "
+                "VALUES (%s, %s, %s, %s, %s)",
+                rows,
+            )
+
+    def search(self, query, lang=None, offset=0, limit=None):
+        """
+        Return FAQ ids matching query, best match first.
+        """
+        match = self._match_expression(query)
+        if not match:
+            return []
+        sql = f"SELECT faq_id, bm25({FTS_TABLE}) AS rank FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s"
+        params = [match]
+        if lang:
+            sql += " AND lang = %s"
+            params.append(lang)
+        # An FAQ matches once per language; rank it by its best language. The
+        # CTE is materialized because bm25() cannot run inside an aggregate.
+        sql = (
+            f"WITH matches AS MATERIALIZED ({sql}) "
+            "SELECT faq_id, MIN(rank) AS best FROM matches GROUP BY faq_id "
+            "ORDER BY best, faq_id LIMIT %s OFFSET %s"
+        )
+        params += [-1 if limit is None else limit, offset]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [row[0] for row in cursor.fetchall()]
+
+    def count(self, query, lang=None):
+        match = self._match_expression(query)
+        if not match:
+            return 0
+        sql = (
+            f"SELECT COUNT(DISTINCT faq_id) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s"
+        )
+        params = [match]
+        if lang:
+            sql += " AND lang = %s"
+            params.append(lang)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchone()[0]
+
+
+class PostgresSearchBackend:
+    # The 'simple' configuration does no stemming, which keeps the index
+    # usable for languages Postgres has no dictionary for (hi, bn, ...).
+    config = "simple"
+
+    def remove(self, faq_ids):
+        faq_ids = list(faq_ids)
+        if faq_ids:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"DELETE FROM {TSVECTOR_TABLE} WHERE faq_id = ANY(%s)", [faq_ids]
+                )
+
+    def index(self, faqs):
+        faqs = list(faqs)
+        self.remove(faq.pk for faq in faqs)
+        rows = [
+            (faq.pk, lang, self.config, question, self.config, answer)
+            for faq in faqs
+            for lang, question, answer in faq_documents(faq)
+        ]
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {TSVECTOR_TABLE} (faq_id, lang, document) VALUES (%s, %s, "
+                "setweight(to_tsvector(%s::regconfig, %s), 'A') || "
+                "setweight(to_tsvector(%s::regconfig, %s), 'B'))",
+                rows,
+            )
+
+    def search(self, query, lang=None, offset=0, limit=None):
+        sql = (
+            f"SELECT faq_id, MAX(ts_rank(document, query)) AS rank "
+            f"FROM {TSVECTOR_TABLE}, plainto_tsquery(%s::regconfig, %s) query "
+            "WHERE document @@ query"
+        )
+        params = [self.config, query]
+        if lang:
+            sql += " AND lang = %s"
+            params.append(lang)
+        sql += " GROUP BY faq_id ORDER BY rank DESC, faq_id LIMIT %s OFFSET %s"
+        params += [limit, offset]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [row[0] for row in cursor.fetchall()]
+
+    def count(self, query, lang=None):
+        sql = (
+            f"SELECT COUNT(DISTINCT faq_id) FROM {TSVECTOR_TABLE} "
+            "WHERE document @@ plainto_tsquery(%s::regconfig, %s)"
+        )
+        params = [self.config, query]
+        if lang:
+            sql += " AND lang = %s"
+            params.append(lang)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchone()[0]
+
+
+class ScanBackend:
+    """
+    Unindexed fallback for databases without a supported full-text engine.
+    """
+
+    def remove(self, faq_ids):
+        pass
+
+    def index(self, faqs):
+        pass
+
+    def _queryset(self, query):
+        from .models import FAQ
+
+        return (
+            FAQ.objects.filter(question__icontains=query)
+            | FAQ.objects.filter(answer__icontains=query)
+        ).order_by("-created_at", "-id")
+
+    def search(self, query, lang=None, offset=0, limit=None):
+        ids = self._queryset(query).values_list("pk", flat=True)
+        end = None if limit is None else offset + limit
+        return list(ids[offset:end])
+
+    def count(self, query, lang=None):
+        return self._queryset(query).count()
+
+
+VENDOR_BACKENDS = {
+    "sqlite": "faqs.search.SQLiteFTS5Backend",
+    "postgresql": "faqs.search.PostgresSearchBackend",
+}
+
+
+def get_search_backend_class(vendor=None):
+    path = getattr(settings, "FAQ_SEARCH_BACKEND", None) or VENDOR_BACKENDS.get(
+        vendor or connection.vendor, "faqs.search.ScanBackend"
+    )
+    return import_string(path)
+
+
+def get_search_backend():
+    return get_search_backend_class()()
+
+
+def index_faqs(faqs):
+    get_search_backend().index(faqs)
+
+
+def remove_faqs(faq_ids):
+    get_search_backend().remove(faq_ids)
+
+
+class SearchResults:
+    """
+    Lazy, sliceable view of a ranked search so Django's Paginator can page it.
+    """
+
+    def __init__(self, query, lang=None):
+        self.query = query
+        self.lang = lang
+        self.backend = get_search_backend()
+
+    def count(self):
+        return self.backend.count(self.query, self.lang)
+
+    def __getitem__(self, page):
+        from .models import FAQ
+
+        ids = self.backend.search(
+            self.query, self.lang, offset=page.start, limit=page.stop - page.start
+        )
+        faqs = FAQ.objects.with_translation(self.lang or "en").in_bulk(ids)
+        return [faqs[pk] for pk in ids if pk in faqs]
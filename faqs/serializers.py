@@ -1,12 +1,11 @@
 from rest_framework import serializers
+from .languages import SUPPORTED_LANGUAGES
 from .models import FAQ
 
 
 class FAQSerializer(serializers.ModelSerializer):
     question = serializers.CharField()  # Change to CharField for POST request
     answer = serializers.CharField()  # Change to CharField for POST request
-    question_translated = serializers.JSONField(required=False)
-    answer_translated = serializers.JSONField(required=False)
 
     class Meta:
         model = FAQ
@@ -14,37 +13,43 @@ class FAQSerializer(serializers.ModelSerializer):
             "id",
             "question",
             "answer",
-            "question_translated",
-            "answer_translated",
             "created_at",
             "updated_at",
         )
 
-    def create(self, validated_data):
-        """
-        Override the create method to handle translations automatically on FAQ creation.
-        """
-        faq = FAQ.objects.create(**validated_data)
-
-        # You can call the translate_content method here to populate translations after the FAQ is saved
-        faq.translate_content()
-
-        return faq
-
-    def get_question(self, obj):
-        """
-        Get translated question.
-        Used only for GET requests to return translated content.
-        """
-        request = self.context.get("request")
-        lang = request.GET.get("lang", "en") if request else "en"
-        return obj.get_translated_question(lang)
-
-    def get_answer(self, obj):
-        """
-        Get translated answer.
-        Used only for GET requests to return translated content.
-        """
-        request = self.context.get("request")
-        lang = request.GET.get("lang", "en") if request else "en"
-        return obj.get_translated_answer(lang)
+
+_datetime_field = serializers.DateTimeField()
+
+
+def wants_translations(request):
+    """
+    True when the client opted into every language with ?include=translations.
+    """
+    return "translations" in request.GET.get("include", "").split(",")
+
+
+def serialize_faq(faq, lang="en", include_translations=False):
+    """
+    Read-path representation of an FAQ with the question and answer resolved
+    for a single language. Built as a plain dict to skip DRF's per-field
+    overhead on the hot list path. include_translations adds every language.
+    """
+    data = {
+        "id": faq.id,
+        "lang": lang,
+        "question": faq.get_translated_question(lang),
+        "answer": faq.get_translated_answer(lang),
+        "translation_status": faq.get_translation_status(lang),
+        "created_at": _datetime_field.to_representation(faq.created_at),
+        "updated_at": _datetime_field.to_representation(faq.updated_at),
+    }
+    if include_translations:
+        data["translations"] = {
+            code: {
+                "question": faq.get_translated_question(code),
+                "answer": faq.get_translated_answer(code),
+                "status": faq.get_translation_status(code),
+            }
+            for code in SUPPORTED_LANGUAGES
+        }
+    return data
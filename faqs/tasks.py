@@ -0,0 +1,191 @@
+"""
+Background task queue for work that should not run on the request thread.
+
+Tasks are referenced by their dotted path so that the broker can be swapped
+for an external queue (Celery, RQ, ...) without touching the callers. The
+broker is selected through ``settings.FAQ_TASK_BROKER``.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.dispatch import receiver
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .cache import (
+    acquire_lock,
+    get_warming_config,
+    invalidate_faq_caches,
+    list_generation,
+    release_lock,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BROKER = {
+    "BACKEND": "faqs.tasks.ThreadPoolBroker",
+    "OPTIONS": {"max_workers": 4},
+}
+
+
+def run_task(task_path, *args, **kwargs):
+    """
+    Import and run a task, making sure the worker never leaks a stale DB connection.
+    """
+    close_old_connections()
+    try:
+        return import_string(task_path)(*args, **kwargs)
+    except Exception:
+        logger.exception("Task %s failed", task_path)
+    finally:
+        close_old_connections()
+
+
+class ImmediateBroker:
+    """
+    Runs tasks inline. Useful for tests, management commands and debugging.
+    """
+
+    def __init__(self, **options):
+        pass
+
+    def enqueue(self, task_path, *args, **kwargs):
+        run_task(task_path, *args, **kwargs)
+
+
+class ThreadPoolBroker:
+    """
+    Runs tasks on a local, bounded thread pool owned by the current process.
+    """
+
+    def __init__(self, max_workers=4, **options):
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="faqs-task"
+        )
+
+    def enqueue(self, task_path, *args, **kwargs):
+        self.executor.submit(run_task, task_path, *args, **kwargs)
+
+
+_broker = None
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        config = getattr(settings, "FAQ_TASK_BROKER", DEFAULT_BROKER)
+        broker_class = import_string(config["BACKEND"])
+        _broker = broker_class(**config.get("OPTIONS", {}))
+    return _broker
+
+
+@receiver(setting_changed)
+def _reset_broker(setting, **kwargs):
+    global _broker
+    if setting == "FAQ_TASK_BROKER":
+        _broker = None
+
+
+def enqueue(task_path, *args, **kwargs):
+    get_broker().enqueue(task_path, *args, **kwargs)
+
+
+def enqueue_on_commit(task_path, *args, **kwargs):
+    """
+    Enqueue a task once the current transaction commits, so that workers never
+    see rows that are not visible yet (or that were rolled back).
+    """
+    transaction.on_commit(partial(enqueue, task_path, *args, **kwargs))
+
+
+def translate_faq(faq_id):
+    """
+    Translate a single FAQ into every supported language and store the result.
+    """
+    translate_faqs([faq_id])
+
+
+def translate_faqs(faq_ids, batch_size=100, import_job_id=None, force=False):
+    """
+    Translate a set of FAQs, sending each chunk to the engine as one batch.
+    Only fields whose source text changed are re-translated unless force.
+    When import_job_id is given, progress is recorded on that ImportJob.
+    """
+    from django.db.models import prefetch_related_objects
+
+    from .changes import next_change_seq
+    from .models import FAQ, FAQTranslation, ImportJob
+    from .search import index_faqs
+
+    jobs = ImportJob.objects.filter(pk=import_job_id)
+    faq_ids = list(faq_ids)
+    try:
+        for start in range(0, len(faq_ids), batch_size):
+            end = start + batch_size
+            faqs = list(FAQ.objects.filter(pk__in=faq_ids[start:end]))
+            sources = {faq.pk: faq.source_hashes() for faq in faqs}
+            translations = FAQ.translate_many(faqs, force=force)
+
+            with transaction.atomic():
+                # The change counter is locked before the FAQ rows, as in
+                # every other write (see next_change_seq)
+                seq = next_change_seq()
+                # The engine calls ran unlocked: drop translations of FAQs
+                # edited meanwhile (the edit queued a newer task) so an older
+                # task finishing last cannot overwrite the newer rows.
+                faqs = list(
+                    FAQ.objects.select_for_update().filter(pk__in=list(sources))
+                )
+                current = {
+                    faq.pk for faq in faqs if faq.source_hashes() == sources[faq.pk]
+                }
+                FAQTranslation.objects.upsert(
+                    [row for row in translations if row.faq_id in current], seq
+                )
+                prefetch_related_objects(faqs, "translations")
+                index_faqs(faqs)
+            jobs.update(translated_rows=F("translated_rows") + len(faqs))
+    except Exception:
+        jobs.update(status=ImportJob.STATUS_FAILED, finished_at=timezone.now())
+        raise
+    finally:
+        # Cached pages and details still hold the English fallback for these FAQs.
+        invalidate_faq_caches(*faq_ids)
+
+    jobs.update(status=ImportJob.STATUS_DONE, finished_at=timezone.now())
+
+
+def refill_faq_caches(max_rounds=3):
+    """
+    Rebuild the first FAQ_CACHE_WARMING["REFILL_PAGES"] pages (list, details
+    and home page) of every language right after an invalidation, so visitors
+    never meet them cold. One process refills at a time; if another write
+    lands meanwhile the refill runs again (up to max_rounds times).
+    """
+    from .warming import warm_faq_cache
+
+    pages = get_warming_config()["REFILL_PAGES"]
+    if not pages:
+        return
+    token = acquire_lock("faqs:refill", lock_timeout=60)
+    if token is None:
+        return
+    try:
+        generation = list_generation()
+        for _ in range(max_rounds):
+            if generation is None:
+                return
+            # A handful of pages: warm them on this worker, one at a time
+            warm_faq_cache(pages=pages, workers=1)
+            current = list_generation()
+            if current == generation:
+                return
+            generation = current
+    finally:
+        release_lock("faqs:refill", token)
@@ -1,20 +1,78 @@
 # faqs/tests.py
 
-from django.test import TestCase
+import csv
+import gzip
+import io
+import json
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from importlib import import_module
+from asgiref.sync import async_to_sync
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework.test import APITestCase
-from .models import FAQ
+import threading
+from time import sleep
+from unittest import mock
+import redis
+from . import metrics
+from .admin import FAQAdmin
+from .cache import (
+    acquire_lock,
+    invalidate_faq_caches,
+    list_generation,
+    read_through,
+    redis_handler,
+    release_lock,
+)
+from .redis_handler import CircuitBreaker, RedisHandler
+from .cache_codec import CacheCodec, UndecodableValue
+from .importer import ImportFormatError, import_faqs_csv
+from .search import FTS_TABLE, SQLiteFTS5Backend, get_search_backend
+from .tasks import translate_faqs
+from .benchmark import (
+    benchmark_languages,
+    compare,
+    run_scenarios,
+    seed_corpus,
+    summarize,
+)
+from .models import (
+    FAQ,
+    FAQTombstone,
+    FAQTranslation,
+    ImportJob,
+    TRANSLATION_DONE,
+    TRANSLATION_FAILED,
+    TRANSLATION_PENDING,
+)
+from .translator import StubBackend, TranslationEngine, get_engine, split_segments
+from .translation_memory import TranslationMemory
 
+IMMEDIATE_BROKER = {"BACKEND": "faqs.tasks.ImmediateBroker"}
+STUB_TRANSLATION = {"BACKEND": "faqs.translator.StubBackend"}
 
+
+@override_settings(FAQ_TASK_BROKER=IMMEDIATE_BROKER, FAQ_TRANSLATION=STUB_TRANSLATION)
 class FAQModelTest(TestCase):
     def setUp(self):
         """
         Setting up a consistent FAQ instance to test various model methods.
         """
-        self.faq = FAQ.objects.create(
-            question="What is REST?",
-            answer="REST is an architectural style for web services.",
-        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.faq = FAQ.objects.create(
+                question="What is REST?",
+                answer="REST is an architectural style for web services.",
+            )
 
     def test_auto_translation(self):
         """
@@ -49,6 +107,148 @@ class FAQModelTest(TestCase):
         self.assertNotEqual(translated_answer, "")  # Ensure we got something
 
 
+@override_settings(FAQ_TASK_BROKER=IMMEDIATE_BROKER, FAQ_TRANSLATION=STUB_TRANSLATION)
+class FAQBackgroundTranslationTest(TestCase):
+    def test_create_does_not_translate_inline(self):
+        """
+        Test that saving a new FAQ only queues translation and marks every
+        language as pending until the background task runs.
+        """
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            faq = FAQ.objects.create(question="What is REST?", answer="An API style.")
+
+        faq.refresh_from_db()
+        self.assertTrue(callbacks)
+        self.assertFalse(faq.translations.exists())
+        self.assertEqual(faq.get_translation_status("hi"), TRANSLATION_PENDING)
+        self.assertEqual(faq.get_translated_question("hi"), faq.question)
+
+    def test_translation_task_updates_status(self):
+        """
+        Test that the queued task records a final status for every language.
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            faq = FAQ.objects.create(question="What is REST?", answer="An API style.")
+
+        statuses = dict(faq.translations.values_list("lang", "status"))
+        self.assertEqual(set(statuses), {"hi", "bn"})
+        self.assertNotIn(TRANSLATION_PENDING, statuses.values())
+
+    def test_with_translation_joins_a_single_language(self):
+        """
+        Test that with_translation() resolves one language in the same query
+        and leaves missing translations as pending with the English fallback.
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            translated = FAQ.objects.create(question="Translated?", answer="Yes.")
+        untranslated = FAQ(question="Untranslated?", answer="No.")
+        untranslated.save(translate=False)
+
+        with self.assertNumQueries(1):
+            faqs = {faq.pk: faq for faq in FAQ.objects.with_translation("hi")}
+            self.assertEqual(
+                faqs[translated.pk].get_translated_question("hi"), "[hi] Translated?"
+            )
+            self.assertEqual(
+                faqs[untranslated.pk].get_translated_question("hi"), "Untranslated?"
+            )
+            self.assertEqual(
+                faqs[untranslated.pk].get_translation_status("hi"), TRANSLATION_PENDING
+            )
+
+
+class CountingBackend(StubBackend):
+    def __init__(self, delay=0, fail_langs=(), **options):
+        self.calls = []
+        self.delay = delay
+        self.fail_langs = fail_langs
+
+    def translate(self, text, lang):
+        self.calls.append((text, lang))
+        if lang in self.fail_langs:
+            raise RuntimeError("translator unavailable")
+        sleep(self.delay)
+        return super().translate(text, lang)
+
+
+class TranslationEngineTest(TestCase):
+    def test_batch_dedupes_identical_pairs(self):
+        """
+        Test that identical (text, lang) pairs in a batch reach the backend once.
+        """
+        backend = CountingBackend()
+        engine = TranslationEngine(backend, concurrency=2, timeout=5)
+        results = engine.translate_batch(
+            [("Hello", "hi"), ("Hello", "hi"), ("Hello", "bn"), ("", "hi")]
+        )
+        self.assertEqual(sorted(backend.calls), [("Hello", "bn"), ("Hello", "hi")])
+        self.assertEqual(results[("Hello", "hi")], "[hi] Hello")
+        self.assertEqual(results[("", "hi")], "")
+
+    def test_failed_and_timed_out_calls_are_omitted(self):
+        """
+        Test that failing or slow calls are left out of the batch result and
+        that single-string translation falls back to the source text.
+        """
+        engine = TranslationEngine(
+            CountingBackend(fail_langs=("bn",)), concurrency=2, timeout=5
+        )
+        results = engine.translate_batch([("Hello", "hi"), ("Hello", "bn")])
+        self.assertNotIn(("Hello", "bn"), results)
+        self.assertEqual(engine.translate("Hello", "bn"), "Hello")
+
+        slow_engine = TranslationEngine(CountingBackend(delay=0.5), timeout=0.05)
+        self.assertEqual(slow_engine.translate_batch([("Hello", "hi")]), {})
+
+    def test_failed_language_is_marked_on_faq(self):
+        """
+        Test that a language the backend cannot translate is marked as failed.
+        """
+        faq = FAQ(question="Q", answer="A")
+        faq.save(translate=False)
+        with override_settings(FAQ_TRANSLATION=STUB_TRANSLATION):
+            get_engine().backend = CountingBackend(fail_langs=("bn",))
+            faq.translate_content()
+        self.assertEqual(faq.get_translation_status("bn"), TRANSLATION_FAILED)
+        self.assertEqual(faq.get_translated_question("hi"), "[hi] Q")
+
+
+class TranslationMemoryTest(TestCase):
+    def test_repeat_translations_skip_the_backend(self):
+        """
+        Test that a translation is served from the in-process tier, then from the
+        shared DB tier in a fresh process, without reaching the backend again.
+        """
+        backend = CountingBackend()
+        engine = TranslationEngine(backend, memory=TranslationMemory("v1"))
+        engine.translate_batch([("What is REST?", "hi")])
+        engine.translate_batch([("What  is REST? ", "hi")])  # same normalized text
+        self.assertEqual(len(backend.calls), 1)
+
+        fresh_backend = CountingBackend()
+        fresh_memory = TranslationMemory("v1")
+        fresh_engine = TranslationEngine(fresh_backend, memory=fresh_memory)
+        self.assertEqual(
+            fresh_engine.translate("What is REST?", "hi"), "[hi] What is REST?"
+        )
+        self.assertEqual(fresh_backend.calls, [])
+        self.assertEqual(fresh_memory.stats()["shared_hits"], 1)
+
+    def test_backend_version_is_part_of_the_key(self):
+        """
+        Test that entries stored for another backend version are not reused.
+        """
+        TranslationEngine(CountingBackend(), memory=TranslationMemory("v1")).translate(
+            "Hello", "hi"
+        )
+        backend = CountingBackend()
+        memory = TranslationMemory("v2")
+        TranslationEngine(backend, memory=memory).translate("Hello", "hi")
+        self.assertEqual(backend.calls, [("Hello", "hi")])
+        self.assertEqual(memory.stats()["misses"], 1)
+
+
+@override_settings(FAQ_TASK_BROKER=IMMEDIATE_BROKER, FAQ_TRANSLATION=STUB_TRANSLATION)
 class FAQAPICreationAndDetailTest(APITestCase):
     def test_create_and_retrieve_faq(self):
         """
@@ -59,7 +259,8 @@ class FAQAPICreationAndDetailTest(APITestCase):
             "answer": "REST is an architectural style for web services.",
         }
         list_url = reverse("faq-list-api")
-        create_response = self.client.post(list_url, payload, format="json")
+        with self.captureOnCommitCallbacks(execute=True):
+            create_response = self.client.post(list_url, payload, format="json")
         self.assertEqual(create_response.status_code, 201)
 
         faq_id = create_response.data.get("id")
@@ -92,3 +293,1563 @@ class FAQAPICreationAndDetailTest(APITestCase):
         detail_url = reverse("faq-detail-api", kwargs={"pk": invalid_id})
         response = self.client.get(detail_url)
         self.assertEqual(response.status_code, 404)  # Should return a 404 error
+
+
+@override_settings(
+    FAQ_TASK_BROKER=IMMEDIATE_BROKER,
+    FAQ_TRANSLATION=STUB_TRANSLATION,
+    FAQ_CACHE_WARMING={"REFILL_PAGES": 0},  # Pages are built by the requests
+)
+class FAQListCacheTest(APITestCase):
+    def setUp(self):
+        invalidate_faq_caches()  # Start from a clean cache generation
+        FAQ.objects.bulk_create(
+            FAQ(question=f"Question {i}", answer=f"Answer {i}") for i in range(7)
+        )
+
+    def test_pages_are_cached_separately(self):
+        """
+        Test that each page gets its own cache entry instead of page 1 being
+        served for every ?page=.
+        """
+        list_url = reverse("faq-list-api")
+        first = self.client.get(list_url, {"page": 1})
+        second = self.client.get(list_url, {"page": 2})
+        second_cached = self.client.get(list_url, {"page": 2})
+        self.assertEqual(first.json()["current_page"], 1)
+        self.assertEqual(second.json()["current_page"], 2)
+        self.assertEqual(second_cached.json(), second.json())
+        self.assertNotEqual(first.json()["results"], second.json()["results"])
+
+    def test_write_invalidates_every_language(self):
+        """
+        Test that a write invalidates cached pages for all languages, not just
+        the language of the writing request.
+        """
+        list_url = reverse("faq-list-api")
+        self.assertEqual(self.client.get(list_url, {"lang": "hi"}).json()["count"], 7)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(list_url, {"question": "Q", "answer": "A"}, format="json")
+        self.assertEqual(self.client.get(list_url, {"lang": "hi"}).json()["count"], 8)
+
+    def test_page_size_is_bounded(self):
+        """
+        Test that ?page_size= is honoured but capped.
+        """
+        list_url = reverse("faq-list-api")
+        self.assertEqual(
+            len(self.client.get(list_url, {"page_size": 3}).json()["results"]), 3
+        )
+        with self.settings(FAQ_MAX_PAGE_SIZE=4):
+            response = self.client.get(list_url, {"page_size": 1000})
+        self.assertEqual(len(response.json()["results"]), 4)
+
+    @override_settings(FAQ_LIST_CACHE={"GZIP_MIN_BYTES": 100})
+    def test_hits_are_served_as_stored_bytes(self):
+        """
+        Test that a hit returns the rendered body (or its gzipped copy)
+        without a query, decoding or rendering, and matches the miss.
+        """
+        list_url = reverse("faq-list-api")
+        miss = self.client.get(list_url, {"lang": "hi"})
+        with self.assertNumQueries(0), mock.patch(
+            "faqs.views.JSONRenderer.render"
+        ) as render, mock.patch.object(RedisHandler, "_loads") as loads:
+            hit = self.client.get(list_url, {"lang": "hi"})
+            compressed = self.client.get(
+                list_url, {"lang": "hi"}, HTTP_ACCEPT_ENCODING="gzip, br"
+            )
+        render.assert_not_called()
+        loads.assert_not_called()
+        self.assertEqual(hit.content, miss.content)
+        self.assertEqual(hit["Content-Type"], "application/json")
+        self.assertEqual(hit.json()["count"], 7)
+        self.assertEqual(compressed["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(compressed.content), hit.content)
+        self.assertNotEqual(compressed["ETag"], hit["ETag"])
+
+        browsable = self.client.get(list_url, {"lang": "hi"}, HTTP_ACCEPT="text/html")
+        self.assertContains(browsable, "Question 6")
+        self.assertEqual(browsable["Content-Type"], "text/html; charset=utf-8")
+
+
+@override_settings(FAQ_TASK_BROKER=IMMEDIATE_BROKER, FAQ_TRANSLATION=STUB_TRANSLATION)
+class FAQLanguageSerializationTest(APITestCase):
+    def setUp(self):
+        invalidate_faq_caches()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.faq = FAQ.objects.create(
+                question="What is REST?", answer="An API style."
+            )
+
+    def test_list_returns_only_requested_language(self):
+        """
+        Test that ?lang= resolves question/answer and drops the other languages.
+        """
+        response = self.client.get(reverse("faq-list-api"), {"lang": "hi"})
+        item = response.json()["results"][0]
+        self.assertEqual(item["question"], "[hi] What is REST?")
+        self.assertEqual(item["translation_status"], "done")
+        self.assertNotIn("question_translated", item)
+        self.assertNotIn("translations", item)
+
+    def test_include_translations_opt_in(self):
+        """
+        Test that ?include=translations adds every supported language.
+        """
+        detail_url = reverse("faq-detail-api", kwargs={"pk": self.faq.pk})
+        response = self.client.get(detail_url, {"include": "translations"})
+        self.assertEqual(response.data["question"], "What is REST?")
+        self.assertEqual(
+            response.data["translations"]["bn"]["question"], "[bn] What is REST?"
+        )
+
+    def test_unsupported_language_falls_back_to_english(self):
+        """
+        Test that an unsupported ?lang= is served in English.
+        """
+        detail_url = reverse("faq-detail-api", kwargs={"pk": self.faq.pk})
+        response = self.client.get(detail_url, {"lang": "xx"})
+        self.assertEqual(response.data["lang"], "en")
+        self.assertEqual(response.data["question"], "What is REST?")
+
+
+@override_settings(FAQ_TASK_BROKER=IMMEDIATE_BROKER, FAQ_TRANSLATION=STUB_TRANSLATION)
+class FAQKeysetPaginationTest(APITestCase):
+    def setUp(self):
+        invalidate_faq_caches()
+        FAQ.objects.bulk_create(
+            FAQ(question=f"Question {i}", answer=f"Answer {i}") for i in range(7)
+        )
+
+    def test_cursor_walks_every_faq_once(self):
+        """
+        Test that following next_cursor visits every FAQ exactly once, newest first.
+        """
+        list_url = reverse("faq-list-api")
+        seen = []
+        cursor = ""
+        while cursor is not None:
+            response = self.client.get(list_url, {"cursor": cursor, "page_size": 3})
+            self.assertNotIn("count", response.json())
+            seen += [item["id"] for item in response.json()["results"]]
+            cursor = response.json()["next_cursor"]
+        expected = list(
+            FAQ.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+        self.assertEqual(seen, expected)
+
+    def test_count_is_opt_in(self):
+        """
+        Test that ?count=true adds the total count to a keyset page.
+        """
+        response = self.client.get(
+            reverse("faq-list-api"), {"cursor": "", "count": "true"}
+        )
+        self.assertEqual(response.json()["count"], 7)
+
+    def test_home_page_cursor_mode(self):
+        """
+        Test that the home page renders a keyset page with a Next link.
+        """
+        response = self.client.get(reverse("home"), {"cursor": "", "page_size": 3})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context["faqs"]), 3)
+        self.assertContains(response, f"?cursor={response.context['next_cursor']}")
+
+    def test_invalid_cursor(self):
+        """
+        Test that a malformed cursor is rejected with a 400.
+        """
+        response = self.client.get(reverse("faq-list-api"), {"cursor": "bogus"})
+        self.assertEqual(response.status_code, 400)
+
+
+class RedisHandlerTest(TestCase):
+    def test_handlers_share_one_pool(self):
+        """
+        Test that every handler uses the process-wide connection pool.
+        """
+        self.assertIs(
+            RedisHandler().client.connection_pool, RedisHandler().client.connection_pool
+        )
+
+    def test_batched_helpers(self):
+        """
+        Test that set_many/get_many/delete_many round-trip several keys at once.
+        """
+        handler = RedisHandler()
+        handler.set_many({"test:a": {"x": 1}, "test:b": [1, 2]}, timeout=60)
+        self.assertEqual(
+            handler.get_many(["test:a", "test:b", "test:missing"]),
+            {"test:a": {"x": 1}, "test:b": [1, 2]},
+        )
+        handler.delete_many(["test:a", "test:b"])
+        self.assertEqual(handler.get_many(["test:a", "test:b"]), {})
+
+
+class CacheCodecTest(TestCase):
+    payload = {
+        "count": 2,
+        "results": [{"id": i, "question": "क्या है? " * 50} for i in range(2)],
+    }
+
+    def test_large_values_are_compressed(self):
+        """
+        Test that values above the threshold are compressed and round-trip.
+        """
+        plain = CacheCodec()
+        compressed = CacheCodec(compression="zlib", compress_min_bytes=100)
+        self.assertLess(
+            len(compressed.encode(self.payload)), len(plain.encode(self.payload)) / 4
+        )
+        small = compressed.encode({"id": 1})
+        self.assertEqual(plain.encode({"id": 1}), small)
+        for data in (plain.encode(self.payload), compressed.encode(self.payload)):
+            # Either codec reads the other's values
+            self.assertEqual(plain.decode(data), self.payload)
+            self.assertEqual(compressed.decode(data), self.payload)
+
+    @override_settings(FAQ_CACHE_CODEC={"COMPRESSION": "zlib"})
+    def test_handler_reads_legacy_and_unknown_values(self):
+        """
+        Test that plain JSON entries stay readable and unknown formats miss.
+        """
+        handler = RedisHandler()
+        sizes = metrics.CACHE_PAYLOAD_BYTES.count("json+zlib")
+        decodes = metrics.CACHE_DECODE_DURATION.count("json+zlib")
+        handler.set_cache("test:codec", self.payload, timeout=60)
+        self.assertEqual(handler.get_cache("test:codec"), self.payload)
+        self.assertEqual(metrics.CACHE_PAYLOAD_BYTES.count("json+zlib"), sizes + 1)
+        self.assertEqual(metrics.CACHE_DECODE_DURATION.count("json+zlib"), decodes + 1)
+
+        handler.client.setex("test:codec", 60, json.dumps(self.payload))
+        self.assertEqual(handler.get_cache("test:codec"), self.payload)
+
+        handler.client.setex("test:codec", 60, b"FQ\x09\x01\x00{}")
+        self.assertIsNone(handler.get_cache("test:codec"))
+        with self.assertRaises(UndecodableValue):
+            CacheCodec().decode(b"FQ\x01\x01\x01not zlib")
+        handler.delete_many(["test:codec"])
+
+
+class CircuitBreakerTest(TestCase):
+    def test_opens_after_threshold_and_recovers(self):
+        """
+        Test that the breaker opens after repeated failures, short-circuits
+        during the cool-down and closes again after a successful trial call.
+        """
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+        breaker.record_failure()
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertFalse(breaker.allow())
+        self.assertEqual(breaker.stats()["state"], CircuitBreaker.OPEN)
+
+        sleep(0.06)
+        self.assertTrue(breaker.allow())  # half-open trial call
+        self.assertFalse(breaker.allow())
+        breaker.record_success()
+        self.assertEqual(breaker.stats()["state"], CircuitBreaker.CLOSED)
+        self.assertEqual(breaker.stats()["trips"], 1)
+
+
+@override_settings(FAQ_TASK_BROKER=IMMEDIATE_BROKER, FAQ_TRANSLATION=STUB_TRANSLATION)
+class RedisOutageTest(APITestCase):
+    def setUp(self):
+        invalidate_faq_caches()
+        self.broken = mock.patch.multiple(
+            redis_handler,
+            client=redis.Redis(host="127.0.0.1", port=1, socket_connect_timeout=0.1),
+            breaker=CircuitBreaker(failure_threshold=1, reset_timeout=60),
+        )
+
+    def test_reads_and_writes_fall_back_to_the_database(self):
+        """
+        Test that the API keeps serving (uncached) while Redis is down.
+        """
+        FAQ.objects.create(question="What is REST?", answer="An API style.")
+        list_url = reverse("faq-list-api")
+        with self.broken:
+            response = self.client.get(list_url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()["count"], 1)
+            with self.captureOnCommitCallbacks(execute=True):
+                create = self.client.post(
+                    list_url, {"question": "Q", "answer": "A"}, format="json"
+                )
+            self.assertEqual(create.status_code, 201)
+            self.assertEqual(self.client.get(list_url).json()["count"], 2)
+            self.assertEqual(redis_handler.breaker.stats()["state"], "open")
+
+    def test_missed_invalidation_is_replayed(self):
+        """
+        Test that an invalidation lost during an outage is applied once Redis
+        is reachable again.
+        """
+        generation = list_generation()
+        with self.broken:
+            invalidate_faq_caches()
+        self.assertEqual(list_generation(), generation + 1)
+
+
+@override_settings(FAQ_TASK_BROKER=IMMEDIATE_BROKER, FAQ_TRANSLATION=STUB_TRANSLATION)
+class FAQDetailCacheTest(APITestCase):
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.faq = FAQ.objects.create(
+                question="What is REST?", answer="An API style."
+            )
+        self.detail_url = reverse("faq-detail-api", kwargs={"pk": self.faq.pk})
+
+    def test_detail_is_served_from_cache(self):
+        """
+        Test that a repeated detail read is served without a DB query and
+        matches the serialized representation.
+        """
+        first = self.client.get(self.detail_url, {"lang": "hi"})
+        with self.assertNumQueries(0):
+            second = self.client.get(self.detail_url, {"lang": "hi"})
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(second.data["question"], "[hi] What is REST?")
+
+    def test_update_invalidates_every_language(self):
+        """
+        Test that updating an FAQ drops its cached detail entries.
+        """
+        self.client.get(self.detail_url, {"lang": "bn"})
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                self.detail_url, {"question": "What is HTTP?"}, format="json"
+            )
+        self.assertEqual(
+            self.client.get(self.detail_url).data["question"], "What is HTTP?"
+        )
+
+    def test_rebuild_racing_a_write_is_not_stored(self):
+        """
+        Test that an entry loaded before a write's invalidation is served to
+        its caller but not cached.
+        """
+        key = "test:race"
+        redis_handler.delete_many([key, f"lock:{key}"])
+
+        def loader():
+            invalidate_faq_caches()  # A write commits while the row is loaded
+            return {"id": 1, "question": "Old?"}
+
+        self.assertEqual(read_through(key, loader)["question"], "Old?")
+        self.assertIsNone(redis_handler.get_cache(key))
+        read_through(key, lambda: {"id": 1, "question": "New?"})
+        self.assertEqual(redis_handler.get_cache(key)["value"]["question"], "New?")
+
+    def test_expired_lock_is_not_released_by_its_former_holder(self):
+        """
+        Test that a slow rebuilder whose lock expired leaves the lock taken
+        by the next caller in place.
+        """
+        redis_handler.delete_many(["lock:test:slow"])
+        slow = acquire_lock("test:slow", lock_timeout=0.05)
+        sleep(0.1)
+        fast = acquire_lock("test:slow", lock_timeout=5)
+        self.assertIsNotNone(fast)
+        release_lock("test:slow", slow)
+        self.assertIsNone(acquire_lock("test:slow", lock_timeout=5))
+        release_lock("test:slow", fast)
+        self.assertIsNotNone(acquire_lock("test:slow", lock_timeout=5))
+        redis_handler.delete_many(["lock:test:slow"])
+
+    def test_concurrent_misses_load_once(self):
+        """
+        Test that a burst of concurrent reads of a missing key runs the loader once.
+        """
+        key = "test:stampede"
+        redis_handler.delete_many([key, f"lock:{key}"])
+        calls = []
+
+        def loader():
+            calls.append(1)
+            sleep(0.2)
+            return {"id": 1}
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(read_through(key, loader)))
+            for _ in range(10)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"id": 1}] * 10)
+
+
+@override_settings(FAQ_TASK_BROKER=IMMEDIATE_BROKER, FAQ_TRANSLATION=STUB_TRANSLATION)
+class FAQCSVImportTest(TestCase):
+    CSV = (
+        "question,answer\n"
+        '"What is Django?","A web framework."\n'
+        '"","Missing question"\n'
+        '"What is Python?","A programming language."\n'
+        '"What is REST?","An API style."\n'
+    )
+
+    def test_import_in_batches_and_translate(self):
+        """
+        Test that valid rows are bulk inserted in batches, invalid rows are
+        reported on the job and translation completes the job.
+        """
+        job = ImportJob.objects.create(filename="faqs.csv")
+        with self.captureOnCommitCallbacks(execute=True):
+            import_faqs_csv(job, io.BytesIO(self.CSV.encode()), batch_size=2)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImportJob.STATUS_DONE)
+        self.assertEqual((job.total_rows, job.imported_rows), (4, 3))
+        self.assertEqual(job.translated_rows, 3)
+        self.assertEqual(job.errors[0]["row"], 3)
+        faq = FAQ.objects.get(question="What is Python?")
+        self.assertEqual(faq.get_translated_question("hi"), "[hi] What is Python?")
+
+    def test_missing_columns(self):
+        """
+        Test that a CSV without the required columns fails the job.
+        """
+        job = ImportJob.objects.create(filename="bad.csv")
+        with self.assertRaises(ImportFormatError):
+            import_faqs_csv(job, io.BytesIO(b"title,body\nA,B\n"))
+        self.assertEqual(job.status, ImportJob.STATUS_FAILED)
+        self.assertFalse(FAQ.objects.exists())
+
+    def test_admin_upload_redirects_to_job(self):
+        """
+        Test that the admin upload streams the rows in, recording progress per
+        batch, and leaves only translation to the background.
+        """
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        admin_user = User.objects.create_superuser("admin", "admin@example.com", "pw")
+        self.client.force_login(admin_user)
+        upload = SimpleUploadedFile("faqs.csv", self.CSV.encode(), "text/csv")
+        progress = []
+        save = ImportJob.save
+
+        def record_progress(instance, *args, **kwargs):
+            progress.append(instance.imported_rows)
+            return save(instance, *args, **kwargs)
+
+        with self.settings(MEDIA_ROOT=media_root, FAQ_IMPORT_BATCH_SIZE=2):
+            with mock.patch.object(ImportJob, "save", record_progress):
+                with self.captureOnCommitCallbacks(execute=True):
+                    response = self.client.post(
+                        reverse("admin:upload_csv"), {"csv_file": upload}
+                    )
+                    # Inserted by the request; translation is still queued
+                    self.assertEqual(FAQ.objects.count(), 3)
+                    self.assertFalse(FAQTranslation.objects.exists())
+        job = ImportJob.objects.get()
+        self.assertRedirects(
+            response, reverse("admin:import_job_status", args=[job.pk])
+        )
+        self.assertEqual(progress[1:3], [2, 3])
+        status_response = self.client.get(
+            reverse("admin:import_job_status", args=[job.pk]), {"format": "json"}
+        )
+        self.assertEqual(status_response.json()["imported_rows"], 3)
+        self.assertTrue(status_response.json()["finished"])
+        # No copy of the upload is kept
+        self.assertEqual(os.listdir(media_root), [])
+
+    def test_admin_upload_rejects_missing_columns(self):
+        """
+        Test that an upload without the required columns fails its job
+        without inserting or queueing anything.
+        """
+        admin_user = User.objects.create_superuser("admin", "admin@example.com", "pw")
+        self.client.force_login(admin_user)
+        upload = SimpleUploadedFile("faqs.csv", b"title,body\nx,y\n", "text/csv")
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.client.post(reverse("admin:upload_csv"), {"csv_file": upload})
+        self.assertEqual(ImportJob.objects.get().status, ImportJob.STATUS_FAILED)
+        self.assertFalse(FAQ.objects.exists())
+        self.assertEqual(callbacks, [])
+
+    def test_unexpected_error_fails_the_job(self):
+        """
+        Test that an import interrupted by an unexpected error does not leave
+        its job importing forever.
+        """
+        job = ImportJob.objects.create(filename="faqs.csv")
+        with mock.patch(
+            "faqs.importer.index_faqs", side_effect=RuntimeError("index down")
+        ):
+            with self.assertRaises(RuntimeError):
+                import_faqs_csv(job, io.BytesIO(self.CSV.encode()))
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImportJob.STATUS_FAILED)
+        self.assertTrue(job.is_finished)
+
+
+@override_settings(
+    FAQ_TASK_BROKER=IMMEDIATE_BROKER,
+    FAQ_TRANSLATION=STUB_TRANSLATION,
+    FAQ_EXPORT_CHUNK_SIZE=2,
+)
+class FAQExportTest(APITestCase):
+    def setUp(self):
+        invalidate_faq_caches()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.faqs = [
+                FAQ.objects.create(question=f"Question {i}?", answer=f"Answer {i}.")
+                for i in range(5)
+            ]
+        self.client.force_login(
+            User.objects.create_superuser("admin", "admin@example.com", "pw")
+        )
+
+    def export(self, extension, params=None):
+        url = reverse("faq-export-api", kwargs={"extension": extension})
+        response = self.client.get(url, params or {})
+        self.assertTrue(response.streaming)
+        return response, b"".join(response.streaming_content)
+
+    def test_csv_streams_every_language_in_chunks(self):
+        """
+        Test that the CSV export has one row per FAQ and language and reads
+        the table in chunks (one query plus one prefetch per chunk).
+        """
+        # Session and user, then the FAQs and a prefetch for each of 3 chunks
+        with self.assertNumQueries(2 + 1 + 3):
+            response, content = self.export("csv")
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        rows = list(csv.DictReader(io.StringIO(content.decode())))
+        self.assertEqual(len(rows), 5 * 3)
+        self.assertEqual(
+            [(row["id"], row["lang"]) for row in rows[:3]],
+            [(str(self.faqs[0].pk), lang) for lang in ("en", "hi", "bn")],
+        )
+        self.assertEqual(rows[1]["question"], "[hi] Question 0?")
+        self.assertEqual(rows[1]["status"], "done")
+
+    def test_filters_and_gzipped_ndjson(self):
+        """
+        Test the language and updated_since filters on a gzipped NDJSON export.
+        """
+        old = timezone.now() - timedelta(days=30)
+        FAQ.objects.exclude(pk=self.faqs[0].pk).update(updated_at=old)
+        FAQTranslation.objects.update(updated_at=old)
+        since = (timezone.now() - timedelta(days=1)).isoformat()
+
+        response, content = self.export(
+            "ndjson.gz", {"lang": "hi", "updated_since": since}
+        )
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        rows = [json.loads(line) for line in gzip.decompress(content).splitlines()]
+        self.assertEqual(
+            [(row["id"], row["lang"]) for row in rows], [(self.faqs[0].pk, "hi")]
+        )
+
+        # A translation landing also counts as an update
+        FAQTranslation.objects.filter(faq=self.faqs[1], lang="bn").update(
+            updated_at=timezone.now()
+        )
+        _, content = self.export("ndjson", {"lang": "hi,bn", "updated_since": since})
+        self.assertEqual(len(content.splitlines()), 4)
+
+    def test_invalid_options_and_permissions(self):
+        """
+        Test that bad options are rejected, the admin offers the export and
+        only staff can use it.
+        """
+        url = reverse("faq-export-api", kwargs={"extension": "csv"})
+        self.assertEqual(self.client.get(url, {"lang": "xx"}).status_code, 400)
+        self.assertEqual(
+            self.client.get(url, {"updated_since": "yesterday"}).status_code, 400
+        )
+        self.assertEqual(
+            self.client.get(
+                reverse("faq-export-api", kwargs={"extension": "xml"})
+            ).status_code,
+            400,
+        )
+        admin_export = self.client.get(reverse("admin:export_faqs", args=["csv"]))
+        self.assertEqual(len(b"".join(admin_export.streaming_content).splitlines()), 16)
+
+        self.client.logout()
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+
+@override_settings(FAQ_TASK_BROKER=IMMEDIATE_BROKER, FAQ_TRANSLATION=STUB_TRANSLATION)
+class FAQChangeFeedTest(APITestCase):
+    def setUp(self):
+        invalidate_faq_caches()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.faqs = [
+                FAQ.objects.create(question=f"Question {i}?", answer=f"Answer {i}.")
+                for i in range(3)
+            ]
+            self.faqs.pop().delete()  # Deleted before the first sync
+
+    def changes(self, since=None, **params):
+        if since is not None:
+            params["since"] = since
+        response = self.client.get(reverse("faq-changes-api"), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def summary(self, data):
+        return [(change["change"], change["id"]) for change in data["changes"]]
+
+    def test_full_sync_then_incremental_sync(self):
+        """
+        Test that a full sync pages through every FAQ and that the next sync
+        returns only the edits, landed translations and deletions since.
+        """
+        first = self.changes(limit=1, lang="hi")
+        self.assertTrue(first["has_more"])
+        second = self.changes(first["next_cursor"], limit=1, lang="hi")
+        self.assertFalse(second["has_more"])
+        # The FAQ deleted before the sync is not mentioned
+        self.assertEqual(
+            self.summary(first) + self.summary(second),
+            [("upsert", self.faqs[0].pk), ("upsert", self.faqs[1].pk)],
+        )
+        self.assertEqual(first["changes"][0]["faq"]["question"], "[hi] Question 0?")
+        self.assertEqual(self.changes(second["next_cursor"])["changes"], [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.faqs[0].question = "Edited?"
+            self.faqs[0].save()
+        deleted_id = self.faqs[1].pk
+        with self.captureOnCommitCallbacks(execute=True):
+            self.faqs[1].delete()
+
+        data = self.changes(second["next_cursor"], lang="hi")
+        self.assertEqual(
+            self.summary(data), [("upsert", self.faqs[0].pk), ("delete", deleted_id)]
+        )
+        self.assertEqual(data["changes"][0]["faq"]["question"], "[hi] Edited?")
+        self.assertFalse(data["has_more"])
+
+        # A re-translation alone brings the FAQ back into the feed
+        translate_faqs([self.faqs[0].pk], force=True)
+        data = self.changes(data["next_cursor"])
+        self.assertEqual(self.summary(data), [("upsert", self.faqs[0].pk)])
+
+    def test_changes_committed_between_reads_are_not_skipped(self):
+        """
+        Test that an edit and a deletion committed between the FAQ and the
+        tombstone reads are both left for the next sync.
+        """
+        cursor = self.changes()["next_cursor"]
+        deleted_id = self.faqs[1].pk
+        interleaved = []
+
+        def write_before_tombstone_read(execute, sql, params, many, context):
+            if "faqs_faqtombstone" in sql and sql.startswith("SELECT"):
+                if not interleaved:
+                    interleaved.append(sql)
+                    self.faqs[0].question = "Edited?"
+                    self.faqs[0].save(translate=False)
+                    self.faqs[1].delete()
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(write_before_tombstone_read):
+            data = self.changes(cursor)
+        self.assertTrue(interleaved)
+        self.assertEqual(data["changes"], [])
+        self.assertEqual(
+            self.summary(self.changes(data["next_cursor"])),
+            [("upsert", self.faqs[0].pk), ("delete", deleted_id)],
+        )
+
+    def test_bulk_writes_and_imports_are_in_the_feed(self):
+        """
+        Test that set-based writes move their FAQs forward and leave tombstones.
+        """
+        cursor = self.changes()["next_cursor"]
+        self.client.force_login(
+            User.objects.create_superuser("admin", "admin@example.com", "pw")
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("faq-bulk-api"),
+                {
+                    "create": [{"question": "New?", "answer": "New."}],
+                    "delete": [self.faqs[0].pk],
+                },
+                format="json",
+            )
+        self.assertEqual(response.status_code, 200)
+        created_id = response.json()["results"]["create"][0]["id"]
+        job = ImportJob.objects.create(filename="faqs.csv")
+        with self.captureOnCommitCallbacks(execute=True):
+            import_faqs_csv(job, io.BytesIO(b"question,answer\nImported?,Imported.\n"))
+        imported_id = FAQ.objects.get(question="Imported?").pk
+
+        self.assertEqual(
+            sorted(self.summary(self.changes(cursor))),
+            [
+                ("delete", self.faqs[0].pk),
+                ("upsert", created_id),
+                ("upsert", imported_id),
+            ],
+        )
+
+    def test_expired_and_invalid_cursors(self):
+        """
+        Test that a cursor older than the purged tombstones gets 410 Gone and
+        a malformed one 400.
+        """
+        cursor = self.changes()["next_cursor"]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.faqs[0].delete()
+        FAQTombstone.objects.update(deleted_at=timezone.now() - timedelta(days=31))
+        call_command("purge_faq_tombstones", stdout=io.StringIO())
+        self.assertFalse(FAQTombstone.objects.exists())
+
+        response = self.client.get(reverse("faq-changes-api"), {"since": cursor})
+        self.assertEqual(response.status_code, 410)
+        self.assertEqual(response.json()["status"], "fail")
+        # Starting over works, and so does the cursor it hands out
+        fresh = self.changes()
+        self.assertEqual(self.summary(fresh), [("upsert", self.faqs[1].pk)])
+        self.assertEqual(self.changes(fresh["next_cursor"])["changes"], [])
+
+        response = self.client.get(reverse("faq-changes-api"), {"since": "bogus"})
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(FAQ_TASK_BROKER=IMMEDIATE_BROKER, FAQ_TRANSLATION=STUB_TRANSLATION)
+class FAQSearchTest(APITestCase):
+    def setUp(self):
+        invalidate_faq_caches()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.rest = FAQ.objects.create(
+                question="What is REST?",
+                answer="<p>REST is an architectural style.</p>",
+            )
+            self.django = FAQ.objects.create(
+                question="What is Django?", answer="A web framework that speaks REST."
+            )
+
+    def test_search_is_ranked_and_language_aware(self):
+        """
+        Test that ?q= ranks question matches first and searches the translation
+        of the requested language.
+        """
+        response = self.client.get(reverse("faq-list-api"), {"q": "rest"})
+        self.assertEqual(
+            [item["id"] for item in response.json()["results"]],
+            [self.rest.pk, self.django.pk],
+        )
+        self.assertEqual(response.json()["count"], 2)
+
+        response = self.client.get(
+            reverse("faq-list-api"), {"q": "[hi] django", "lang": "hi"}
+        )
+        self.assertEqual(
+            [item["id"] for item in response.json()["results"]], [self.django.pk]
+        )
+
+    def test_index_follows_updates_and_deletes(self):
+        """
+        Test that the index is maintained on update and delete.
+        """
+        backend = get_search_backend()
+        self.django.question = "What is Flask?"
+        self.django.save()
+        self.assertEqual(backend.search("django", "en"), [])
+        self.assertEqual(backend.search("flask", "en"), [self.django.pk])
+        self.rest.delete()
+        self.assertEqual(backend.search("architectural"), [])
+
+    def test_fts_rows_are_keyed_by_faq_and_language(self):
+        """
+        Test that FTS5 rows sit at rowids derived from the FAQ and language,
+        including rows rekeyed from an index built before that layout.
+        """
+        if not isinstance(get_search_backend(), SQLiteFTS5Backend):
+            self.skipTest("SQLite FTS5 only")
+
+        def rowids():
+            with connection.cursor() as cursor:
+                cursor.execute(f"SELECT rowid, lang FROM {FTS_TABLE} ORDER BY rowid")
+                return cursor.fetchall()
+
+        expected = [
+            (SQLiteFTS5Backend.rowid(faq.pk, lang), lang)
+            for faq in (self.rest, self.django)
+            for lang in ("en", "hi", "bn")
+        ]
+        self.assertEqual(rowids(), expected)
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"UPDATE {FTS_TABLE} SET rowid = rowid + 7")
+        migration = import_module("faqs.migrations.0011_faq_fts_rowids")
+        # Outside "with": SQLite refuses it inside the test transaction
+        migration.rekey_search_index(apps, connection.schema_editor())
+        self.assertEqual(rowids(), expected)
+        self.assertEqual(get_search_backend().search("framework"), [self.django.pk])
+
+    def test_admin_search_uses_the_index(self):
+        """
+        Test that the admin changelist search goes through the index.
+        """
+        admin_user = User.objects.create_superuser("admin", "admin@example.com", "pw")
+        self.client.force_login(admin_user)
+        response = self.client.get(
+            reverse("admin:faqs_faq_changelist"), {"q": "framework"}
+        )
+        self.assertEqual(list(response.context["cl"].result_list), [self.django])
+
+
+@override_settings(FAQ_TASK_BROKER=IMMEDIATE_BROKER, FAQ_TRANSLATION=STUB_TRANSLATION)
+class FAQConditionalGetTest(APITestCase):
+    def setUp(self):
+        invalidate_faq_caches()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.faq = FAQ.objects.create(
+                question="What is REST?", answer="An API style."
+            )
+        self.detail_url = reverse("faq-detail-api", kwargs={"pk": self.faq.pk})
+
+    def test_unchanged_content_is_not_modified(self):
+        """
+        Test that a matching If-None-Match is answered with 304 without
+        touching the database, on the list, detail and home page.
+        """
+        for url in (reverse("faq-list-api"), self.detail_url, reverse("home")):
+            response = self.client.get(url, {"lang": "hi"})
+            self.assertEqual(response.status_code, 200)
+            self.assertIn("Last-Modified", response)
+            self.assertIn("must-revalidate", response["Cache-Control"])
+            with self.assertNumQueries(0):
+                revalidated = self.client.get(
+                    url, {"lang": "hi"}, HTTP_IF_NONE_MATCH=response["ETag"]
+                )
+            self.assertEqual(revalidated.status_code, 304)
+            self.assertEqual(revalidated["ETag"], response["ETag"])
+
+    def test_etag_depends_on_language_and_content(self):
+        """
+        Test that each language has its own ETag and that a write changes it.
+        """
+        english = self.client.get(self.detail_url)["ETag"]
+        hindi = self.client.get(self.detail_url, {"lang": "hi"})["ETag"]
+        self.assertNotEqual(english, hindi)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                self.detail_url, {"question": "What is HTTP?"}, format="json"
+            )
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=english)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], english)
+
+    def test_missing_faq_has_no_validators(self):
+        response = self.client.get(reverse("faq-detail-api", kwargs={"pk": 999999}))
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn("ETag", response)
+
+
+@override_settings(FAQ_TASK_BROKER=IMMEDIATE_BROKER, FAQ_TRANSLATION=STUB_TRANSLATION)
+class FAQBulkWriteTest(APITestCase):
+    def setUp(self):
+        invalidate_faq_caches()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.existing = [
+                FAQ.objects.create(question=f"Question {i}?", answer=f"Answer {i}.")
+                for i in range(3)
+            ]
+        self.url = reverse("faq-bulk-api")
+
+    def test_batch_is_applied_in_one_request(self):
+        """
+        Test that creates, updates and deletes are applied together, the new
+        FAQs are translated and every change is visible in the API.
+        """
+        payload = {
+            "create": [
+                {"question": "What is gRPC?", "answer": "An RPC framework."},
+                {"question": "What is SOAP?", "answer": "An XML protocol."},
+            ],
+            "update": [{"id": self.existing[0].pk, "question": "Renamed?"}],
+            "delete": [self.existing[1].pk],
+        }
+        self.client.get(reverse("faq-list-api"))  # Warm the list cache
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, 200)
+        # One translation task and one invalidation for the whole batch
+        self.assertEqual(len(callbacks), 2)
+
+        results = response.data["results"]
+        self.assertEqual([item["index"] for item in results["create"]], [0, 1])
+        created = FAQ.objects.get(pk=results["create"][0]["id"])
+        self.assertEqual(created.get_translated_question("hi"), "[hi] What is gRPC?")
+        self.assertEqual(FAQ.objects.get(pk=self.existing[0].pk).question, "Renamed?")
+        self.assertFalse(FAQ.objects.filter(pk=self.existing[1].pk).exists())
+
+        listed = self.client.get(reverse("faq-list-api"), {"page_size": 50})
+        self.assertEqual(listed.json()["count"], 4)
+        self.assertEqual(get_search_backend().search("Renamed"), [self.existing[0].pk])
+
+    def test_invalid_item_rejects_the_whole_batch(self):
+        """
+        Test that one bad item reports per-item errors and writes nothing.
+        """
+        payload = {
+            "create": [{"question": "Valid?", "answer": "Yes."}, {"question": ""}],
+            "delete": [self.existing[2].pk, 999999],
+        }
+        response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([e["index"] for e in response.data["errors"]["create"]], [1])
+        self.assertEqual(FAQ.objects.count(), 3)
+
+        response = self.client.post(
+            self.url, {"delete": [self.existing[2].pk, 999999]}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([e["index"] for e in response.data["errors"]["delete"]], [1])
+        self.assertTrue(FAQ.objects.filter(pk=self.existing[2].pk).exists())
+
+
+@override_settings(FAQ_TASK_BROKER=IMMEDIATE_BROKER, FAQ_TRANSLATION=STUB_TRANSLATION)
+class FAQAsyncViewTest(TestCase):
+    def setUp(self):
+        invalidate_faq_caches()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.faq = FAQ.objects.create(
+                question="What is REST?", answer="An API style."
+            )
+
+    async def test_async_views_match_sync_views(self):
+        """
+        Test that the async list and detail endpoints return the sync payloads.
+        """
+        for sync_name, async_name, kwargs in (
+            ("faq-list-api", "faq-list-async", {}),
+            ("faq-detail-api", "faq-detail-async", {"pk": self.faq.pk}),
+        ):
+            for params in ({"lang": "hi"}, {"include": "translations"}):
+                expected = await self.async_client.get(
+                    reverse(sync_name, kwargs=kwargs), params
+                )
+                response = await self.async_client.get(
+                    reverse(async_name, kwargs=kwargs), params
+                )
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json(), expected.json())
+
+        response = await self.async_client.get(reverse("home-async"), {"lang": "hi"})
+        self.assertContains(response, "[hi] What is REST?")
+
+    def test_async_cache_hit_needs_no_database(self):
+        """
+        Test that a cached async read and a 304 revalidation skip the database.
+        """
+        url = reverse("faq-list-async")
+        get = async_to_sync(self.async_client.get)
+        first = get(url, {"lang": "bn"})
+        with self.assertNumQueries(0):
+            second = get(url, {"lang": "bn"})
+            revalidated = get(
+                url, {"lang": "bn"}, headers={"If-None-Match": first["ETag"]}
+            )
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(revalidated.status_code, 304)
+
+
+@override_settings(FAQ_TASK_BROKER=IMMEDIATE_BROKER, FAQ_TRANSLATION=STUB_TRANSLATION)
+class BenchmarkTest(TestCase):
+    def test_percentiles_and_baseline_comparison(self):
+        """
+        Test nearest-rank percentiles and regression detection.
+        """
+        samples = [i / 1000 for i in range(1, 101)]
+        result = summarize("list", samples, sum(samples))
+        self.assertEqual(
+            (result["p50_ms"], result["p95_ms"], result["p99_ms"]), (50, 95, 99)
+        )
+
+        slower = dict(result, p95_ms=result["p95_ms"] * 1.5)
+        self.assertEqual(compare([result], [result]), [])
+        self.assertEqual(len(compare([slower], [result], tolerance=0.2)), 1)
+        self.assertEqual(compare([slower], [result], tolerance=0.6), [])
+
+    def test_scenarios_run_on_a_seeded_corpus(self):
+        """
+        Test that the corpus is seeded with translations and that scenarios run.
+        """
+        invalidate_faq_caches()
+        seed_corpus(30, benchmark_languages(3))
+        self.assertEqual(FAQ.objects.count(), 30)
+        self.assertEqual(FAQTranslation.objects.count(), 90)
+        self.assertTrue(get_search_backend().search("faq", lang="hi"))
+
+        results = run_scenarios(
+            ["list_cache_hit", "list_deep_page_cursor", "detail_cache_miss"],
+            iterations=3,
+            page_size=5,
+        )
+        self.assertEqual([r["iterations"] for r in results], [3, 3, 3])
+
+
+@override_settings(
+    FAQ_TASK_BROKER=IMMEDIATE_BROKER,
+    FAQ_TRANSLATION=STUB_TRANSLATION,
+    FAQ_CACHE_WARMING={"REFILL_PAGES": 0},  # Pages are built by the requests
+    FAQ_METRICS_TOKEN="scrape-token",
+)
+class MetricsTest(APITestCase):
+    def setUp(self):
+        invalidate_faq_caches()
+        with self.captureOnCommitCallbacks(execute=True):
+            FAQ.objects.create(question="What is REST?", answer="An API style.")
+
+    def scrape(self):
+        return self.client.get(
+            reverse("metrics"), HTTP_AUTHORIZATION="Bearer scrape-token"
+        )
+
+    def test_metrics_require_staff_or_the_scrape_token(self):
+        """
+        Test that anonymous requests, wrong tokens and non-staff users are
+        refused, while the token or a staff session is let in.
+        """
+        url = reverse("metrics")
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 401)
+        self.assertNotIn("faq_", response.content.decode())
+        response = self.client.get(url, HTTP_AUTHORIZATION="Bearer wrong")
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(self.scrape().status_code, 200)
+
+        user = User.objects.create_user("reader", "reader@example.com", "pw")
+        self.client.force_login(user)
+        self.assertEqual(self.client.get(url).status_code, 401)
+        user.is_staff = True
+        user.save()
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        with self.settings(FAQ_METRICS_TOKEN=None):
+            self.client.logout()
+            response = self.client.get(url, HTTP_AUTHORIZATION="Bearer ")
+            self.assertEqual(response.status_code, 401)
+
+    def test_requests_and_cache_lookups_are_recorded(self):
+        """
+        Test that list requests record latency, DB queries and list cache
+        hits/misses, and that /metrics renders them.
+        """
+        hits = metrics.CACHE_REQUESTS.value("faqs:list", "hit")
+        misses = metrics.CACHE_REQUESTS.value("faqs:list", "miss")
+        requests = metrics.REQUEST_DURATION.count("faq-list-api", "GET", 200)
+        queries = metrics.DB_QUERIES.count("faq-list-api")
+
+        self.client.get(reverse("faq-list-api"))
+        self.client.get(reverse("faq-list-api"))
+
+        self.assertEqual(metrics.CACHE_REQUESTS.value("faqs:list", "miss"), misses + 1)
+        self.assertEqual(metrics.CACHE_REQUESTS.value("faqs:list", "hit"), hits + 1)
+        self.assertEqual(
+            metrics.REQUEST_DURATION.count("faq-list-api", "GET", 200), requests + 2
+        )
+        self.assertEqual(metrics.DB_QUERIES.count("faq-list-api"), queries + 2)
+
+        response = self.scrape()
+        self.assertEqual(response["Content-Type"], "text/plain; version=0.0.4")
+        body = response.content.decode()
+        self.assertIn('faq_cache_requests_total{family="faqs:list",result="hit"}', body)
+        self.assertIn(
+            'faq_http_request_duration_seconds_bucket{view="faq-list-api",'
+            'method="GET",status="200",le="+Inf"}',
+            body,
+        )
+
+    def test_cache_errors_and_translator_failures_are_recorded(self):
+        errors = metrics.CACHE_REQUESTS.value("faq", "error")
+        handler = RedisHandler(
+            client=redis.Redis(host="127.0.0.1", port=1, socket_connect_timeout=0.1),
+            breaker=CircuitBreaker(failure_threshold=1, reset_timeout=60),
+        )
+        handler.get_cache("faq:1:en:one")
+        handler.get_cache("faq:1:en:one")  # Short-circuited by the open breaker
+        self.assertEqual(metrics.CACHE_REQUESTS.value("faq", "error"), errors + 2)
+
+        failures = metrics.TRANSLATION_FAILURES.value("bn", "error")
+        calls = metrics.TRANSLATION_DURATION.count("hi")
+        engine = TranslationEngine(CountingBackend(fail_langs=("bn",)))
+        engine.translate_batch([("Hello", "hi"), ("Hello", "bn")])
+        self.assertEqual(
+            metrics.TRANSLATION_FAILURES.value("bn", "error"), failures + 1
+        )
+        self.assertEqual(metrics.TRANSLATION_DURATION.count("hi"), calls + 1)
+
+    def test_breaker_state_and_trips_are_exposed(self):
+        """
+        Test that /metrics reports the shared circuit breaker's state and
+        counts its trips.
+        """
+        breaker = redis_handler.breaker
+        self.addCleanup(breaker.record_success)
+        trips = metrics.REDIS_BREAKER_TRIPS.value()
+        body = self.scrape().content.decode()
+        self.assertIn('faq_redis_breaker_state{state="closed"} 1', body)
+
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+        body = self.scrape().content.decode()
+        self.assertIn('faq_redis_breaker_state{state="open"} 1', body)
+        self.assertIn('faq_redis_breaker_state{state="closed"} 0', body)
+        self.assertIn(f"faq_redis_breaker_trips_total {trips + 1}", body)
+
+
+@override_settings(FAQ_TASK_BROKER=IMMEDIATE_BROKER, FAQ_TRANSLATION=STUB_TRANSLATION)
+class FAQHomePageCacheTest(TestCase):
+    def setUp(self):
+        invalidate_faq_caches()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.faq = FAQ.objects.create(
+                question="What is REST?", answer="An API style."
+            )
+
+    @override_settings(FAQ_CACHE_WARMING={"REFILL_PAGES": 0})
+    def test_rendered_page_is_cached_until_a_write(self):
+        """
+        Test that a rendered page is served from Redis without touching the
+        database, with caching headers, and that a write replaces it.
+        """
+        url = reverse("home")
+        first = self.client.get(url)
+        self.assertContains(first, "What is REST?")
+        with self.assertNumQueries(0):
+            second = self.client.get(url)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second["ETag"], first["ETag"])
+        self.assertIn("must-revalidate", second["Cache-Control"])
+
+        async_hit = async_to_sync(self.async_client.get)
+        with self.assertNumQueries(0):
+            response = async_hit(reverse("home-async"))
+        self.assertEqual(response.content, first.content)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.faq.question = "What is HTTP?"
+            self.faq.save()
+        self.assertContains(self.client.get(url), "What is HTTP?")
+
+    @override_settings(FAQ_CACHE_WARMING={"REFILL_PAGES": 1})
+    def test_first_page_is_rendered_again_after_a_write(self):
+        """
+        Test that the first page is rendered again right after a write, so the
+        next visitor gets a cache hit.
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            FAQ.objects.create(question="What is gRPC?", answer="An RPC framework.")
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("home"), {"lang": "bn"})
+        self.assertContains(response, "[bn] What is gRPC?")
+
+
+@override_settings(FAQ_TASK_BROKER=IMMEDIATE_BROKER, FAQ_TRANSLATION=STUB_TRANSLATION)
+class FAQAdminChangelistTest(TestCase):
+    def setUp(self):
+        invalidate_faq_caches()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.faqs = [
+                FAQ.objects.create(question=f"Question {i}?", answer=f"Answer {i}.")
+                for i in range(3)
+            ]
+        admin_user = User.objects.create_superuser("admin", "admin@example.com", "pw")
+        self.client.force_login(admin_user)
+        self.url = reverse("admin:faqs_faq_changelist")
+
+    def changelist_queries(self, params=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, params or {})
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries)
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        """
+        Test that translations and their status are computed in SQL, so more
+        rows do not mean more queries.
+        """
+        response, few = self.changelist_queries()
+        self.assertContains(response, "[hi] Question 0?")
+        self.assertContains(response, "Done")
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(3, 8):
+                FAQ.objects.create(question=f"Question {i}?", answer="Answer.")
+        _, many = self.changelist_queries()
+        self.assertEqual(few, many)
+
+    def test_translation_status_filter(self):
+        FAQTranslation.objects.filter(faq=self.faqs[1], lang="bn").update(
+            status=TRANSLATION_FAILED
+        )
+        response = self.client.get(self.url, {"translation_status": "failed"})
+        self.assertEqual(list(response.context["cl"].result_list), [self.faqs[1]])
+        response = self.client.get(self.url, {"translation_status": TRANSLATION_DONE})
+        self.assertEqual(response.context["cl"].result_count, 2)
+
+    def test_large_unfiltered_table_uses_estimated_count(self):
+        with mock.patch("faqs.pagination.estimated_row_count", return_value=250000):
+            response = self.client.get(self.url)
+            self.assertEqual(response.context["cl"].result_count, 250000)
+            # Filtered changelists are still counted exactly
+            response = self.client.get(self.url, {"q": "Question"})
+            self.assertEqual(response.context["cl"].result_count, 3)
+
+    def test_capped_search_warns(self):
+        """
+        Test that a search with more matches than the admin lists says so.
+        """
+        response = self.client.get(self.url, {"q": "Question"})
+        self.assertEqual(list(response.context["messages"]), [])
+        with mock.patch.object(FAQAdmin, "search_limit", 2):
+            response = self.client.get(self.url, {"q": "Question"})
+        self.assertEqual(response.context["cl"].result_count, 2)
+        self.assertIn(
+            "Only the best 2 matches are listed",
+            str(list(response.context["messages"])[0]),
+        )
+
+    def test_bulk_actions_are_set_based(self):
+        """
+        Test that re-translating and deleting a selection each run as one
+        batch with a single cache invalidation.
+        """
+        selected = [faq.pk for faq in self.faqs[:2]]
+        FAQTranslation.objects.filter(faq__in=selected).update(
+            status=TRANSLATION_FAILED
+        )
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.client.post(
+                self.url,
+                {"action": "retranslate_selected", "_selected_action": selected},
+            )
+        self.assertEqual(len(callbacks), 1)
+        self.assertFalse(
+            FAQTranslation.objects.filter(status=TRANSLATION_FAILED).exists()
+        )
+
+        generation = list_generation()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            response = self.client.post(
+                self.url,
+                {
+                    "action": "delete_selected",
+                    "_selected_action": selected,
+                    "post": "yes",
+                },
+            )
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(list_generation(), generation + 1)
+        self.assertEqual(list(FAQ.objects.all()), [self.faqs[2]])
+        self.assertEqual(get_search_backend().search("Question"), [self.faqs[2].pk])
+
+    def change_form_data(self, faq, **fields):
+        translations = list(faq.translations.order_by("lang"))
+        data = {
+            "question": faq.question,
+            "answer": faq.answer,
+            "translations-TOTAL_FORMS": len(translations),
+            "translations-INITIAL_FORMS": len(translations),
+            "translations-MIN_NUM_FORMS": 0,
+            "translations-MAX_NUM_FORMS": 1000,
+        }
+        for i, translation in enumerate(translations):
+            prefix = f"translations-{i}"
+            data.update(
+                {
+                    f"{prefix}-id": translation.pk,
+                    f"{prefix}-faq": faq.pk,
+                    f"{prefix}-lang": translation.lang,
+                    f"{prefix}-question": translation.question,
+                    f"{prefix}-answer": translation.answer,
+                    f"{prefix}-status": translation.status,
+                }
+            )
+        data.update(fields)
+        return data
+
+    def test_translation_edited_inline_is_searchable(self):
+        """
+        Test that a translation edited in the change form reaches the search
+        index, the API and the change feed.
+        """
+        faq = self.faqs[0]
+        seq = FAQ.objects.get(pk=faq.pk).change_seq
+        # Translations are ordered by lang: bn, hi
+        data = self.change_form_data(faq, **{"translations-1-question": "zebrafish"})
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("admin:faqs_faq_change", args=[faq.pk]), data
+            )
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(get_search_backend().search("zebrafish", "hi"), [faq.pk])
+        response = self.client.get(
+            reverse("faq-list-api"), {"q": "zebrafish", "lang": "hi"}
+        )
+        self.assertEqual(response.json()["count"], 1)
+        self.assertGreater(FAQ.objects.get(pk=faq.pk).change_seq, seq)
+
+    def test_english_edit_keeps_inline_translations_pending(self):
+        """
+        Test that posting the inline rows with their old status does not mark
+        translations of edited English text as done.
+        """
+        faq = self.faqs[0]
+        data = self.change_form_data(
+            faq, question="Renamed?", **{"translations-1-question": "zebrafish"}
+        )
+        with self.captureOnCommitCallbacks():
+            self.client.post(reverse("admin:faqs_faq_change", args=[faq.pk]), data)
+        self.assertEqual(
+            set(faq.translations.values_list("status", flat=True)),
+            {TRANSLATION_PENDING},
+        )
+
+
+@override_settings(FAQ_TASK_BROKER=IMMEDIATE_BROKER)
+class IncrementalTranslationTest(TestCase):
+    ANSWER = (
+        "<p>Django is a web framework. It follows the MTV pattern.</p>\n"
+        "<p>It ships with an admin! Version 4.2 is an LTS release.</p>"
+    )
+
+    def setUp(self):
+        invalidate_faq_caches()
+        # A fresh engine (and translation memory) for every test
+        settings = override_settings(
+            FAQ_TRANSLATION={**STUB_TRANSLATION, "SEGMENT_MIN_LENGTH": 40}
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.backend = get_engine().backend = CountingBackend()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.faq = FAQ.objects.create(question="What is Django?", answer="A.")
+        self.backend.calls.clear()
+
+    def test_sentences_join_back_to_the_source(self):
+        segments = split_segments(self.ANSWER)
+        self.assertEqual("".join(s + sep for s, sep in segments), self.ANSWER)
+        self.assertEqual(segments[0], ("<p>Django is a web framework.", " "))
+        self.assertIn(("Version 4.2 is an LTS release.</p>", ""), segments)
+
+    def test_only_changed_fields_are_retranslated(self):
+        """
+        Test that editing the answer re-translates only the answer, and that a
+        save without text changes queues nothing.
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            self.faq.answer = "A web framework."
+            self.faq.save()
+        self.assertEqual(
+            sorted(self.backend.calls),
+            [("A web framework.", "bn"), ("A web framework.", "hi")],
+        )
+        faq = FAQ.objects.get(pk=self.faq.pk)
+        self.assertEqual(faq.get_translated_answer("hi"), "[hi] A web framework.")
+        self.assertEqual(faq.get_translated_question("hi"), "[hi] What is Django?")
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            faq.save()
+        self.assertEqual(len(callbacks), 1)  # Cache invalidation only
+
+    def test_failed_field_keeps_previous_translations(self):
+        """
+        Test that a failed re-translation of the answer keeps the valid
+        question translation and the previous answer until a retry succeeds.
+        """
+        self.backend.fail_langs = ("hi",)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.faq.answer = "A web framework."
+            self.faq.save()
+        row = FAQTranslation.objects.get(faq=self.faq, lang="hi")
+        self.assertEqual(row.status, TRANSLATION_FAILED)
+        self.assertEqual(
+            (row.question, row.answer), ("[hi] What is Django?", "[hi] A.")
+        )
+        self.assertTrue(row.question_hash)
+        self.assertEqual(row.answer_hash, "")
+
+        self.backend.fail_langs = ()
+        self.backend.calls.clear()
+        translate_faqs([self.faq.pk])
+        self.assertEqual(self.backend.calls, [("A web framework.", "hi")])
+        faq = FAQ.objects.get(pk=self.faq.pk)
+        self.assertEqual(faq.get_translation_status("hi"), TRANSLATION_DONE)
+        self.assertEqual(faq.get_translated_answer("hi"), "[hi] A web framework.")
+
+    def test_edited_languages_are_pending_until_translated(self):
+        """
+        Test that an edit marks the stored translations as pending (still
+        serving the previous text) until the task replaces them, and that an
+        edit undone before the task runs needs no engine call.
+        """
+        with self.captureOnCommitCallbacks(execute=False):
+            self.faq.answer = "A web framework."
+            self.faq.save()
+        faq = FAQ.objects.get(pk=self.faq.pk)
+        self.assertEqual(faq.get_translation_status("hi"), TRANSLATION_PENDING)
+        self.assertEqual(faq.get_translated_answer("hi"), "[hi] A.")
+
+        with self.captureOnCommitCallbacks(execute=False):
+            faq.answer = "A."
+            faq.save()
+        translate_faqs([faq.pk])
+        self.assertEqual(self.backend.calls, [])
+        self.assertEqual(
+            FAQ.objects.get(pk=faq.pk).get_translation_status("hi"), TRANSLATION_DONE
+        )
+
+    def test_older_task_does_not_overwrite_a_newer_edit(self):
+        """
+        Test that translations made from text edited while the engine ran are
+        dropped, and that the index gets the current text.
+        """
+        translate_many = FAQ.translate_many
+
+        def edit_during_translation(faqs, force=False):
+            rows = translate_many(faqs, force=force)
+            # The edit lands and its own task stores the newer translation
+            FAQ.objects.filter(pk=self.faq.pk).update(question="What is Flask?")
+            FAQTranslation.objects.filter(faq=self.faq, lang="hi").update(
+                question="[hi] What is Flask?"
+            )
+            return rows
+
+        with mock.patch.object(FAQ, "translate_many", edit_during_translation):
+            translate_faqs([self.faq.pk], force=True)
+        faq = FAQ.objects.get(pk=self.faq.pk)
+        self.assertEqual(faq.get_translated_question("hi"), "[hi] What is Flask?")
+        self.assertEqual(get_search_backend().search("flask", "en"), [self.faq.pk])
+
+    def test_task_locks_the_change_counter_before_the_faqs(self):
+        """
+        Test that storing translations takes one change sequence number, before
+        re-reading the FAQs, in the lock order every other write uses.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            translate_faqs([self.faq.pk], force=True)
+        sql = [query["sql"] for query in queries.captured_queries]
+        counter = [
+            i for i, s in enumerate(sql) if s.startswith('UPDATE "faqs_changecounter"')
+        ]
+        upsert = next(
+            i
+            for i, s in enumerate(sql)
+            if s.startswith('INSERT INTO "faqs_faqtranslation"')
+        )
+        reread = max(
+            i
+            for i, s in enumerate(sql[:upsert])
+            if s.startswith("SELECT") and 'FROM "faqs_faq"' in s
+        )
+        self.assertEqual(len(counter), 1)
+        self.assertLess(counter[0], reread)
+
+    def test_unchanged_sentences_are_reused(self):
+        """
+        Test that editing one sentence of a long answer sends only that
+        sentence to the translator.
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            self.faq.answer = self.ANSWER
+            self.faq.save()
+        self.assertEqual(len(self.backend.calls), 8)  # 4 sentences x 2 languages
+
+        self.backend.calls.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                reverse("faq-detail-api", kwargs={"pk": self.faq.pk}),
+                {"answer": self.ANSWER.replace("4.2", "5.2")},
+                content_type="application/json",
+            )
+        self.assertEqual(
+            sorted(self.backend.calls),
+            [
+                ("Version 5.2 is an LTS release.</p>", "bn"),
+                ("Version 5.2 is an LTS release.</p>", "hi"),
+            ],
+        )
+        self.assertEqual(
+            FAQ.objects.get(pk=self.faq.pk).get_translated_answer("bn"),
+            "[bn] <p>Django is a web framework. [bn] It follows the MTV pattern.</p>\n"
+            "[bn] <p>It ships with an admin! [bn] Version 5.2 is an LTS release.</p>",
+        )
+
+    def test_bulk_edits_are_retranslated(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("faq-bulk-api"),
+                {"update": [{"id": self.faq.pk, "question": "What is Flask?"}]},
+                content_type="application/json",
+            )
+        self.assertEqual(
+            sorted(self.backend.calls),
+            [("What is Flask?", "bn"), ("What is Flask?", "hi")],
+        )
+
+
+@override_settings(
+    FAQ_TASK_BROKER=IMMEDIATE_BROKER,
+    FAQ_TRANSLATION=STUB_TRANSLATION,
+    FAQ_CACHE_WARMING={"REFILL_PAGES": 0},
+)
+class CacheWarmingTest(TestCase):
+    def setUp(self):
+        invalidate_faq_caches()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.faqs = [
+                FAQ.objects.create(question=f"Question {i}?", answer=f"Answer {i}.")
+                for i in range(3)
+            ]
+        invalidate_faq_caches()
+
+    def assertWarm(self, lang, page, page_size):
+        params = {"lang": lang, "page": page, "page_size": page_size}
+        with self.assertNumQueries(0):
+            for url in (reverse("faq-list-api"), reverse("home")):
+                self.assertEqual(self.client.get(url, params).status_code, 200)
+            for faq in self.faqs:
+                url = reverse("faq-detail-api", kwargs={"pk": faq.pk})
+                self.client.get(url, {"lang": lang})
+
+    def test_command_warms_every_language(self):
+        """
+        Test that the command fills list pages, details and home pages so
+        that the first visitor never reaches the database, and stops after
+        the last page.
+        """
+        out = io.StringIO()
+        misses = metrics.CACHE_REQUESTS.value("faqs:list", "miss")
+        call_command("warm_faq_cache", pages=5, page_size=2, workers=1, stdout=out)
+        # Warming lookups stay out of the hit ratio
+        self.assertEqual(metrics.CACHE_REQUESTS.value("faqs:list", "miss"), misses)
+        self.assertIn(
+            "Warmed 6 list pages, 9 detail entries and 6 home pages", out.getvalue()
+        )
+        for lang in ("en", "hi", "bn"):
+            for page in (1, 2):
+                self.assertWarm(lang, page, 2)
+
+    def test_refill_after_a_write(self):
+        """
+        Test that with REFILL_PAGES set, a write rebuilds the first pages
+        before the next visitor asks for them.
+        """
+        with override_settings(FAQ_CACHE_WARMING={"REFILL_PAGES": 1}):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.faqs[0].question = "Renamed?"
+                self.faqs[0].save()
+        self.assertWarm("hi", 1, 5)
+        self.assertContains(self.client.get(reverse("home")), "Renamed?")
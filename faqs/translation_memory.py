@@ -0,0 +1,124 @@
+"""
+Content-addressed translation memory.
+
+Translations are keyed by (hash of the normalized source text, target language,
+backend version) and looked up in two tiers: a per-process LRU and the shared
+``TranslationMemoryEntry`` table. The engine consults the memory before calling
+the translator and stores every fresh translation afterwards.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+def normalize_text(text):
+    return " ".join(text.split())
+
+
+def source_hash(text):
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+class LRUCache:
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return None
+            return self._data[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class TranslationMemory:
+    def __init__(self, backend_version, max_entries=10000):
+        self.backend_version = backend_version
+        self.local = LRUCache(max_entries)
+        self._lock = threading.Lock()
+        self.counters = {"local_hits": 0, "shared_hits": 0, "misses": 0}
+
+    def _count(self, **increments):
+        with self._lock:
+            for name, value in increments.items():
+                self.counters[name] += value
+
+    def get_many(self, pairs):
+        """
+        Look up ``(text, lang)`` pairs, returning a dict of the ones found.
+        """
+        from .models import TranslationMemoryEntry
+
+        found = {}
+        missing = {}
+        for text, lang in pairs:
+            key = (source_hash(text), lang)
+            translation = self.local.get(key)
+            if translation is None:
+                missing.setdefault(key, []).append((text, lang))
+            else:
+                found[(text, lang)] = translation
+        local_hits = len(found)
+
+        if missing:
+            entries = TranslationMemoryEntry.objects.filter(
+                backend_version=self.backend_version,
+                source_hash__in={key[0] for key in missing},
+                target_lang__in={key[1] for key in missing},
+            ).values_list("source_hash", "target_lang", "translation")
+            for hash_, lang, translation in entries:
+                for pair in missing.get((hash_, lang), ()):
+                    found[pair] = translation
+                    self.local.set((hash_, lang), translation)
+
+        shared_hits = len(found) - local_hits
+        self._count(
+            local_hits=local_hits,
+            shared_hits=shared_hits,
+            misses=len(pairs) - len(found),
+        )
+        return found
+
+    def set_many(self, translations):
+        """
+        Store a dict of ``(text, lang) -> translation`` in both tiers.
+        """
+        from .models import TranslationMemoryEntry
+
+        entries = {}
+        for (text, lang), translation in translations.items():
+            key = (source_hash(text), lang)
+            self.local.set(key, translation)
+            entries[key] = TranslationMemoryEntry(
+                source_hash=key[0],
+                target_lang=lang,
+                backend_version=self.backend_version,
+                translation=translation,
+            )
+        TranslationMemoryEntry.objects.bulk_create(
+            entries.values(), ignore_conflicts=True
+        )
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+        lookups = sum(stats.values())
+        stats["hit_ratio"] = (
+            (stats["local_hits"] + stats["shared_hits"]) / lookups if lookups else 0.0
+        )
+        return stats
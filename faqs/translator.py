@@ -0,0 +1,235 @@
+"""
+Batched, concurrent translation engine.
+
+Callers hand the engine a batch of ``(text, target_lang)`` pairs. Identical
+pairs are translated once, the remaining calls fan out over a bounded thread
+pool and every call is subject to a timeout. The actual translator is a
+pluggable backend selected through ``settings.FAQ_TRANSLATION``.
+
+translate_documents() splits long texts into sentences first, so that after
+an edit the unchanged sentences come from the translation memory and only
+the changed ones reach the translator.
+"""
+
+import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from time import monotonic
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from .metrics import TRANSLATION_DURATION, TRANSLATION_FAILURES
+from .translation_memory import TranslationMemory
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TRANSLATION = {
+    "BACKEND": "faqs.translator.GoogleTranslateBackend",
+    "CONCURRENCY": 8,
+    "TIMEOUT": 10,
+    "MEMORY": True,
+    "MEMORY_LRU_SIZE": 10000,
+    "SEGMENT_MIN_LENGTH": 400,
+}
+
+# A sentence ends with terminal punctuation or a closing block tag; the
+# whitespace after it is kept untranslated between segments.
+SEGMENT_END = re.compile(r"([.!?\u0964]+|</p>|</li>|<br\s*/?>)(\s*)", re.IGNORECASE)
+
+
+def split_segments(text):
+    """
+    Split text into (segment, trailing whitespace) pairs that join back to it.
+    """
+    segments = []
+    start = 0
+    for match in SEGMENT_END.finditer(text):
+        # Punctuation only ends a sentence before whitespace ("v1.2" does not)
+        if match.group(2) or match.group(1)[0] == "<" or match.end() == len(text):
+            end = match.end(1)
+            segments.append((text[start:end], match.group(2)))
+            start = match.end()
+    if start < len(text):
+        segments.append((text[start:], ""))
+    return segments
+
+
+class GoogleTranslateBackend:
+    """
+    Translates through the public Google Translate endpoint (googletrans).
+    """
+
+    name = "google"
+    version = "googletrans-4.0.0rc1"
+
+    def __init__(self, timeout=10, **options):
+        self.timeout = timeout
+        # googletrans keeps an httpx client per Translator, which is not safe
+        # to share between threads.
+        self._local = threading.local()
+
+    def _get_translator(self):
+        translator = getattr(self._local, "translator", None)
+        if translator is None:
+            from googletrans import Translator
+
+            translator = Translator(timeout=self.timeout)
+            self._local.translator = translator
+        return translator
+
+    def translate(self, text, lang):
+        translation = self._get_translator().translate(text, dest=lang)
+        if not translation.text or not translation.text.strip():
+            raise ValueError("empty translation")
+        return translation.text
+
+
+class StubBackend:
+    """
+    Deterministic offline backend for tests and air-gapped deployments.
+    """
+
+    name = "stub"
+    version = "stub-1"
+
+    def __init__(self, **options):
+        pass
+
+    def translate(self, text, lang):
+        return f"[{lang}] {text}"
+
+
+class TranslationEngine:
+    def __init__(
+        self, backend, concurrency=8, timeout=10, memory=None, segment_min_length=400
+    ):
+        self.backend = backend
+        self.memory = memory
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.segment_min_length = segment_min_length
+        self.executor = ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="faqs-translate"
+        )
+
+    def translate_batch(self, pairs):
+        """
+        Translate an iterable of ``(text, lang)`` pairs.
+
+        Returns a dict mapping each successfully translated pair to its
+        translation. Blank strings map to themselves; pairs that failed or
+        timed out are left out so callers can decide how to fall back.
+        """
+        results = {}
+        pending = []
+        for text, lang in dict.fromkeys(pairs):
+            if not text or not text.strip():
+                results[(text, lang)] = text
+            else:
+                pending.append((text, lang))
+
+        if self.memory is not None and pending:
+            remembered = self.memory.get_many(pending)
+            results.update(remembered)
+            pending = [pair for pair in pending if pair not in remembered]
+
+        futures = [
+            (pair, self.executor.submit(self._call_backend, *pair)) for pair in pending
+        ]
+
+        # Calls queue up behind the pool, so the k-th call may only start
+        # after k // concurrency rounds; give each call its own time slot.
+        translated = {}
+        started = monotonic()
+        for index, (pair, future) in enumerate(futures):
+            deadline = started + self.timeout * (index // self.concurrency + 1)
+            try:
+                translated[pair] = future.result(timeout=max(deadline - monotonic(), 0))
+            except TimeoutError:
+                future.cancel()
+                TRANSLATION_FAILURES.inc(pair[1], "timeout")
+                logger.warning("Translation timed out (%s)", pair[1])
+            except Exception as e:
+                TRANSLATION_FAILURES.inc(pair[1], "error")
+                logger.warning("Translation error (%s): %s", pair[1], e)
+
+        if self.memory is not None and translated:
+            self.memory.set_many(translated)
+        results.update(translated)
+        return results
+
+    def translate_documents(self, pairs):
+        """
+        translate_batch() for documents: texts of at least segment_min_length
+        characters are translated sentence by sentence and reassembled. A
+        document is left out of the result if any of its sentences failed.
+        """
+        segmented = {}
+        for text, lang in dict.fromkeys(pairs):
+            if text and len(text) >= self.segment_min_length:
+                segmented[(text, lang)] = split_segments(text)
+            else:
+                segmented[(text, lang)] = [(text, "")]
+        translated = self.translate_batch(
+            (segment, lang)
+            for (_, lang), segments in segmented.items()
+            for segment, _ in segments
+        )
+
+        results = {}
+        for (text, lang), segments in segmented.items():
+            parts = []
+            for segment, separator in segments:
+                translation = translated.get((segment, lang))
+                if translation is None:
+                    break
+                parts.append(translation + separator)
+            else:
+                results[(text, lang)] = "".join(parts)
+        return results
+
+    def _call_backend(self, text, lang):
+        with TRANSLATION_DURATION.time(lang):
+            return self.backend.translate(text, lang)
+
+    def translate(self, text, lang):
+        """
+        Translate a single string, returning the source text on failure.
+        """
+        return self.translate_batch([(text, lang)]).get((text, lang), text)
+
+
+_engine = None
+
+
+def get_engine():
+    global _engine
+    if _engine is None:
+        config = {**DEFAULT_TRANSLATION, **getattr(settings, "FAQ_TRANSLATION", {})}
+        backend = import_string(config["BACKEND"])(
+            timeout=config["TIMEOUT"], **config.get("OPTIONS", {})
+        )
+        memory = None
+        if config["MEMORY"]:
+            memory = TranslationMemory(
+                backend.version, max_entries=config["MEMORY_LRU_SIZE"]
+            )
+        _engine = TranslationEngine(
+            backend,
+            concurrency=config["CONCURRENCY"],
+            timeout=config["TIMEOUT"],
+            memory=memory,
+            segment_min_length=config["SEGMENT_MIN_LENGTH"],
+        )
+    return _engine
+
+
+@receiver(setting_changed)
+def _reset_engine(setting, **kwargs):
+    global _engine
+    if setting == "FAQ_TRANSLATION":
+        _engine = None
@@ -1,7 +1,36 @@
 from django.urls import path
-from .views import FAQListAPIView, FAQDetailAPIView
+from . import async_views
+from .views import (
+    CacheStatsAPIView,
+    FAQChangesAPIView,
+    FAQBulkAPIView,
+    FAQDetailAPIView,
+    FAQExportAPIView,
+    FAQListAPIView,
+    TranslationMemoryStatsAPIView,
+)
 
 urlpatterns = [
     path("faqs/", FAQListAPIView.as_view(), name="faq-list-api"),
+    path("faqs/bulk/", FAQBulkAPIView.as_view(), name="faq-bulk-api"),
+    path("faqs/changes/", FAQChangesAPIView.as_view(), name="faq-changes-api"),
     path("faqs/<int:pk>/", FAQDetailAPIView.as_view(), name="faq-detail-api"),
+    path(
+        "faqs/export.<str:extension>",
+        FAQExportAPIView.as_view(),
+        name="faq-export-api",
+    ),
+    # Async (ASGI) read path, kept side by side with the sync one
+    path("async/faqs/", async_views.faq_list_view, name="faq-list-async"),
+    path(
+        "async/faqs/<int:pk>/",
+        async_views.faq_detail_view,
+        name="faq-detail-async",
+    ),
+    path("cache/stats/", CacheStatsAPIView.as_view(), name="cache-stats-api"),
+    path(
+        "translation-memory/stats/",
+        TranslationMemoryStatsAPIView.as_view(),
+        name="translation-memory-stats-api",
+    ),
 ]
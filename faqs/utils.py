@@ -1,22 +1,10 @@
 # In utils.py
-from googletrans import Translator
-
-translator = Translator()
+from .translator import get_engine
 
 
 def translate_text(lang, text):
-    try:
-        # Ensure that the input is not empty
-        if not text:
-            return text
-
-        translation = translator.translate(text, dest=lang)
-
-        # Handle the case where translation.text might be None
-        if translation.text and translation.text.strip() != "":
-            return translation.text
-        else:
-            return text
-    except Exception as e:
-        print(f"Translation Error ({lang}): {e}")
-        return text
+    """
+    Translate a single string, falling back to the source text on failure.
+    Prefer get_engine().translate_batch() when translating several strings.
+    """
+    return get_engine().translate(text, lang)
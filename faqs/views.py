@@ -1,56 +1,249 @@
+import hashlib
+import re
 from rest_framework.views import APIView
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.permissions import IsAdminUser
 from .models import FAQ
-from django.shortcuts import render
-from .serializers import FAQSerializer
-from .redis_handler import RedisHandler
+from django.http import HttpResponse, JsonResponse
+from django.template.loader import render_to_string
+from django.utils.cache import patch_vary_headers
+from django.utils.decorators import method_decorator
+from .serializers import FAQSerializer, serialize_faq, wants_translations
 from django.core.paginator import Paginator
+from .conditional import add_validators, conditional_get, conditional_response
+from .bulk import BulkWriteError, apply_bulk_write
+from .changes import (
+    CHANGE_UPSERT,
+    ExpiredCursor,
+    changes_since,
+    get_change_feed_config,
+)
+from .exporter import ExportError, export_response
+from .cache import (
+    cached_home_page,
+    cached_list_page,
+    detail_cache_key,
+    encode_list_page,
+    home_cache_key,
+    list_cache_key,
+    read_through,
+    redis_handler,
+    store_home_page,
+    store_list_page,
+)
+from .languages import resolve_language
+from .metrics import SERIALIZATION_DURATION
+from .pagination import (
+    InvalidCursor,
+    default_page_size,
+    get_page_number,
+    get_page_size,
+    keyset_page,
+    uses_cursor,
+    wants_count,
+)
+from .search import SearchResults
+from .translator import get_engine
 
-redis_handler = RedisHandler()
+ACCEPTS_GZIP = re.compile(r"\bgzip\b")
 
 
-class FAQListAPIView(APIView):
+def list_page_token(request, query=""):
     """
-    API endpoint to retrieve the list of FAQs and create a new FAQ.
-    Supports language selection via a ?lang= query parameter.
-    Caches the response in Redis.
+    Identify the requested page (search, cursor or page number) for the list
+    cache key.
     """
+    if query:
+        query_hash = hashlib.sha1(query.encode()).hexdigest()
+        return f"q{query_hash}:{get_page_number(request)}"
+    if uses_cursor(request):
+        count = "+count" if wants_count(request) else ""
+        return f"c{request.GET['cursor']}{count}"
+    return get_page_number(request)
 
-    def get(self, request):
-        lang = request.GET.get("lang", "en")
-        page_number = request.GET.get("page", 1)
-        cache_key = f"faqs:list:{lang}"
 
-        # Try to get cached data
-        if cached_data := redis_handler.get_cache(cache_key):
-            return Response(cached_data, status=status.HTTP_200_OK)
+def faq_list_queryset(lang, include_translations=False):
+    """
+    FAQs newest first, joining only the requested language unless every
+    translation was asked for.
+    """
+    faqs = FAQ.objects.with_translation(lang).order_by("-created_at", "-id")
+    if include_translations:
+        faqs = faqs.prefetch_related("translations")
+    return faqs
 
-        # Query the database and serialize FAQs
-        faqs = FAQ.objects.all().order_by("-created_at")
 
-        # Pagination setup
-        paginator = Paginator(faqs, 5)  # 5 FAQs per page (can be changed)
-        page_obj = paginator.get_page(page_number)
+def page_payload(page_obj):
+    return {
+        "count": page_obj.paginator.count,
+        "total_pages": page_obj.paginator.num_pages,
+        "current_page": page_obj.number,
+        "next": page_obj.has_next(),
+        "previous": page_obj.has_previous(),
+    }
 
-        # Serialize the current page of FAQs
-        serializer = FAQSerializer(
-            page_obj.object_list, many=True, context={"request": request}
-        )
 
-        # Prepare paginated data response
-        data = {
-            "count": paginator.count,
-            "total_pages": paginator.num_pages,
-            "current_page": page_obj.number,
-            "next": page_obj.has_next(),
-            "previous": page_obj.has_previous(),
-            "results": serializer.data,
-        }
+def list_page_data(lang, page_number, page_size, include_translations=False):
+    """
+    Serialized numbered page of the FAQ list, as cached by FAQListAPIView.
+    """
+    paginator = Paginator(faq_list_queryset(lang, include_translations), page_size)
+    page_obj = paginator.get_page(page_number)
+    rows = list(page_obj.object_list)  # Run the query outside the timer
+    data = page_payload(page_obj)
+    with SERIALIZATION_DURATION.time("faq-list-api"):
+        data["results"] = [
+            serialize_faq(faq, lang, include_translations) for faq in rows
+        ]
+    return data
+
+
+def faq_detail_payload(pk, lang, include_translations=False):
+    """
+    Serialized FAQ as cached by FAQDetailAPIView, or None if it does not exist.
+    """
+    faqs = FAQ.objects.with_translation(lang)
+    if include_translations:
+        faqs = faqs.prefetch_related("translations")
+    try:
+        faq = faqs.get(pk=pk)
+    except FAQ.DoesNotExist:
+        return None
+    with SERIALIZATION_DURATION.time("faq-detail-api"):
+        return serialize_faq(faq, lang, include_translations)
+
+
+def search_payload(request, query, lang, include_translations=False):
+    """
+    Serialized page of a ranked full-text search in the requested language.
+    """
+    paginator = Paginator(SearchResults(query, lang), get_page_size(request))
+    page_obj = paginator.get_page(get_page_number(request))
+    data = page_payload(page_obj)
+    data["results"] = [
+        serialize_faq(faq, lang, include_translations) for faq in page_obj.object_list
+    ]
+    return data
+
+
+def list_payload(request, lang, page_size, query, include_translations=False):
+    """
+    Serialized list page for the request: a search, a keyset page or a
+    numbered page. Raises InvalidCursor for a malformed ?cursor=.
+    """
+    if query:
+        # Ranked full-text search in the requested language
+        return search_payload(request, query, lang, include_translations)
+    if uses_cursor(request):
+        faqs = faq_list_queryset(lang, include_translations)
+        rows, next_cursor = keyset_page(faqs, request.GET["cursor"], page_size)
+        data = {"next_cursor": next_cursor, "next": next_cursor is not None}
+        if wants_count(request):
+            data["count"] = faqs.count()
+        with SERIALIZATION_DURATION.time("faq-list-api"):
+            data["results"] = [
+                serialize_faq(faq, lang, include_translations) for faq in rows
+            ]
+        return data
+    return list_page_data(
+        lang, get_page_number(request), page_size, include_translations
+    )
+
+
+def render_json(data):
+    """
+    Render data exactly as DRF's JSONRenderer sends it.
+    """
+    return JSONRenderer().render(data)
 
-        # Cache the serialized data for future requests
-        redis_handler.set_cache(cache_key, data)
 
+def accepts_json(request):
+    """
+    True unless the client asks for HTML (DRF's browsable API).
+    """
+    return "text/html" not in request.META.get("HTTP_ACCEPT", "")
+
+
+def accepts_gzip(request):
+    return bool(ACCEPTS_GZIP.search(request.META.get("HTTP_ACCEPT_ENCODING", "")))
+
+
+def list_page_response(entry):
+    body, encoding = entry
+    response = HttpResponse(body, content_type="application/json")
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    patch_vary_headers(response, ("Accept-Encoding",))
+    return response
+
+
+def cached_list_response(request):
+    """
+    Serve a JSON list page from its rendered cache entry. A hit is one MGET
+    (content version and body) and the stored bytes are sent as they are:
+    no deserialization, no rendering and no DRF request handling.
+    """
+    lang = resolve_language(request.GET.get("lang", "en"))
+    include_translations = wants_translations(request)
+    page_size = get_page_size(request)
+    query = request.GET.get("q", "").strip()
+    page = list_page_token(request, query)
+    cache_key = list_cache_key(lang, page, page_size, include_translations)
+    gzip = accepts_gzip(request)
+
+    generation, last_modified, entry = cached_list_page(cache_key, gzip)
+    etag, response = conditional_response(
+        request, generation, last_modified, variant="gzip" if gzip else ""
+    )
+    if response is not None:
+        return response
+
+    if entry is None:
+        try:
+            data = list_payload(request, lang, page_size, query, include_translations)
+        except InvalidCursor as e:
+            response = JsonResponse({"error": str(e), "status": "fail"}, status=400)
+            return add_validators(response, etag, last_modified)
+        entries = encode_list_page(render_json(data))
+        if generation is not None:
+            store_list_page(cache_key, generation, entries)
+        entry = entries[gzip]
+    return add_validators(list_page_response(entry), etag, last_modified)
+
+
+class FAQListAPIView(APIView):
+    """
+    API endpoint to retrieve the list of FAQs and create a new FAQ.
+    Supports language selection via a ?lang= query parameter; add
+    ?include=translations to also receive every other language and ?q= to
+    run a ranked full-text search in the requested language.
+    JSON reads are served by cached_list_response() from rendered pages in
+    Redis; the browsable API builds them without the cache.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method in ("GET", "HEAD") and accepts_json(request):
+            return cached_list_response(request)
+        return super().dispatch(request, *args, **kwargs)
+
+    @method_decorator(conditional_get)
+    def get(self, request):
+        lang = resolve_language(request.GET.get("lang", "en"))
+        try:
+            data = list_payload(
+                request,
+                lang,
+                get_page_size(request),
+                request.GET.get("q", "").strip(),
+                wants_translations(request),
+            )
+        except InvalidCursor as e:
+            return Response(
+                {"error": str(e), "status": "fail"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
         return Response(data, status=status.HTTP_200_OK)
 
     def post(self, request):
@@ -61,36 +254,35 @@ class FAQListAPIView(APIView):
         """
         serializer = FAQSerializer(data=request.data, context={"request": request})
         if serializer.is_valid():
+            # Saving the FAQ invalidates the cached list pages
             faq = serializer.save()
 
-            # Clear cache for the FAQ list (for the current language)
-            lang = request.GET.get("lang", "en")
-            redis_handler.client.delete(f"faqs:list:{lang}")
-
             # Return the created FAQ's data, including its id.
-            response_data = {
-                "id": faq.id,
-                "question": faq.question,
-                "answer": faq.answer,
-                "question_translated": faq.question_translated,
-                "answer_translated": faq.answer_translated,
-                "created_at": faq.created_at.isoformat(),
-                "updated_at": faq.updated_at.isoformat(),
-            }
-            return Response(response_data, status=status.HTTP_201_CREATED)
+            return Response(
+                serialize_faq(faq, include_translations=True),
+                status=status.HTTP_201_CREATED,
+            )
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
 class FAQDetailAPIView(APIView):
     """
     API endpoint to retrieve, update, or delete a specific FAQ.
-    Supports language selection via ?lang= query parameter.
+    Supports language selection via ?lang= query parameter and
+    ?include=translations like the list endpoint.
     """
 
+    @method_decorator(conditional_get)
     def get(self, request, pk):
-        try:
-            faq = FAQ.objects.get(pk=pk)
-        except FAQ.DoesNotExist:
+        lang = resolve_language(request.GET.get("lang", "en"))
+        include_translations = wants_translations(request)
+
+        # Read-through cache with stampede protection
+        data = read_through(
+            detail_cache_key(pk, lang, include_translations),
+            lambda: faq_detail_payload(pk, lang, include_translations),
+        )
+        if data is None:
             return Response(
                 {
                     "error": "FAQ not found.",
@@ -99,9 +291,7 @@ class FAQDetailAPIView(APIView):
                 },
                 status=status.HTTP_404_NOT_FOUND,
             )
-
-        serializer = FAQSerializer(faq, context={"request": request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return Response(data, status=status.HTTP_200_OK)
 
     def put(self, request, pk):
         try:
@@ -118,10 +308,10 @@ class FAQDetailAPIView(APIView):
 
         serializer = FAQSerializer(faq, data=request.data, context={"request": request})
         if serializer.is_valid():
-            serializer.save()
-            redis_handler.client.delete(f"faq:{pk}")
-            redis_handler.client.delete(f"faqs:list:{request.GET.get('lang', 'en')}")
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            faq = serializer.save()
+            return Response(
+                serialize_faq(faq, include_translations=True), status=status.HTTP_200_OK
+            )
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     def patch(self, request, pk):
@@ -141,10 +331,10 @@ class FAQDetailAPIView(APIView):
             faq, data=request.data, partial=True, context={"request": request}
         )
         if serializer.is_valid():
-            serializer.save()
-            redis_handler.client.delete(f"faq:{pk}")
-            redis_handler.client.delete(f"faqs:list:{request.GET.get('lang', 'en')}")
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            faq = serializer.save()
+            return Response(
+                serialize_faq(faq, include_translations=True), status=status.HTTP_200_OK
+            )
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     def delete(self, request, pk):
@@ -161,8 +351,6 @@ class FAQDetailAPIView(APIView):
             )
 
         faq.delete()
-        redis_handler.client.delete(f"faq:{pk}")
-        redis_handler.client.delete(f"faqs:list:{request.GET.get('lang', 'en')}")
         return Response(
             {
                 "message": f"FAQ with id {pk} has been successfully deleted.",
@@ -172,18 +360,199 @@ class FAQDetailAPIView(APIView):
         )
 
 
-# A view for rendering the home page remains unchanged.
+class FAQBulkAPIView(APIView):
+    """
+    API endpoint to create, update and delete many FAQs in one request:
+    {"create": [{...}], "update": [{"id": ..., ...}], "delete": [id, ...]}.
+    The batch is applied atomically; any invalid item rejects all of it.
+    """
+
+    def post(self, request):
+        try:
+            results = apply_bulk_write(request.data)
+        except BulkWriteError as e:
+            return Response(
+                {"error": str(e), "errors": e.errors, "status": "fail"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(
+            {"results": results, "status": "success"}, status=status.HTTP_200_OK
+        )
+
+
+def get_change_limit(request):
+    """
+    Return the requested ?limit= of the change feed, clamped to its
+    MAX_PAGE_SIZE.
+    """
+    config = get_change_feed_config()
+    try:
+        limit = int(request.GET.get("limit", config["PAGE_SIZE"]))
+    except (TypeError, ValueError):
+        return config["PAGE_SIZE"]
+    return min(max(limit, 1), config["MAX_PAGE_SIZE"])
+
+
+def serialize_change(change, lang, include_translations=False):
+    kind, row = change
+    if kind == CHANGE_UPSERT:
+        return {
+            "change": kind,
+            "id": row.pk,
+            "faq": serialize_faq(row, lang, include_translations),
+        }
+    return {"change": kind, "id": row.faq_id, "deleted_at": row.deleted_at}
+
+
+class FAQChangesAPIView(APIView):
+    """
+    Change feed for delta sync: the FAQs created, edited, translated or
+    deleted after ?since=<cursor>, oldest change first, ?limit= at a time.
+    Without ?since= every FAQ is returned (a full sync); keep requesting with
+    next_cursor while has_more is true, then store it for the next sync.
+    A cursor older than the tombstone retention is answered with 410 Gone:
+    sync again from scratch. Supports ?lang= and ?include=translations.
+    See faqs.changes.
+    """
+
+    @method_decorator(conditional_get)
+    def get(self, request):
+        lang = resolve_language(request.GET.get("lang", "en"))
+        include_translations = wants_translations(request)
+        faqs = FAQ.objects.with_translation(lang)
+        if include_translations:
+            faqs = faqs.prefetch_related("translations")
+        try:
+            changes, next_cursor, has_more = changes_since(
+                faqs, request.GET.get("since", ""), get_change_limit(request)
+            )
+        except ExpiredCursor as e:
+            return Response(
+                {"error": str(e), "status": "fail"}, status=status.HTTP_410_GONE
+            )
+        except InvalidCursor as e:
+            return Response(
+                {"error": str(e), "status": "fail"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        with SERIALIZATION_DURATION.time("faq-changes-api"):
+            results = [
+                serialize_change(change, lang, include_translations)
+                for change in changes
+            ]
+        return Response(
+            {"changes": results, "next_cursor": next_cursor, "has_more": has_more},
+            status=status.HTTP_200_OK,
+        )
+
+
+class FAQExportAPIView(APIView):
+    """
+    Streaming export of every FAQ in every language (staff only):
+    /api/faqs/export.csv, .ndjson, .csv.gz or .ndjson.gz, filtered by
+    ?lang= and ?updated_since=. See faqs.exporter.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def perform_content_negotiation(self, request, force=False):
+        # The file is streamed as is, whatever the client accepts
+        return super().perform_content_negotiation(request, force=True)
+
+    def get(self, request, extension):
+        try:
+            return export_response(extension, request.GET)
+        except ExportError as e:
+            return Response(
+                {"error": str(e), "status": "fail"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+
+class TranslationMemoryStatsAPIView(APIView):
+    """
+    Hit/miss counters of this process's translation memory (staff only).
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        memory = get_engine().memory
+        if memory is None:
+            return Response({"enabled": False}, status=status.HTTP_200_OK)
+        return Response({"enabled": True, **memory.stats()}, status=status.HTTP_200_OK)
+
+
+class CacheStatsAPIView(APIView):
+    """
+    State of this process's Redis circuit breaker (staff only).
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(
+            {"breaker": redis_handler.breaker.stats()}, status=status.HTTP_200_OK
+        )
+
+
+# A view for rendering the home page.
 def home_page_view(request):
-    lang = request.GET.get("lang", "en")  # Default to English if no lang is passed
-    faqs = FAQ.objects.all().order_by("-created_at")
+    # Default to English if no (or an unsupported) lang is passed
+    lang = resolve_language(request.GET.get("lang", "en"))
+    page_size = get_page_size(request)
+    cursor = request.GET["cursor"] if uses_cursor(request) else None
+    cache_key = home_cache_key(lang, home_page_token(request), page_size)
 
-    # Pagination
-    paginator = Paginator(faqs, 5)  # 5 FAQs per page (can be adjusted)
-    page_number = request.GET.get("page")
-    page_obj = paginator.get_page(page_number)
+    # One MGET answers both the revalidation and the page itself
+    generation, last_modified, html = cached_home_page(cache_key)
+    etag, response = conditional_response(request, generation, last_modified)
+    if response is not None:
+        return response
+
+    if html is None:
+        html = render_home_page(lang, get_page_number(request), cursor, page_size)
+        if generation is not None:
+            store_home_page(cache_key, generation, html)
+    return add_validators(HttpResponse(html), etag, last_modified)
+
+
+def home_page_token(request):
+    """
+    The page part of a home page cache key: the page number, or c<cursor>.
+    """
+    if uses_cursor(request):
+        return f"c{request.GET['cursor']}"
+    return get_page_number(request)
+
+
+def render_home_page(lang, page_number=1, cursor=None, page_size=None):
+    """
+    Render the home page HTML. Pagination uses keyset pagination when a cursor
+    (possibly empty) is given and page numbers otherwise.
+    """
+    faqs = faq_list_queryset(lang)
+    page_size = page_size or default_page_size()
 
+    page_obj = next_cursor = None
+    if cursor is not None:
+        try:
+            rows, next_cursor = keyset_page(faqs, cursor, page_size)
+        except InvalidCursor:
+            rows, next_cursor = keyset_page(faqs, "", page_size)
+    else:
+        paginator = Paginator(faqs, page_size)
+        page_obj = paginator.get_page(page_number)
+        rows = page_obj.object_list
+
+    return render_to_string(
+        "faqs/home.html", home_page_context(lang, rows, page_obj, next_cursor)
+    )
+
+
+def home_page_context(lang, rows, page_obj=None, next_cursor=None):
     faq_list = []
-    for faq in page_obj.object_list:
+    for faq in rows:
         faq_list.append(
             {
                 "id": faq.id,
@@ -191,9 +560,9 @@ def home_page_view(request):
                 "answer": faq.get_translated_answer(lang),  # Translate answer
             }
         )
-
-    return render(
-        request,
-        "faqs/home.html",
-        {"faqs": faq_list, "page_obj": page_obj, "lang": lang},
-    )
+    return {
+        "faqs": faq_list,
+        "page_obj": page_obj,
+        "next_cursor": next_cursor,
+        "lang": lang,
+    }
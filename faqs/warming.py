@@ -0,0 +1,127 @@
+"""
+Cache warming for the FAQ read path.
+
+warm_faq_cache() builds the numbered list pages, the detail entries of the
+FAQs on them and the rendered home pages for every language, exactly as the
+views would on a miss, and stores them under the current generation. It
+backs the warm_faq_cache management command and the background refill that
+runs after each invalidation (FAQ_CACHE_WARMING["REFILL_PAGES"]), so the
+busiest pages are rebuilt before the next visitor asks for them.
+
+Entries that are already cached are left alone: list and home pages carry
+their generation and detail entries go through read_through(), so
+warming twice costs only the cache lookups. Those lookups are not counted
+in the cache metrics.
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import close_old_connections
+
+from .cache import (
+    cached_home_page,
+    cached_list_page,
+    detail_cache_key,
+    encode_list_page,
+    get_warming_config,
+    home_cache_key,
+    list_cache_key,
+    read_through,
+    store_home_page,
+    store_list_page,
+)
+from .languages import SUPPORTED_LANGUAGES
+from .metrics import untracked_cache_lookups
+from .pagination import default_page_size
+
+
+def warm_faq_cache(
+    languages=None, pages=None, page_size=None, workers=None, details=None
+):
+    """
+    Warm the first pages (FAQ_CACHE_WARMING["PAGES"] by default) of every
+    language. Pages past the last one are skipped. Returns the number of list
+    pages, detail entries and home pages written or found already cached.
+    """
+    config = get_warming_config()
+    languages = languages or SUPPORTED_LANGUAGES
+    pages = pages or config["PAGES"]
+    page_size = page_size or default_page_size()
+    workers = workers or config["WORKERS"]
+    details = config["DETAILS"] if details is None else details
+
+    jobs = [(lang, page) for lang in languages for page in range(1, pages + 1)]
+    if workers > 1:
+        with ThreadPoolExecutor(workers, thread_name_prefix="faqs-warm") as pool:
+            futures = [
+                pool.submit(_warm_in_thread, lang, page, page_size, details)
+                for lang, page in jobs
+            ]
+            results = [future.result() for future in futures]
+    else:
+        results = [warm_page(lang, page, page_size, details) for lang, page in jobs]
+
+    totals = {"list_pages": 0, "details": 0, "home_pages": 0}
+    for result in results:
+        for name, count in result.items():
+            totals[name] += count
+    return totals
+
+
+def _warm_in_thread(*args):
+    close_old_connections()
+    try:
+        return warm_page(*args)
+    finally:
+        close_old_connections()
+
+
+def warm_page(lang, page, page_size, details=True):
+    """
+    Warm one (lang, page): the list page, the details of its FAQs and the
+    home page. Nothing is stored while Redis is unavailable.
+    """
+    with untracked_cache_lookups():
+        return _warm_page(lang, page, page_size, details)
+
+
+def _warm_page(lang, page, page_size, details):
+    from .views import (
+        faq_detail_payload,
+        list_page_data,
+        render_home_page,
+        render_json,
+    )
+
+    warmed = {"list_pages": 0, "details": 0, "home_pages": 0}
+    # Read the generation before building, so nothing older is stored under it
+    cache_key = list_cache_key(lang, page, page_size)
+    generation, _, entry = cached_list_page(cache_key)
+    if generation is None:
+        return warmed
+
+    if entry is None:
+        data = list_page_data(lang, page, page_size)
+        if data["current_page"] != page:
+            return warmed  # Past the last page
+        store_list_page(cache_key, generation, encode_list_page(render_json(data)))
+    else:
+        data = json.loads(entry[0])
+    warmed["list_pages"] += 1
+
+    if details:
+        for faq in data["results"]:
+            pk = faq["id"]
+            read_through(
+                detail_cache_key(pk, lang),
+                lambda pk=pk: faq_detail_payload(pk, lang),
+            )
+            warmed["details"] += 1
+
+    home_key = home_cache_key(lang, page, page_size)
+    if cached_home_page(home_key)[2] is None:
+        html = render_home_page(lang, page, page_size=page_size)
+        store_home_page(home_key, generation, html)
+    warmed["home_pages"] += 1
+    return warmed